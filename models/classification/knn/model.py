@@ -1,12 +1,15 @@
 import collections
+import importlib
+import itertools
 import statistics
 from typing import Callable, Optional, Set, Sequence, Union, Tuple, Dict
 
-import models
-from models.classification.utils import confusion_matrix
-from models.utils.linear_alg import Vector, Matrix, diagonal_sum, euclidean
-from models.utils.linear_alg import check_dimension_match
+import models.classification.utils
+from models.classification.metrics import ClassificationMetrics
+from models.utils.linear_alg import Vector, Matrix, euclidean, pairwise_distances
+from models.utils.linear_alg import check_dimension_match, is_vector
 from models.utils.lists import sort_by
+from models.utils.serialization import save_arrays, load_arrays
 
 Metric = Callable[[Vector, Vector], float]
 
@@ -16,6 +19,11 @@ class KNearestClassifier:
     Classificador que implementa a votação de k-vizinhos mais próximos.
     """
 
+    _SCORE_BLOCK_SIZE: int = 1024
+    """
+    Número de amostras previstas de cada vez por ``score``.
+    """
+
     @staticmethod
     def best(
             X: Matrix,
@@ -25,6 +33,8 @@ class KNearestClassifier:
             n_folds: int = 5,
             metric: Metric = euclidean,
             return_report: bool = False,
+            stratify: bool = False,
+            groups: Optional[Vector] = None,
     ) -> Union[int, Tuple[int, Dict[str, float]]]:
         """
         Encontra um valor de k que possui a melhor acurácia para um conjunto de amostras.
@@ -35,6 +45,9 @@ class KNearestClassifier:
         :param n_folds: o número de folds a serem utilizados na validação cruzada, padrão 5.
         :param metric: a métrica de distância a ser utilizada, padrão euclidiana.
         :param return_report: define se deve-se retornar a acurácia de cada valor de k testado.
+        :param stratify: se os folds devem manter a proporção de cada classe do conjunto inteiro, padrão `False`.
+        :param groups: o grupo de cada amostra. Caso seja fornecido, as amostras de um mesmo grupo são mantidas em um
+                        mesmo fold.
         :return: o valor de k que obteve a melhor acurácia para os valores de k fornecidos. Caso 'return_report',
                     um dicionário com cada chave sendo o valor de k testado e seu valor sua respectiva acurácia
                     será retornado.
@@ -46,7 +59,8 @@ class KNearestClassifier:
         for k in ks:
             clf = KNearestClassifier(k=k, metric=metric)
             # Manter o caminho models.classification.utils
-            accuracies = models.classification.utils.k_fold(clf, X, y, n_folds=n_folds)
+            accuracies = models.classification.utils.k_fold(clf, X, y, n_folds=n_folds, stratify=stratify,
+                                                            groups=groups)
             report[k] = statistics.mean(accuracies)
 
         best_k = max(report.items(), key=lambda item: item[1])[0]
@@ -89,22 +103,69 @@ class KNearestClassifier:
         if self._X is None:
             raise ValueError("you must call 'fit' before calling 'predict'")
 
-        is_vector = all(isinstance(v, (float, int)) for v in X)
-        X = [X] if is_vector else X
+        vector = is_vector(X)
+        X = [X] if vector else X
 
         y: Vector = []
-        for feature in X:
-            distances = [self.metric(feature, fit_feature) for fit_feature in self._X]
+        for distances in itertools.chain.from_iterable(pairwise_distances(X, self._X, self.metric)):
             ordered_classes = sort_by(distances, self._y)
             k_nearest_classes = ordered_classes[:self.k]
             winner_class = collections.Counter(k_nearest_classes).most_common(1)[0][0]
-            if is_vector:
+            if vector:
                 return winner_class
 
             y.append(winner_class)
 
         return y
 
+    def save(self, path: str):
+        """
+        Salva esse classificador em um arquivo binário compacto.
+
+        A métrica de distância é salva pelo seu nome e deve ser uma função definida no nível de um módulo.
+
+        :param path: o caminho do arquivo.
+        """
+        if self._X is None:
+            raise ValueError("you must call 'fit' before calling 'save'")
+
+        module = getattr(self.metric, '__module__', None)
+        name = getattr(self.metric, '__qualname__', '')
+        if module is None or '<' in name:
+            raise ValueError("only module-level metric functions can be saved")
+
+        classes = sorted(self._classes, key=repr)
+        class_index = {c: i for i, c in enumerate(classes)}
+        meta = {'params': {'k': self.k}, 'metric': [module, name], 'classes': classes}
+        arrays = {'X': self._X, 'y': [class_index[c] for c in self._y]}
+        save_arrays(path, type(self).__name__, meta, arrays, {'y': 'i8'})
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = True) -> 'KNearestClassifier':
+        """
+        Carrega um classificador salvo por ``save``.
+
+        :param path: o caminho do arquivo.
+        :param mmap: se o arquivo deve ser mapeado em memória, padrão `True`. Nesse caso, as amostras de treinamento
+                        são `memoryview` sobre o arquivo, sem cópia dos dados.
+        :return: o classificador carregado.
+        """
+        kind, meta, arrays = load_arrays(path, mmap=mmap)
+        if kind != cls.__name__:
+            raise ValueError(f"'{path}' does not contain a {cls.__name__} model")
+
+        module, name = meta['metric']
+        metric = importlib.import_module(module)
+        for attribute in name.split('.'):
+            metric = getattr(metric, attribute)
+
+        classes = meta['classes']
+        clf = cls(metric=metric, **meta['params'])
+        clf._X = arrays['X']
+        clf._y = [classes[i] for i in arrays['y']]
+        clf._classes = set(classes)
+        return clf
+
     def score(self, X: Matrix, y: Vector) -> float:
         """
         Retorna a acurácia do classificador para dados de teste.
@@ -116,6 +177,12 @@ class KNearestClassifier:
         if self._X is None:
             raise ValueError("you must call 'fit' before calling 'score'")
 
-        y_pred = self.predict(X)
-        cm = confusion_matrix(y, y_pred, len(self._classes))
-        return diagonal_sum(cm) / sum(sum(row) for row in cm)
+        check_dimension_match(X, y, allow_empty=False)
+
+        # As predições são acumuladas em blocos, sem que todas sejam mantidas em memória
+        metrics = ClassificationMetrics()
+        for start in range(0, len(X), self._SCORE_BLOCK_SIZE):
+            end = start + self._SCORE_BLOCK_SIZE
+            metrics.update(y[start:end], self.predict(X[start:end]))
+
+        return metrics.accuracy
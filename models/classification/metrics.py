@@ -0,0 +1,168 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models.utils.linear_alg import Matrix
+
+
+class ClassificationMetrics:
+    """
+    Acumula a matriz de confusão de uma classificação de forma incremental, a partir de lotes de classes corretas e
+    estimadas, e calcula a acurácia, a precisão, a revocação e o F1 a partir dela.
+
+    Apenas a contagem de cada par (classe correta, classe estimada) é mantida, de forma que a memória utilizada é
+    O(c²) para c classes, independente do número de amostras. Acumuladores de diferentes lotes ou processos podem ser
+    combinados por ``merge``.
+    """
+
+    def __init__(self, classes: Optional[Iterable[Any]] = None):
+        """
+        Cria um acumulador vazio.
+
+        :param classes: as classes da classificação, na ordem das linhas e colunas da matriz de confusão. Classes não
+                        fornecidas são acrescentadas na ordem em que aparecem pela primeira vez.
+        """
+        self._counts: Counter = Counter()
+        self._classes: Dict[Any, int] = {}
+        for c in classes or ():
+            self._classes.setdefault(c, len(self._classes))
+
+    def update(self, y_true: Sequence[Any], y_pred: Sequence[Any]) -> 'ClassificationMetrics':
+        """
+        Acrescenta um lote de classificações ao acumulador.
+
+        :param y_true: as classes corretas do lote.
+        :param y_pred: as classes estimadas do lote, na mesma ordem.
+        :raises ValueError: se ``y_true`` e ``y_pred`` possuírem tamanhos diferentes.
+        :return: esse acumulador.
+        """
+        if len(y_true) != len(y_pred):
+            raise ValueError(f"y_true size ({len(y_true)}) must be the same as y_pred size ({len(y_pred)})")
+
+        counts = Counter(zip(y_true, y_pred))
+        for true_value, pred_value in counts:
+            self._classes.setdefault(true_value, len(self._classes))
+            self._classes.setdefault(pred_value, len(self._classes))
+
+        self._counts.update(counts)
+        return self
+
+    def merge(self, other: 'ClassificationMetrics') -> 'ClassificationMetrics':
+        """
+        Acrescenta as classificações de outro acumulador a esse acumulador.
+
+        :param other: o outro acumulador.
+        :return: esse acumulador.
+        """
+        for c in other._classes:
+            self._classes.setdefault(c, len(self._classes))
+
+        self._counts.update(other._counts)
+        return self
+
+    @property
+    def classes(self) -> List[Any]:
+        """
+        As classes desse acumulador, na ordem das linhas e colunas da matriz de confusão.
+        """
+        return list(self._classes)
+
+    @property
+    def n_samples(self) -> int:
+        """
+        O número de classificações acumuladas.
+        """
+        return sum(self._counts.values())
+
+    @property
+    def confusion_matrix(self) -> Matrix:
+        """
+        A matriz de confusão, em que a linha é a classe correta e a coluna é a classe estimada.
+        """
+        n_classes = len(self._classes)
+        matrix = [[0] * n_classes for _ in range(n_classes)]
+        for (true_value, pred_value), count in self._counts.items():
+            matrix[self._classes[true_value]][self._classes[pred_value]] = count
+
+        return matrix
+
+    @property
+    def accuracy(self) -> float:
+        """
+        A proporção de classificações corretas.
+        """
+        n_samples = self.n_samples
+        if not n_samples:
+            raise ValueError("no samples have been accumulated")
+
+        return sum(count for (true_value, pred_value), count in self._counts.items()
+                   if true_value == pred_value) / n_samples
+
+    def _totals(self) -> Tuple[Counter, Counter, Counter]:
+        """
+        Conta, para cada classe, os acertos, as amostras estimadas nessa classe e as amostras corretas dessa classe.
+        """
+        hits: Counter = Counter()
+        predicted: Counter = Counter()
+        actual: Counter = Counter()
+        for (true_value, pred_value), count in self._counts.items():
+            predicted[pred_value] += count
+            actual[true_value] += count
+            if true_value == pred_value:
+                hits[true_value] += count
+
+        return hits, predicted, actual
+
+    def _average(self, scores: Dict[Any, float], label: Optional[Any]) -> float:
+        if label is not None:
+            return scores.get(label, 0.0)
+
+        if not scores:
+            raise ValueError("no samples have been accumulated")
+
+        return sum(scores.values()) / len(scores)
+
+    def _precisions(self) -> Dict[Any, float]:
+        hits, predicted, _ = self._totals()
+        return {c: hits[c] / predicted[c] if predicted[c] else 0.0 for c in self._classes}
+
+    def _recalls(self) -> Dict[Any, float]:
+        hits, _, actual = self._totals()
+        return {c: hits[c] / actual[c] if actual[c] else 0.0 for c in self._classes}
+
+    def precision(self, label: Optional[Any] = None) -> float:
+        """
+        Calcula a precisão, isto é, a proporção das amostras estimadas em uma classe que pertencem a ela.
+
+        :param label: a classe. Caso seja `None` (padrão), a média das precisões de todas as classes é retornada.
+        :return: a precisão, ou 0 se nenhuma amostra foi estimada na classe.
+        """
+        return self._average(self._precisions(), label)
+
+    def recall(self, label: Optional[Any] = None) -> float:
+        """
+        Calcula a revocação, isto é, a proporção das amostras de uma classe que foram estimadas nela.
+
+        :param label: a classe. Caso seja `None` (padrão), a média das revocações de todas as classes é retornada.
+        :return: a revocação, ou 0 se nenhuma amostra pertence à classe.
+        """
+        return self._average(self._recalls(), label)
+
+    def f1(self, label: Optional[Any] = None) -> float:
+        """
+        Calcula o F1, isto é, a média harmônica da precisão e da revocação.
+
+        :param label: a classe. Caso seja `None` (padrão), a média dos F1 de todas as classes é retornada.
+        :return: o F1, ou 0 se a precisão e a revocação forem nulas.
+        """
+        precisions = self._precisions()
+        recalls = self._recalls()
+
+        scores: Dict[Any, float] = {}
+        for c in self._classes:
+            total = precisions[c] + recalls[c]
+            scores[c] = 2 * precisions[c] * recalls[c] / total if total else 0.0
+
+        return self._average(scores, label)
+
+    def __repr__(self):
+        return f'ClassificationMetrics(classes={self.classes}, n_samples={self.n_samples})'
@@ -0,0 +1,289 @@
+import array
+import operator
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from models.classification.mlp.network import ACTIVATIONS, Activation
+from models.utils.linear_alg import Matrix, Vector, is_vector
+from models.utils.serialization import Array, save_arrays, load_arrays
+
+_Layer = Tuple[Sequence[Sequence[float]], Sequence[float], Activation, Optional[float]]
+
+PRECISIONS: Dict[str, Tuple[str, str]] = {'float64': ('f8', 'f8'), 'float32': ('f4', 'f4'), 'int8': ('i1', 'f4')}
+"""
+As precisões suportadas, por nome, com os tipos de dado (como em ``save_arrays``) dos seus pesos e bias.
+"""
+
+_TYPECODES: Dict[str, str] = {'f4': 'f', 'i1': 'b'}
+
+_ITEMSIZES: Dict[str, int] = {'f8': 8, 'f4': 4, 'i1': 1}
+
+
+def _pack(rows: Sequence[Sequence[float]], dtype: str) -> Tuple[Sequence[float], ...]:
+    """
+    Armazena as linhas de uma matriz de forma imutável, no tipo de dado fornecido.
+
+    Matrizes 'f8' são armazenadas como tuplas. As demais são armazenadas em um único vetor contíguo (``array``), linha
+    após linha, exposto por meio de `memoryview` somente leitura.
+
+    :param rows: as linhas da matriz.
+    :param dtype: o tipo de dado.
+    :return: as linhas armazenadas.
+    """
+    if dtype == 'f8':
+        return tuple(tuple(map(float, row)) for row in rows)
+
+    flat = array.array(_TYPECODES[dtype])
+    for row in rows:
+        flat.extend(row)
+
+    n_cols = len(rows[0]) if rows else 0
+    view = memoryview(flat).toreadonly()
+    return tuple(view[j * n_cols:(j + 1) * n_cols] for j in range(len(rows)))
+
+
+def _quantize(W: Matrix) -> Tuple[Matrix, float]:
+    """
+    Quantiza uma matriz de pesos para inteiros de 8 bits de forma simétrica, com uma única escala para a matriz.
+
+    :param W: a matriz de pesos.
+    :return: a matriz quantizada, com valores entre -127 e 127, e a sua escala, isto é, o valor de cada unidade.
+    """
+    largest = max((abs(w) for row in W for w in row), default=0.0)
+    scale = largest / 127 if largest > 0 else 1.0
+    return [[max(-127, min(127, round(w / scale))) for w in row] for row in W], scale
+
+
+def decode(values: Sequence[float], class_map: Sequence[Any]) -> Any:
+    """
+    Converte a saída de uma rede neural em uma classe.
+
+    :param values: as ativações da camada de saída da rede. Caso haja um único valor, a classe é a positiva se ele for
+                    maior que 0.5 e a negativa caso contrário. Caso contrário, a classe é a de maior ativação.
+    :param class_map: as classes correspondentes às saídas da rede.
+    :return: a classe.
+    """
+    if len(values) == 1:
+        return class_map[1 if values[0] > 0.5 else 0]
+
+    return class_map[max(range(len(values)), key=values.__getitem__)]
+
+
+class FrozenMLP:
+    """
+    Representa uma rede neural treinada e imutável, utilizada apenas para predição.
+
+    Na precisão 'float64', os pesos de cada camada são copiados para tuplas (uma por neurônio), que são imutáveis e, no
+    CPython, percorridas mais rapidamente que listas ou `memoryview`. Nas precisões 'float32' e 'int8', os pesos de cada
+    camada são armazenados em um único vetor contíguo de 4 ou 1 byte por peso, exposto por meio de `memoryview` somente
+    leitura. Na precisão 'int8', cada camada possui uma escala, e os seus bias são armazenados em 'float32'.
+
+    A propagação não escreve em nenhum estado compartilhado, de forma que uma mesma instância pode ser utilizada por
+    várias `threads` simultaneamente, sem travas.
+
+    Instâncias dessa classe são criadas por ``MLPClassifier.freeze`` ou por ``load``.
+    """
+
+    __slots__ = ('_layers', '_layer_sizes', '_activations', '_class_map', '_precision')
+
+    def __init__(
+            self,
+            weights: Sequence[Matrix],
+            biases: Sequence[Vector],
+            activations: Sequence[str],
+            class_map: Sequence[Any],
+            *,
+            precision: str = 'float64',
+    ):
+        """
+        Cria uma rede neural imutável a partir dos pesos de uma rede neural treinada. Os pesos são copiados.
+
+        :param weights: as matrizes de pesos de cada camada, exceto a de entrada.
+        :param biases: os vetores de bias de cada camada, exceto a de entrada.
+        :param activations: o nome da função de ativação de cada camada, exceto a de entrada.
+        :param class_map: as classes correspondentes às saídas da rede.
+        :param precision: a precisão com que os pesos são armazenados: 'float64' (padrão), 'float32' ou 'int8'.
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"invalid precision: {precision}")
+
+        if not len(weights) == len(biases) == len(activations):
+            raise ValueError("weights, biases and activations must have one entry per layer")
+
+        n_inputs = len(weights[0][0]) if weights else 0
+        for W, b in zip(weights, biases):
+            if len(W) != len(b) or any(len(row) != n_inputs for row in W):
+                raise ValueError("each weight matrix must have one row per bias and one column per input")
+            n_inputs = len(W)
+
+        weight_dtype, bias_dtype = PRECISIONS[precision]
+        layers: List[_Layer] = []
+        for W, b, activation in zip(weights, biases, activations):
+            scale: Optional[float] = None
+            if precision == 'int8':
+                W, scale = _quantize(W)
+
+            layers.append((_pack(W, weight_dtype), _pack([b], bias_dtype)[0], ACTIVATIONS[activation], scale))
+
+        self._initialize(layers, activations, class_map, precision)
+
+    def _initialize(self, layers: List[_Layer], activations: Sequence[str], class_map: Sequence[Any], precision: str):
+        layer_sizes = [len(layers[0][0][0])] if layers else []
+        layer_sizes += [len(rows) for rows, _, _, _ in layers]
+
+        set_ = object.__setattr__
+        set_(self, '_layers', tuple(layers))
+        set_(self, '_layer_sizes', tuple(layer_sizes))
+        set_(self, '_activations', tuple(activations))
+        set_(self, '_class_map', tuple(class_map))
+        set_(self, '_precision', precision)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    @property
+    def layer_sizes(self) -> Tuple[int, ...]:
+        """
+        O número de neurônios de cada camada dessa rede, incluindo a camada de entrada.
+        """
+        return self._layer_sizes
+
+    @property
+    def activations(self) -> Tuple[str, ...]:
+        """
+        O nome da função de ativação de cada camada dessa rede, exceto a de entrada.
+        """
+        return self._activations
+
+    @property
+    def class_map(self) -> Tuple[Any, ...]:
+        """
+        As classes correspondentes às saídas dessa rede.
+        """
+        return self._class_map
+
+    @property
+    def precision(self) -> str:
+        """
+        A precisão com que os pesos dessa rede são armazenados: 'float64', 'float32' ou 'int8'.
+        """
+        return self._precision
+
+    @property
+    def nbytes(self) -> int:
+        """
+        O número de bytes ocupados pelos pesos e bias dessa rede em sua precisão, sem contar o custo dos objetos Python.
+        """
+        weight_dtype, bias_dtype = PRECISIONS[self._precision]
+        n_weights = sum(len(rows) * len(rows[0]) for rows, _, _, _ in self._layers if rows)
+        n_biases = sum(len(b) for _, b, _, _ in self._layers)
+        return n_weights * _ITEMSIZES[weight_dtype] + n_biases * _ITEMSIZES[bias_dtype]
+
+    def transform_batch(self, X: Matrix) -> Matrix:
+        """
+        Propaga um conjunto de amostras por essa rede.
+
+        A propagação é feita camada a camada sobre o conjunto inteiro, de forma que os pesos de cada camada são
+        percorridos uma única vez por chamada.
+
+        :param X: as características das amostras.
+        :return: as ativações da camada de saída para cada amostra.
+        """
+        n_inputs = self._layer_sizes[0]
+        for sample in X:
+            if len(sample) != n_inputs:
+                raise ValueError(f"sample size ({len(sample)}) must match given input size ({n_inputs})")
+
+        mul = operator.mul
+        A: Matrix = X
+        for rows, b, activation, scale in self._layers:
+            function = activation.function
+            outputs: Matrix = []
+            for a in A:
+                if scale is None:
+                    z = [sum(map(mul, row, a), b_j) for row, b_j in zip(rows, b)]
+                else:
+                    z = [sum(map(mul, row, a)) * scale + b_j for row, b_j in zip(rows, b)]
+                outputs.append(function(z, z))
+            A = outputs
+
+        return A
+
+    def transform(self, sample: Vector) -> Vector:
+        """
+        Propaga uma amostra por essa rede.
+
+        :param sample: a amostra a ser propagada.
+        :return: as ativações da camada de saída.
+        """
+        return self.transform_batch([sample])[0]
+
+    def predict(self, X: Union[Vector, Matrix]) -> Union[Any, Vector]:
+        """
+        Prediz as classes dos dados fornecidos.
+
+        :param X: as características das amostras a serem previstas.
+        :return: a(s) classe(s) das amostras fornecidas.
+        """
+        vector = is_vector(X)
+        class_map = self._class_map
+        outcomes = [decode(values, class_map) for values in self.transform_batch([X] if vector else X)]
+        return outcomes[0] if vector else outcomes
+
+    def save(self, path: str):
+        """
+        Salva essa rede neural em um arquivo binário compacto, com os pesos na sua precisão.
+
+        :param path: o caminho do arquivo.
+        """
+        weight_dtype, bias_dtype = PRECISIONS[self._precision]
+        meta = {
+            'precision': self._precision,
+            'activations': list(self._activations),
+            'class_map': list(self._class_map),
+            'scales': [scale for _, _, _, scale in self._layers],
+        }
+
+        arrays: Dict[str, Array] = {}
+        dtypes: Dict[str, str] = {}
+        for i, (rows, b, _, _) in enumerate(self._layers):
+            arrays[f'weights_{i}'] = rows
+            arrays[f'biases_{i}'] = b
+            dtypes.update({f'weights_{i}': weight_dtype, f'biases_{i}': bias_dtype})
+
+        save_arrays(path, type(self).__name__, meta, arrays, dtypes)
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = True) -> 'FrozenMLP':
+        """
+        Carrega uma rede neural salva por ``save``.
+
+        :param path: o caminho do arquivo.
+        :param mmap: se o arquivo deve ser mapeado em memória, padrão `True`. Nesse caso, os pesos são `memoryview`
+                        somente leitura sobre o arquivo, sem cópia dos dados.
+        :return: a rede neural carregada.
+        """
+        kind, meta, arrays = load_arrays(path, mmap=mmap)
+        if kind != cls.__name__:
+            raise ValueError(f"'{path}' does not contain a {cls.__name__} model")
+
+        precision = meta['precision']
+        weight_dtype, bias_dtype = PRECISIONS[precision]
+        layers: List[_Layer] = []
+        for i, (activation, scale) in enumerate(zip(meta['activations'], meta['scales'])):
+            rows, b = arrays[f'weights_{i}'], arrays[f'biases_{i}']
+            if mmap:
+                layer = (tuple(row.toreadonly() for row in rows), b.toreadonly(), ACTIVATIONS[activation], scale)
+            else:
+                layer = (_pack(rows, weight_dtype), _pack([b], bias_dtype)[0], ACTIVATIONS[activation], scale)
+            layers.append(layer)
+
+        frozen = cls.__new__(cls)
+        frozen._initialize(layers, meta['activations'], meta['class_map'], precision)
+        return frozen
+
+    def __repr__(self):
+        return (f'FrozenMLP(layer_sizes={list(self._layer_sizes)}, activations={list(self._activations)}, '
+                f'precision={self._precision!r})')
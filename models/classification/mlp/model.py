@@ -1,17 +1,37 @@
-from typing import List, Optional, Union, Tuple
-
-from models.classification.mlp.gradient import Gradient
-from models.classification.mlp.perceptron import UpdatingPerceptron, Perceptron, InputPerceptron
-from models.utils.linear_alg import Vector, Matrix
+import contextlib
+import copy
+import math
+import random
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Set, Union, Tuple, Type
+
+from models.classification.mlp.frozen import FrozenMLP, PRECISIONS, decode
+from models.classification.mlp.network import Network
+from models.classification.mlp.parallel import DataParallelTrainer
+from models.classification.mlp.optimizer import Optimizer, SGD, Momentum, Nesterov, Adam
+from models.classification.mlp.perceptron import Perceptron, InputPerceptron
+from models.utils.checkpoint import save_checkpoint, load_checkpoint, flatten, unflatten
+from models.utils.linear_alg import Vector, Matrix, is_vector
 from models.utils.lists import cols
+from models.utils.math import sigmoid, relu
+from models.utils.serialization import Array, save_arrays, load_arrays
 
 Layer = List[Perceptron]
-UpdatingLayer = List[UpdatingPerceptron]
+
+_OPTIMIZERS: Dict[str, Type[Optimizer]] = {'sgd': SGD, 'momentum': Momentum, 'nesterov': Nesterov, 'adam': Adam}
+
+_HIDDEN_ACTIVATIONS: Dict[str, Callable[[float], float]] = {'sigmoid': sigmoid, 'tanh': math.tanh, 'relu': relu}
+"""
+As funções de ativação suportadas pelas camadas ocultas, por nome, com as suas respectivas versões escalares.
+"""
 
 
 class MLPClassifier:
     """
-    Representa uma rede neural com múltiplos neurônios em um contexto de classificação binária.
+    Representa uma rede neural com múltiplos neurônios em um contexto de classificação.
+
+    Em problemas binários, a camada de saída possui um único neurônio com a função sigmoide, treinado com o erro
+    quadrático. Em problemas com mais de duas classes, a camada de saída possui um neurônio por classe com a função
+    softmax, treinada com a entropia cruzada, de forma que um único treinamento cobre todas as classes.
 
     ####
     Referências
@@ -22,7 +42,22 @@ class MLPClassifier:
     - https://mattmazur.com/2015/03/17/a-step-by-step-backpropagation-example/
     """
 
-    def __init__(self, *, n_layers: int, layer_size: int, learning_rate: float = 0.3, n_generations: int = 100):
+    def __init__(
+            self,
+            *,
+            n_layers: int,
+            layer_size: int,
+            learning_rate: float = 0.3,
+            n_generations: int = 100,
+            batch_size: Optional[int] = None,
+            shuffle: bool = False,
+            optimizer: Union[str, Optimizer] = 'sgd',
+            tol: float = 1e-4,
+            n_iter_no_change: Optional[int] = None,
+            validation_fraction: float = 0.0,
+            n_jobs: Optional[int] = None,
+            activation: Union[str, Sequence[str]] = 'sigmoid',
+    ):
         """
         Constrói uma rede neural.
 
@@ -30,7 +65,53 @@ class MLPClassifier:
         :param layer_size: número de neurônios em cada camada oculta dessa rede.
         :param learning_rate: taxa de aprendizado dos neurônios dessa rede.
         :param n_generations: número de gerações dessa rede.
+        :param batch_size: número de amostras cujos gradientes são acumulados antes de cada atualização dos pesos. Se
+                            `None` (padrão), os pesos são atualizados a cada amostra (modo `online`).
+        :param shuffle: se as amostras devem ser embaralhadas a cada geração, padrão `False`.
+        :param optimizer: o otimizador dos pesos dessa rede: 'sgd' (padrão), 'momentum', 'nesterov', 'adam' ou uma
+                            instância de ``Optimizer``. Caso seja o nome de um otimizador, ele é criado com a taxa de
+                            aprendizado ``learning_rate`` e os seus demais parâmetros padrão.
+        :param tol: a melhoria mínima do erro para que uma geração seja considerada uma melhoria, padrão 1e-4.
+        :param n_iter_no_change: o número de gerações consecutivas sem melhoria após o qual o treinamento é
+                                    interrompido e os pesos da geração de menor erro são restaurados. Se `None`
+                                    (padrão), todas as ``n_generations`` gerações são executadas.
+        :param validation_fraction: a proporção das amostras de treinamento separadas para validação, entre 0 e 1. Se
+                                    positiva, o erro sobre as amostras de validação é utilizado na interrupção do
+                                    treinamento em vez do erro de treinamento, padrão 0.
+        :param n_jobs: o número de processos entre os quais o cálculo dos gradientes de cada lote é distribuído. Caso
+                        seja maior que 1, ``batch_size`` deve ser fornecido. Se `None` (padrão), o treinamento ocorre
+                        no processo atual.
+        :param activation: a função de ativação das camadas ocultas: 'sigmoid' (padrão), 'tanh' ou 'relu'. Pode ser
+                            uma sequência com uma função por camada oculta. A camada de saída não é afetada: ela
+                            utiliza a função sigmoide em problemas binários e a função softmax, com a entropia
+                            cruzada, em problemas com mais de duas classes.
         """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size ({batch_size}) must be greater than zero")
+
+        if n_jobs is not None and n_jobs < 1:
+            raise ValueError(f"n_jobs ({n_jobs}) must be greater than zero")
+
+        if n_jobs is not None and n_jobs > 1 and batch_size is None:
+            raise ValueError("batch_size must be given when n_jobs is greater than one")
+
+        activations = [activation] * n_layers if isinstance(activation, str) else list(activation)
+        if len(activations) != n_layers:
+            raise ValueError(f"number of activations ({len(activations)}) must match n_layers ({n_layers})")
+
+        for name in activations:
+            if name not in _HIDDEN_ACTIVATIONS:
+                raise ValueError(f"invalid activation: {name}")
+
+        if isinstance(optimizer, str) and optimizer not in _OPTIMIZERS:
+            raise ValueError(f"invalid optimizer: {optimizer}")
+
+        if n_iter_no_change is not None and n_iter_no_change < 1:
+            raise ValueError(f"n_iter_no_change ({n_iter_no_change}) must be greater than zero")
+
+        if not 0 <= validation_fraction < 1:
+            raise ValueError(f"validation_fraction ({validation_fraction}) must be between 0 (inclusive) and 1 "
+                             f"(exclusive)")
 
         self.n_layers: int = n_layers
         """
@@ -54,161 +135,510 @@ class MLPClassifier:
         A taxa de aprendizagem dos neurônios dessa rede neural.
         """
 
-        self.layers: Optional[List[Layer]] = None
+        self.batch_size: Optional[int] = batch_size
         """
-        As camadas dessa rede neural.
+        O número de amostras de cada atualização dos pesos dessa rede neural.
         
-        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        Caso seja `None`, os pesos são atualizados a cada amostra.
         """
 
-        self._class_map: Optional[Tuple[float, float]] = None
+        self.shuffle: bool = shuffle
         """
-        Mapeamento de classes dessa rede neural.
+        Se as amostras de treinamento são embaralhadas a cada geração.
+        """
+
+        self.optimizer: Union[str, Optimizer] = optimizer
+        """
+        O otimizador dos pesos dessa rede neural.
         
-        Cada valor dessa tupla é uma classe fornecida pelo usuário (por ser um algoritmo de classificação binária, 
-        a tupla possui apenas dois elementos). O valor da posição 0 corresponde ao valor da classe negativa e o valor
-        da posição 1 ao valor da classe positiva). Como a função sigmoide apenas gera valores entre 0 e 1, esse 
-        mapeamento é utilizado para normalizar os dados de entrada para esses dois valores.
+        Uma cópia desse otimizador é utilizada a cada chamada de ``fit``, de forma que o seu estado não é compartilhado
+        entre treinamentos.
+        """
+
+        self.tol: float = tol
+        """
+        A melhoria mínima do erro para que uma geração seja considerada uma melhoria.
+        """
+
+        self.n_iter_no_change: Optional[int] = n_iter_no_change
+        """
+        O número de gerações consecutivas sem melhoria após o qual o treinamento é interrompido.
         
-        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        Caso seja `None`, o treinamento nunca é interrompido antes de ``n_generations`` gerações.
+        """
+
+        self.validation_fraction: float = validation_fraction
+        """
+        A proporção das amostras de treinamento separadas para validação.
+        """
+
+        self.n_jobs: Optional[int] = n_jobs
+        """
+        O número de processos entre os quais o cálculo dos gradientes de cada lote é distribuído.
+        
+        O resultado do treinamento depende apenas da semente aleatória e desse número. Caso seja `None`, o treinamento 
+        ocorre no processo atual.
         """
 
-    # noinspection NonAsciiCharacters,PyPep8Naming
-    def _update_hidden_weights(self, previous_layer: UpdatingLayer, current_layer: UpdatingLayer,
-                               next_layer: UpdatingLayer):
+        self.activation: Union[str, Sequence[str]] = activation
+        """
+        A função de ativação das camadas ocultas dessa rede neural, ou uma função por camada oculta.
         """
-        Atualiza os pesos de camada oculta da rede neural.
 
-        Como é uma camada oculta, o cálculo dos novos pesos também depende dos pesos já calculados na camada posterior.
+        self.loss_curve_: Optional[Vector] = None
+        """
+        O erro médio das amostras de treinamento em cada geração do último treinamento.
+        
+        O erro de uma amostra é calculado antes da atualização dos pesos causada por ela. Caso seja `None`, o método 
+        ``fit`` ainda não foi chamado.
+        """
 
-        :param previous_layer: a camada anterior (isto é, que age como entrada) à camada a ser atualizada.
-        :param current_layer: a camada a ser atualizada.
-        :param next_layer: a camada posterior (isto é, que age como saída) à camada a ser atualizada.
+        self.validation_loss_curve_: Optional[Vector] = None
+        """
+        O erro médio das amostras de validação ao final de cada geração do último treinamento.
+        
+        Caso ``validation_fraction`` seja zero, essa lista é vazia. Caso seja `None`, o método ``fit`` ainda não foi 
+        chamado.
         """
-        for i, current_perceptron in enumerate(current_layer):
-            Δws: Vector = []
-            a_i: float = current_perceptron.last_output
 
-            for previous_perceptron in previous_layer:
-                a_j: float = previous_perceptron.last_output
+        self.best_loss_: Optional[float] = None
+        """
+        O menor erro (de validação, caso haja amostras de validação, ou de treinamento) do último treinamento.
+        
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
 
-                δe: Gradient = Gradient()
-                δe.δa = 0.0
-                for next_perceptron in next_layer:
-                    a_k: float = next_perceptron.last_output
-                    w_k: float = next_perceptron.weights[i]
-                    δe_k: Gradient = next_perceptron.gradients[i]
+        self.n_generations_: Optional[int] = None
+        """
+        O número de gerações executadas no último treinamento.
+        
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
 
-                    δe.δa += w_k * a_k * (1 - a_k) * δe_k.δa
+        self._optimizer: Optional[Optimizer] = None
+        """
+        O otimizador utilizado no último treinamento dessa rede neural, com o seu estado.
+        
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
+
+        self._network: Optional[Network] = None
+        """
+        As camadas dessa rede neural, na forma matricial.
+        
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
 
-                δe.δw = a_j * a_i * (1.0 - a_i) * δe.δa
-                current_perceptron.put(δe)
+        self._class_map: Optional[Tuple[Any, ...]] = None
+        """
+        Mapeamento de classes dessa rede neural.
+        
+        Cada valor dessa tupla é uma classe fornecida pelo usuário, em ordem crescente. Em problemas binários, o valor 
+        da posição 0 corresponde ao valor da classe negativa e o valor da posição 1 ao valor da classe positiva. Como a 
+        função sigmoide apenas gera valores entre 0 e 1, esse mapeamento é utilizado para normalizar os dados de entrada 
+        para esses dois valores. Em problemas com mais classes, o valor da posição `i` corresponde ao neurônio `i` da 
+        camada de saída.
+        
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
 
-                Δws.append(-self.learning_rate * δe.δw)
+    @property
+    def layers(self) -> Optional[List[Layer]]:
+        """
+        As camadas dessa rede neural, como perceptrons.
 
-            weights: Vector = current_perceptron.weights
-            assert len(weights) > 0
-            assert len(weights) == len(current_perceptron.gradients)
-            current_perceptron.update([weight + Δw for weight, Δw in zip(weights, Δws)])
+        Os perceptrons são construídos a partir das matrizes de pesos da rede a cada acesso e servem apenas para
+        inspeção: a lista de pesos de cada perceptron é a própria linha da matriz de pesos correspondente.
 
-    # noinspection NonAsciiCharacters,PyPep8Naming
-    def _update_output_weights(self, previous_layer: UpdatingLayer, current_layer: UpdatingLayer, y_true: float):
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
+        network = self._network
+        if network is None:
+            return None
+
+        layers: List[Layer] = [[InputPerceptron() for _ in range(network.layer_sizes[0])]]
+        for W, b, activation in zip(network.weights, network.biases, network.activations):
+            # Os perceptrons de uma camada softmax produzem as suas entradas, já que a função depende da camada inteira
+            function = _HIDDEN_ACTIVATIONS.get(activation, float)
+            layers.append([Perceptron(input_size=len(row), bias=bias, weights=row, activation=function)
+                           for row, bias in zip(W, b)])
+
+        return layers
+
+    def fit(
+            self,
+            X: Matrix,
+            y: Vector,
+            *,
+            checkpoint: Optional[str] = None,
+            checkpoint_interval: int = 1,
+            resume_from: Optional[str] = None,
+    ) -> 'MLPClassifier':
         """
-        Atualiza os pesos de camada de saída da rede neural.
+        Ajusta o classificador ao conjunto de dados de treinamento.
 
-        Como é uma camada de saída, o cálculo dos novos pesos apenas depende da saída esperada do algoritmo.
+        Caso ``batch_size`` seja `None`, o modo de atualização dos pesos é `online`, ocorrendo a cada amostra. Caso
+        contrário, os gradientes de cada lote de ``batch_size`` amostras são acumulados e a média deles é aplicada em
+        uma única atualização. Caso ``n_jobs`` seja maior que 1, os gradientes de cada lote são calculados em paralelo
+        por ``n_jobs`` processos, cada um responsável por um fragmento do lote.
 
-        :param previous_layer: a camada anterior (isto é, que age como entrada) à camada a ser atualizada.
-        :param current_layer: a camada a ser atualizada.
-        :param y_true: a saída esperada para a última saída produzida por essa camada.
+        :param X: as características das amostras de treinamento.
+        :param y: as classes das amostras de treinamento.
+        :param checkpoint: o caminho do arquivo em que o estado do treinamento (pesos, estado do otimizador, estado do
+                            gerador de números aleatórios e número de gerações) é salvo periodicamente, exceto ao
+                            final do treinamento. Se `None` (padrão), nenhum ponto de controle é salvo.
+        :param checkpoint_interval: o número de gerações entre dois pontos de controle, padrão 1.
+        :param resume_from: o caminho de um ponto de controle a partir do qual o treinamento é retomado. As amostras de
+                            treinamento e os parâmetros dessa rede devem ser os mesmos do treinamento interrompido, mas
+                            ``n_generations`` pode ser aumentado. Se `None` (padrão), o treinamento começa do zero.
+        :raises ValueError: se as classes, a arquitetura, as funções de ativação ou o otimizador do ponto de controle
+                            forem diferentes dos dessa rede neural.
+        :return: o classificador ajustado.
         """
-        for current_perceptron in current_layer:
-            Δws: Vector = []
-            a_i: float = current_perceptron.last_output
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval ({checkpoint_interval}) must be greater than zero")
+
+        if resume_from is None:
+            self._initialize(cols(X), set(y))
+
+            # Separa as amostras de validação, caso necessário
+            train_indices: List[int] = list(range(len(X)))
+            validation_indices: List[int] = []
+            if self.validation_fraction > 0:
+                n_validation = max(1, int(len(X) * self.validation_fraction))
+                if n_validation >= len(X):
+                    raise ValueError("validation_fraction leaves no samples for training")
+
+                validation_indices = sorted(random.sample(train_indices, n_validation))
+                validation_set = set(validation_indices)
+                train_indices = [i for i in train_indices if i not in validation_set]
+
+            self.loss_curve_ = []
+            self.validation_loss_curve_ = []
+            self.best_loss_ = math.inf
+            self.n_generations_ = 0
+            best_parameters: Optional[Matrix] = None
+            n_no_change = 0
+        else:
+            train_indices, validation_indices, best_parameters, n_no_change = self._resume(resume_from, X, y)
+
+        network = self._network
+        targets = self._targets(y)
 
-            for previous_perceptron in previous_layer:
-                a_j: float = previous_perceptron.last_output
-                t_i: float = y_true
+        # Atualiza os pesos por meio de backpropagation
+        with self._trainer(X, targets) as trainer:
+            while self.n_generations_ < self.n_generations:
+                if self.shuffle:
+                    random.shuffle(train_indices)
+
+                loss = self._train_generation(X, targets, train_indices, trainer)
+                self.loss_curve_.append(loss)
+                self.n_generations_ += 1
+
+                if validation_indices:
+                    loss = self._loss(X, targets, validation_indices)
+                    self.validation_loss_curve_.append(loss)
+
+                n_no_change = 0 if loss < self.best_loss_ - self.tol else n_no_change + 1
+                if loss < self.best_loss_:
+                    self.best_loss_ = loss
+                    if self.n_iter_no_change is not None:
+                        best_parameters = [list(vector) for vector in network.parameters]
+
+                if self.n_iter_no_change is not None and n_no_change >= self.n_iter_no_change:
+                    break
+
+                # O ponto de controle não é salvo na última geração, de forma que um treinamento retomado sempre
+                # executa ao menos uma geração
+                if (checkpoint is not None and self.n_generations_ % checkpoint_interval == 0
+                        and self.n_generations_ < self.n_generations):
+                    self._checkpoint(checkpoint, train_indices, validation_indices, best_parameters, n_no_change)
+
+        # Restaura os pesos da geração de menor erro
+        if best_parameters is not None:
+            for vector, best_vector in zip(network.parameters, best_parameters):
+                vector[:] = best_vector
 
-                δe: Gradient = Gradient()
-                δe.δa = - (t_i - a_i)
-                δe.δw = a_j * a_i * (1.0 - a_i) * δe.δa
-                current_perceptron.put(δe)
+        return self
 
-                Δws.append(-self.learning_rate * δe.δw)
+    def _checkpoint(self, path: str, train_indices: List[int], validation_indices: List[int],
+                    best_parameters: Optional[Matrix], n_no_change: int):
+        """
+        Salva o estado do treinamento atual dessa rede neural em um ponto de controle.
 
-            weights: Vector = current_perceptron.weights
-            assert len(weights) > 0
-            assert len(weights) == len(current_perceptron.gradients)
-            current_perceptron.update([weight + Δw for weight, Δw in zip(weights, Δws)])
+        :param path: o caminho do arquivo.
+        :param train_indices: os índices das amostras de treinamento, na ordem atual.
+        :param validation_indices: os índices das amostras de validação.
+        :param best_parameters: os parâmetros da geração de menor erro, ou `None`.
+        :param n_no_change: o número de gerações consecutivas sem melhoria.
+        """
+        network = self._network
+        optimizer = self._optimizer
+        meta = {
+            'class_map': list(self._class_map),
+            'layer_sizes': network.layer_sizes,
+            'activations': network.activations,
+            'loss_function': network.loss_function,
+            'optimizer': type(optimizer).__name__,
+            'n_steps': optimizer.n_steps,
+            'n_state': len(optimizer.state),
+            'best_loss': self.best_loss_ if self.best_loss_ < math.inf else None,
+            'n_no_change': n_no_change,
+        }
+
+        arrays: Dict[str, Array] = {
+            'parameters': flatten(network.parameters),
+            'train_indices': train_indices,
+            'validation_indices': validation_indices,
+            'loss_curve': self.loss_curve_,
+            'validation_loss_curve': self.validation_loss_curve_,
+        }
+        dtypes = {'train_indices': 'i8', 'validation_indices': 'i8'}
+        for k, vectors in enumerate(optimizer.state):
+            arrays[f'optimizer_state_{k}'] = flatten(vectors)
+        if best_parameters is not None:
+            arrays['best_parameters'] = flatten(best_parameters)
+
+        save_checkpoint(path, f'{type(self).__name__}Checkpoint', self.n_generations_, meta, arrays, dtypes)
+
+    def _resume(self, path: str, X: Matrix, y: Vector) -> Tuple[List[int], List[int], Optional[Matrix], int]:
+        """
+        Restaura o estado de um treinamento dessa rede neural a partir de um ponto de controle.
 
-    def _update_weights(self, sample: Vector, y_true: float):
+        :param path: o caminho do arquivo.
+        :param X: as características das amostras de treinamento.
+        :param y: as classes das amostras de treinamento.
+        :raises ValueError: se as classes, a arquitetura, as funções de ativação ou o otimizador do ponto de controle
+                            forem diferentes dos dessa rede neural.
+        :return: os índices das amostras de treinamento (na ordem atual) e de validação, os parâmetros da geração de
+                    menor erro (ou `None`) e o número de gerações consecutivas sem melhoria.
+        """
+        iteration, meta, arrays = load_checkpoint(path, f'{type(self).__name__}Checkpoint')
+
+        class_map = tuple(sorted(set(y)))
+        if tuple(meta['class_map']) != class_map:
+            raise ValueError(f"checkpoint classes ({meta['class_map']}) do not match the classes of y "
+                             f"({list(class_map)})")
+
+        layer_sizes, activations, loss_function = self._architecture(cols(X), len(class_map))
+        saved = (meta['layer_sizes'], meta['activations'], meta['loss_function'])
+        if saved != (layer_sizes, activations, loss_function):
+            raise ValueError(f"checkpoint network {saved} does not match this classifier "
+                             f"{(layer_sizes, activations, loss_function)}")
+
+        # A rede é criada sem sortear pesos, para não alterar o estado restaurado do gerador de números aleatórios
+        self._class_map = class_map
+        network = Network([[[0.0] * n_inputs for _ in range(n_outputs)] for n_inputs, n_outputs in
+                           zip(layer_sizes, layer_sizes[1:])], [[0.0] * n_outputs for n_outputs in layer_sizes[1:]],
+                          activations, loss_function)
+        sizes = [len(vector) for vector in network.parameters]
+        for vector, values in zip(network.parameters, unflatten(arrays['parameters'], sizes)):
+            vector[:] = values
+        self._network = network
+
+        optimizer = self._create_optimizer()
+        if type(optimizer).__name__ != meta['optimizer']:
+            raise ValueError(f"checkpoint optimizer ({meta['optimizer']}) does not match {type(optimizer).__name__}")
+        optimizer.n_steps = meta['n_steps']
+        optimizer.state = [unflatten(arrays[f'optimizer_state_{k}'], sizes) for k in range(meta['n_state'])]
+        self._optimizer = optimizer
+
+        self.loss_curve_ = arrays['loss_curve']
+        self.validation_loss_curve_ = arrays['validation_loss_curve']
+        self.best_loss_ = math.inf if meta['best_loss'] is None else meta['best_loss']
+        self.n_generations_ = iteration
+
+        best_parameters = unflatten(arrays['best_parameters'], sizes) if 'best_parameters' in arrays else None
+        return arrays['train_indices'], arrays['validation_indices'], best_parameters, meta['n_no_change']
+
+    def partial_fit(self, X: Matrix, y: Vector, classes: Optional[Sequence[Any]] = None) -> 'MLPClassifier':
         """
-        Atualiza os pesos das camadas da rede neural por backpropagation.
+        Ajusta o classificador a um novo conjunto de amostras de treinamento, mantendo os pesos atuais.
+
+        Executa uma única geração sobre as amostras fornecidas, continuando do estado atual da rede e do otimizador.
+        Caso a rede ainda não tenha sido treinada, ela é criada a partir de ``classes``. As demais opções de treinamento
+        (``batch_size``, ``shuffle``, ``optimizer`` e ``n_jobs``) são respeitadas, enquanto ``n_generations``,
+        ``n_iter_no_change`` e ``validation_fraction`` são ignoradas.
+
+        :param X: as características das novas amostras de treinamento.
+        :param y: as classes das novas amostras de treinamento.
+        :param classes: todas as classes do problema. Deve ser fornecido na primeira chamada, já que as amostras de
+                        cada chamada podem não conter todas as classes. Nas chamadas seguintes, caso fornecido, deve
+                        coincidir com as classes da primeira chamada.
+        :raises ValueError: se ``classes`` não for fornecido na primeira chamada, se não coincidir com as classes
+                            anteriores ou se ``y`` possuir classes desconhecidas.
+        :return: o classificador ajustado.
+        """
+        if self._network is None:
+            if classes is None:
+                raise ValueError("classes must be given on the first call to 'partial_fit'")
+
+            self._initialize(cols(X), set(classes))
+        elif classes is not None and tuple(sorted(set(classes))) != self._class_map:
+            raise ValueError("classes must match the classes of previous calls")
+
+        n_inputs = self._network.layer_sizes[0]
+        if cols(X) != n_inputs:
+            raise ValueError(f"sample size ({cols(X)}) must match given input size ({n_inputs})")
+
+        unknown = set(y) - set(self._class_map)
+        if unknown:
+            raise ValueError(f"unknown classes found in y: {sorted(unknown, key=repr)}")
+
+        if self._optimizer is None:
+            self._optimizer = self._create_optimizer()
+
+        if self.loss_curve_ is None:
+            self.loss_curve_ = []
+            self.validation_loss_curve_ = []
+            self.best_loss_ = math.inf
+            self.n_generations_ = 0
+
+        targets = self._targets(y)
+        order: List[int] = list(range(len(X)))
+        if self.shuffle:
+            random.shuffle(order)
+
+        with self._trainer(X, targets) as trainer:
+            loss = self._train_generation(X, targets, order, trainer)
+
+        self.loss_curve_.append(loss)
+        self.best_loss_ = min(self.best_loss_, loss)
+        self.n_generations_ += 1
+        return self
 
-        :param sample: a amostra cujos novos pesos serão adaptados de acordo.
-        :param y_true: a saída esperada para essa amostra.
+    def _initialize(self, n_cols: int, classes: Set[Any]):
         """
-        self.transform(sample)
+        Cria as camadas e o otimizador dessa rede neural.
 
-        layers: List[UpdatingLayer]
-        layers = [[UpdatingPerceptron(perceptron) for perceptron in layer] for layer in self.layers]
+        :param n_cols: o número de características das amostras.
+        :param classes: as classes do problema.
+        """
+        self._class_map = tuple(sorted(classes))
+        self._network = Network.create(*self._architecture(n_cols, len(self._class_map)))
+        self._optimizer = self._create_optimizer()
 
-        for i_l, current_layer in reversed(list(enumerate(layers[1:], start=1))):
-            previous_layer: UpdatingLayer = layers[i_l - 1]
+    def _architecture(self, n_cols: int, n_classes: int) -> Tuple[List[int], List[str], str]:
+        """
+        :param n_cols: o número de características das amostras.
+        :param n_classes: o número de classes do problema.
+        :return: o tamanho de cada camada, a função de ativação de cada camada e a função de erro dessa rede neural.
+        """
+        layer_sizes = [n_cols] + [self.layer_size] * self.n_layers
+        if n_classes > 2:
+            return layer_sizes + [n_classes], self._activations() + ['softmax'], 'cross_entropy'
 
-            if i_l < len(layers) - 1:
-                next_layer: UpdatingLayer = layers[i_l + 1]
-                self._update_hidden_weights(previous_layer, current_layer, next_layer)
-            else:
-                self._update_output_weights(previous_layer, current_layer, y_true)
+        return layer_sizes + [1], self._activations() + ['sigmoid'], 'squared_error'
 
-    def fit(self, X: Matrix, y: Vector) -> 'MLPClassifier':
+    def _targets(self, y: Vector) -> Matrix:
         """
-        Ajusta o classificador ao conjunto de dados de treinamento.
+        :param y: as classes das amostras.
+        :return: as saídas esperadas dessa rede neural para cada amostra.
+        """
+        positions: Dict[Any, int] = {outcome: i for i, outcome in enumerate(self._class_map)}
+        if len(self._class_map) <= 2:
+            return [[float(positions[outcome])] for outcome in y]
 
-        O modo de atualização dos pesos é `online`, ocorrendo a cada chamada desse método.
+        targets: Matrix = []
+        for outcome in y:
+            target = [0.0] * len(self._class_map)
+            target[positions[outcome]] = 1.0
+            targets.append(target)
 
+        return targets
+
+    def _trainer(self, X: Matrix, targets: Matrix) -> ContextManager[Optional[DataParallelTrainer]]:
+        """
         :param X: as características das amostras de treinamento.
-        :param y: as classes das amostras de treinamento. Deve possuir apenas valores 0 e 1.
-        :return: o classificador ajustado.
+        :param targets: as saídas esperadas para cada amostra de treinamento.
+        :return: um gerenciador de contexto que fornece o responsável pelo cálculo paralelo dos gradientes, caso
+                    ``n_jobs`` seja maior que 1, ou `None`.
         """
+        if self.n_jobs is not None and self.n_jobs > 1:
+            return DataParallelTrainer(self._network, X, targets, self.n_jobs)
 
-        classes = set(y)
-        if len(classes) > 2:
-            raise ValueError("more than two classes found in y")
+        return contextlib.nullcontext()
 
-        self._class_map = tuple(sorted(classes))
+    def _activations(self) -> List[str]:
+        """
+        :return: o nome da função de ativação de cada camada oculta dessa rede neural.
+        """
+        if isinstance(self.activation, str):
+            return [self.activation] * self.n_layers
 
-        n_cols: int = cols(X)
+        return list(self.activation)
 
-        # Inicializa as camadas
-        bias: float
-        previous_layer_size: int
+    def _loss(self, X: Matrix, targets: Matrix, indices: List[int]) -> float:
+        """
+        Calcula o erro médio dessa rede neural sobre um conjunto de amostras.
 
-        layers: List[Layer] = [[InputPerceptron() for _ in range(n_cols)]]
-        previous_layer_size = n_cols
+        :param X: as características das amostras.
+        :param targets: as saídas esperadas para cada amostra.
+        :param indices: os índices das amostras a serem consideradas.
+        :return: o erro médio.
+        """
+        network = self._network
+        loss = 0.0
+        for i in indices:
+            network.forward(X[i])
+            loss += network.loss(targets[i])
 
-        if self.n_layers > 0:
-            bias = 0.0
-            layers.append([Perceptron(input_size=previous_layer_size, bias=bias) for _ in range(self.layer_size)])
-            previous_layer_size = self.layer_size
+        return loss / len(indices)
 
-            for _ in range(self.n_layers - 1):
-                bias = 0.0
-                layers.append([Perceptron(input_size=previous_layer_size, bias=bias) for _ in range(self.layer_size)])
-                previous_layer_size = self.layer_size
+    def _train_generation(self, X: Matrix, targets: Matrix, order: List[int],
+                          trainer: Optional[DataParallelTrainer] = None) -> float:
+        """
+        Executa uma geração de treinamento, isto é, uma passagem por todas as amostras de treinamento.
 
-        bias = 0.0
-        layers.append([Perceptron(input_size=previous_layer_size, bias=bias)])
-        self.layers = layers
+        :param X: as características das amostras de treinamento.
+        :param targets: as saídas esperadas para cada amostra de treinamento.
+        :param order: a ordem em que as amostras devem ser apresentadas à rede.
+        :param trainer: o responsável pelo cálculo paralelo dos gradientes de cada lote, ou `None`.
+        :return: o erro médio das amostras, cada um calculado antes da atualização dos pesos causada pela amostra.
+        """
+        network = self._network
+        optimizer = self._optimizer
+        batch_size = self.batch_size or 1
+        loss = 0.0
+
+        # Caminho rápido: a descida de gradiente `online` atualiza os pesos diretamente, sem acumular gradientes
+        if batch_size == 1 and type(optimizer) is SGD:
+            for i in order:
+                network.forward(X[i])
+                loss += network.loss(targets[i])
+                network.backward(targets[i])
+                network.update(optimizer.tick())
+            return loss / len(order)
+
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            if trainer is not None:
+                loss += trainer.accumulate(batch)
+            else:
+                for i in batch:
+                    network.forward(X[i])
+                    loss += network.loss(targets[i])
+                    network.backward(targets[i])
+                    network.accumulate()
 
-        # Atualiza os pesos por meio de backpropagation
-        for _ in range(self.n_generations):
-            for sample, outcome in zip(X, y):
-                self._update_weights(sample, self._class_map.index(outcome))
+            optimizer.step(network.parameters, network.gradients, 1.0 / len(batch))
+            network.reset_gradients()
 
-        return self
+        return loss / len(order)
+
+    def _create_optimizer(self) -> Optimizer:
+        """
+        Cria o otimizador a ser utilizado em um treinamento dessa rede neural.
+
+        :return: um novo otimizador, sem estado.
+        """
+        if isinstance(self.optimizer, str):
+            return _OPTIMIZERS[self.optimizer](self.learning_rate)
+
+        optimizer = copy.deepcopy(self.optimizer)
+        optimizer.n_steps = 0
+        optimizer.state = []
+        return optimizer
 
     def transform(self, sample: Vector) -> Vector:
         """
@@ -218,18 +648,152 @@ class MLPClassifier:
         :return: o conjunto de valores produzidos pela camada de saída após o algoritmo de rede neural ser aplicado. O
                     número de elementos nesse conjunto é igual ao número de neurônios na camada de saída dessa rede.
         """
-        input_layer, *hidden_layers, output_layer = self.layers
+        network = self._network
+        if network is None:
+            raise ValueError("you must call 'fit' before calling 'transform'")
 
-        output: Vector = []
-        for perceptron, feature in zip(input_layer, sample):
-            output.append(perceptron.predict([feature]))
+        n_inputs = network.layer_sizes[0]
+        if len(sample) != n_inputs:
+            raise ValueError(f"sample size ({len(sample)}) must match given input size ({n_inputs})")
 
-        for layer in hidden_layers:
-            output = [perceptron.predict(output) for perceptron in layer]
+        return list(network.forward(sample))
 
-        return [perceptron.predict(output) for perceptron in output_layer]
+    def freeze(self, precision: str = 'float64') -> FrozenMLP:
+        """
+        Cria uma cópia imutável dessa rede neural, utilizada apenas para predição.
 
-    def predict(self, X: Union[Vector, Matrix]) -> Union[float, Vector]:
+        Ao contrário de ``transform``, que escreve nos buffers de propagação dessa rede, a cópia não possui estado
+        mutável e pode ser utilizada por várias `threads` simultaneamente. Treinamentos posteriores dessa rede não
+        afetam a cópia.
+
+        :param precision: a precisão com que os pesos da cópia são armazenados: 'float64' (padrão), 'float32' ou 'int8'
+                            (quantização com uma escala por camada).
+        :return: a rede neural imutável.
+        """
+        network = self._network
+        if network is None:
+            raise ValueError("you must call 'fit' before calling 'freeze'")
+
+        return FrozenMLP(network.weights, network.biases, network.activations, self._class_map, precision=precision)
+
+    def compare_precision(
+            self,
+            X: Matrix,
+            y: Optional[Vector] = None,
+            precisions: Sequence[str] = ('float32', 'int8'),
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compara cópias dessa rede neural em precisões reduzidas com a cópia em precisão 'float64'.
+
+        Para cada precisão, são calculados a proporção de amostras cuja classe prevista coincide com a prevista em
+        'float64' (`agreement`), o maior e o médio desvio absoluto das saídas da rede (`max_error` e `mean_error`), o
+        número de bytes ocupados pelos pesos (`nbytes`) e, caso ``y`` seja fornecido, a acurácia (`accuracy`). A
+        precisão 'float64' também é incluída no resultado, como referência.
+
+        :param X: as características das amostras de comparação.
+        :param y: as classes das amostras de comparação, ou `None`.
+        :param precisions: as precisões a serem comparadas, padrão 'float32' e 'int8'.
+        :return: as métricas de cada precisão, por nome.
+        """
+        reference = self.freeze()
+        expected_outputs = reference.transform_batch(X)
+        expected_classes = reference.predict(X)
+
+        report: Dict[str, Dict[str, float]] = {}
+        for precision in ('float64',) + tuple(p for p in precisions if p != 'float64'):
+            frozen = reference if precision == 'float64' else self.freeze(precision)
+            outputs = frozen.transform_batch(X)
+            classes = frozen.predict(X)
+            errors = [abs(a - b) for expected, actual in zip(expected_outputs, outputs)
+                      for a, b in zip(expected, actual)]
+
+            metrics: Dict[str, float] = {
+                'agreement': sum(a == b for a, b in zip(expected_classes, classes)) / len(X),
+                'max_error': max(errors),
+                'mean_error': sum(errors) / len(errors),
+                'nbytes': frozen.nbytes,
+            }
+            if y is not None:
+                metrics['accuracy'] = sum(a == b for a, b in zip(y, classes)) / len(y)
+
+            report[precision] = metrics
+
+        return report
+
+    def save(self, path: str, *, precision: str = 'float64'):
+        """
+        Salva essa rede neural em um arquivo binário compacto.
+
+        Apenas os parâmetros, o mapeamento de classes e os pesos e bias de cada camada são salvos. Caso ``optimizer``
+        seja uma instância de ``Optimizer``, apenas o seu tipo é salvo. Para salvar uma rede quantizada em 'int8', que
+        não pode ser treinada, utilize ``freeze`` e ``FrozenMLP.save``.
+
+        :param path: o caminho do arquivo.
+        :param precision: a precisão com que os pesos e bias são salvos: 'float64' (padrão) ou 'float32'.
+        """
+        network = self._network
+        if network is None:
+            raise ValueError("you must call 'fit' before calling 'save'")
+
+        if precision not in ('float64', 'float32'):
+            raise ValueError(f"invalid precision: {precision}")
+
+        optimizer = self.optimizer
+        if not isinstance(optimizer, str):
+            optimizer = next((name for name, cls in _OPTIMIZERS.items() if type(optimizer) is cls), 'sgd')
+
+        meta = {
+            'params': {
+                'n_layers': self.n_layers,
+                'layer_size': self.layer_size,
+                'learning_rate': self.learning_rate,
+                'n_generations': self.n_generations,
+                'batch_size': self.batch_size,
+                'shuffle': self.shuffle,
+                'optimizer': optimizer,
+                'tol': self.tol,
+                'n_iter_no_change': self.n_iter_no_change,
+                'validation_fraction': self.validation_fraction,
+                'n_jobs': self.n_jobs,
+                'activation': self.activation if isinstance(self.activation, str) else list(self.activation),
+            },
+            'class_map': list(self._class_map),
+            'n_layers': len(network.weights),
+            'activations': network.activations,
+            'loss_function': network.loss_function,
+        }
+
+        dtype, _ = PRECISIONS[precision]
+        arrays: Dict[str, Array] = {}
+        for layer, (W, b) in enumerate(zip(network.weights, network.biases)):
+            arrays[f'weights_{layer}'] = W
+            arrays[f'biases_{layer}'] = b
+
+        save_arrays(path, type(self).__name__, meta, arrays, {name: dtype for name in arrays})
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = True) -> 'MLPClassifier':
+        """
+        Carrega uma rede neural salva por ``save``.
+
+        :param path: o caminho do arquivo.
+        :param mmap: se o arquivo deve ser mapeado em memória, padrão `True`. Nesse caso, as linhas das matrizes de
+                        pesos e os vetores de bias são `memoryview` sobre o arquivo, sem cópia dos dados.
+        :return: a rede neural carregada.
+        """
+        kind, meta, arrays = load_arrays(path, mmap=mmap)
+        if kind != cls.__name__:
+            raise ValueError(f"'{path}' does not contain a {cls.__name__} model")
+
+        n_layers = meta['n_layers']
+        clf = cls(**meta['params'])
+        clf._class_map = tuple(meta['class_map'])
+        clf._network = Network([arrays[f'weights_{layer}'] for layer in range(n_layers)],
+                               [arrays[f'biases_{layer}'] for layer in range(n_layers)],
+                               meta['activations'], meta.get('loss_function', 'squared_error'))
+        return clf
+
+    def predict(self, X: Union[Vector, Matrix]) -> Union[Any, Vector]:
         """
         Prediz as classes dos dados fornecidos.
 
@@ -240,19 +804,15 @@ class MLPClassifier:
         if class_map is None:
             raise ValueError("you must call 'fit' before calling 'predict'")
 
-        is_vector = all(isinstance(v, (float, int)) for v in X)
-        X = [X] if is_vector else X
+        vector = is_vector(X)
+        X = [X] if vector else X
 
         outcomes: Vector = []
         for feature in X:
-            values = self.transform(feature)
-            assert len(values) == 1
-            value = values[0]
-
-            outcome = min((0, 1), key=lambda x: abs(x - value))
-            if is_vector:
-                return class_map[outcome]
+            outcome = decode(self.transform(feature), class_map)
+            if vector:
+                return outcome
 
-            outcomes.append(class_map[outcome])
+            outcomes.append(outcome)
 
         return outcomes
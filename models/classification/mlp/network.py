@@ -0,0 +1,315 @@
+import math
+import operator
+import random
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from models.utils.linear_alg import Matrix, Vector
+from models.utils.math import sigmoid_vector, sigmoid_derivative, tanh_vector, tanh_derivative, relu_vector, \
+    relu_derivative, softmax, softmax_derivative
+
+
+class Activation(NamedTuple):
+    """
+    Representa a função de ativação de uma camada, aplicada ao vetor de entradas da camada inteiro.
+    """
+
+    function: Callable[[Vector, Vector], Vector]
+    """
+    Calcula a função sobre um vetor de entradas, escrevendo o resultado no segundo argumento.
+    """
+
+    derivative: Callable[[Vector, Vector, Vector], Vector]
+    """
+    Retropropaga um gradiente pela função a partir das suas saídas, escrevendo o resultado no terceiro argumento.
+    """
+
+
+ACTIVATIONS: Dict[str, Activation] = {
+    'sigmoid': Activation(sigmoid_vector, sigmoid_derivative),
+    'tanh': Activation(tanh_vector, tanh_derivative),
+    'relu': Activation(relu_vector, relu_derivative),
+    'softmax': Activation(softmax, softmax_derivative),
+}
+"""
+As funções de ativação suportadas, por nome.
+"""
+
+LOSS_FUNCTIONS: Tuple[str, ...] = ('squared_error', 'cross_entropy')
+"""
+As funções de erro suportadas, por nome.
+"""
+
+_EPSILON: float = 1e-15
+"""
+O menor valor de saída considerado no cálculo da entropia cruzada, evitando o logaritmo de zero.
+"""
+
+
+# noinspection NonAsciiCharacters,PyPep8Naming
+class Network:
+    """
+    Representa as camadas de uma rede neural densa na forma matricial.
+
+    Cada camada `l` é armazenada como uma matriz de pesos ``weights[l]``, onde a linha `j` contém os pesos do neurônio
+    `j` (um peso por neurônio da camada anterior), e um vetor de bias ``biases[l]``. A camada de entrada não possui
+    pesos. Cada camada possui uma função de ativação de ``ACTIVATIONS``, aplicada ao vetor de entradas da camada
+    inteiro.
+
+    O erro de uma amostra é o erro quadrático ou a entropia cruzada entre a saída da rede e a saída esperada. A entropia
+    cruzada exige que a camada de saída utilize a função sigmoide (entropia cruzada binária de cada neurônio) ou a
+    função softmax (entropia cruzada categórica). Nesses casos, o termo de erro da camada de saída é simplesmente a
+    diferença entre a saída e a saída esperada.
+
+    A propagação e a retropropagação são feitas camada a camada, de forma que o termo de erro `δ` de cada neurônio é
+    calculado uma única vez por amostra. As ativações, os termos de erro e os gradientes são escritos em buffers
+    alocados uma única vez na criação da rede, de forma que o treinamento não aloca listas a cada amostra.
+    """
+
+    @classmethod
+    def create(
+            cls,
+            layer_sizes: Sequence[int],
+            activations: Optional[Sequence[str]] = None,
+            loss_function: str = 'squared_error',
+    ) -> 'Network':
+        """
+        Cria uma rede neural com pesos aleatórios.
+
+        Os pesos são inicializados por meio da inicialização He e os bias são inicializados com zero.
+
+        :param layer_sizes: o número de neurônios de cada camada, incluindo a camada de entrada.
+        :param activations: o nome da função de ativação de cada camada, exceto a de entrada. Se `None`, todas as
+                            camadas utilizam a função sigmoide.
+        :param loss_function: o nome da função de erro da rede, 'squared_error' (padrão) ou 'cross_entropy'.
+        :return: a rede neural criada.
+        """
+        if len(layer_sizes) < 2:
+            raise ValueError("a network must have at least an input and an output layer")
+
+        weights: List[Matrix] = []
+        biases: List[Vector] = []
+        for input_size, output_size in zip(layer_sizes, layer_sizes[1:]):
+            sigma = math.sqrt(2.0 / input_size)
+            weights.append([[random.gauss(mu=0, sigma=sigma) for _ in range(input_size)] for _ in range(output_size)])
+            biases.append([0.0] * output_size)
+
+        return cls(weights, biases, activations, loss_function)
+
+    def __init__(
+            self,
+            weights: List[Matrix],
+            biases: List[Vector],
+            activations: Optional[Sequence[str]] = None,
+            loss_function: str = 'squared_error',
+    ):
+        """
+        Cria uma rede neural a partir de pesos já existentes.
+
+        :param weights: as matrizes de pesos de cada camada, exceto a de entrada.
+        :param biases: os vetores de bias de cada camada, exceto a de entrada.
+        :param activations: o nome da função de ativação de cada camada, exceto a de entrada. Se `None`, todas as
+                            camadas utilizam a função sigmoide.
+        :param loss_function: o nome da função de erro da rede, 'squared_error' (padrão) ou 'cross_entropy'.
+        """
+        activations = ['sigmoid'] * len(weights) if activations is None else list(activations)
+        if len(activations) != len(weights):
+            raise ValueError(f"number of activations ({len(activations)}) must match number of weight matrices "
+                             f"({len(weights)})")
+
+        for activation in activations:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"invalid activation: {activation}")
+
+        if loss_function not in LOSS_FUNCTIONS:
+            raise ValueError(f"invalid loss function: {loss_function}")
+
+        if loss_function == 'cross_entropy' and activations[-1:] not in (['sigmoid'], ['softmax']):
+            raise ValueError("cross_entropy requires a sigmoid or softmax output layer")
+
+        if len(weights) != len(biases):
+            raise ValueError(f"number of weight matrices ({len(weights)}) must match number of bias vectors "
+                             f"({len(biases)})")
+
+        for W, b in zip(weights, biases):
+            if len(W) != len(b):
+                raise ValueError("each weight matrix must have one row per bias")
+
+        for W, W_next in zip(weights, weights[1:]):
+            if any(len(row) != len(W) for row in W_next):
+                raise ValueError("each weight row must have one weight per neuron of the previous layer")
+
+        self.weights: List[Matrix] = weights
+        """
+        As matrizes de pesos de cada camada dessa rede, exceto a de entrada.
+        """
+
+        self.biases: List[Vector] = biases
+        """
+        Os vetores de bias de cada camada dessa rede, exceto a de entrada.
+        """
+
+        self.activations: List[str] = activations
+        """
+        O nome da função de ativação de cada camada dessa rede, exceto a de entrada.
+        """
+
+        self.loss_function: str = loss_function
+        """
+        O nome da função de erro dessa rede.
+        """
+
+        self.grad_weights: List[Matrix] = [[[0.0] * len(row) for row in W] for W in weights]
+        """
+        Os acumuladores dos gradientes dos pesos de cada camada dessa rede, preenchidos por ``accumulate``.
+        """
+
+        self.grad_biases: List[Vector] = [[0.0] * len(b) for b in biases]
+        """
+        Os acumuladores dos gradientes dos bias de cada camada dessa rede, preenchidos por ``accumulate``.
+        """
+
+        self.parameters: List[Vector] = [row for W in weights for row in W] + biases
+        """
+        Os vetores de parâmetros dessa rede: as linhas de todas as matrizes de pesos seguidas de todos os vetores de
+        bias.
+        """
+
+        self.gradients: List[Vector] = [row for G in self.grad_weights for row in G] + self.grad_biases
+        """
+        Os acumuladores de gradiente de cada vetor de ``parameters``.
+        """
+
+        # Buffers reutilizados por todas as propagações e retropropagações
+        self._sample: Vector = []
+        self._activations: List[Vector] = [[0.0] * len(b) for b in biases]
+        self._deltas: List[Vector] = [[0.0] * len(b) for b in biases]
+        self._functions: List[Activation] = [ACTIVATIONS[activation] for activation in activations]
+
+    @property
+    def layer_sizes(self) -> List[int]:
+        """
+        O número de neurônios de cada camada dessa rede, incluindo a camada de entrada.
+        """
+        return [len(self.weights[0][0])] + [len(b) for b in self.biases]
+
+    def forward(self, sample: Vector) -> Vector:
+        """
+        Propaga uma amostra por essa rede.
+
+        As ativações de cada camada são escritas em buffers dessa rede, reutilizados a cada chamada, e ficam
+        disponíveis para ``backward``, ``update`` e ``accumulate``.
+
+        :param sample: a amostra a ser propagada.
+        :return: as ativações da camada de saída. Essa lista é sobrescrita na próxima chamada desse método.
+        """
+        mul = operator.mul
+
+        a: Vector = sample
+        for W, b, out, activation in zip(self.weights, self.biases, self._activations, self._functions):
+            for j, row in enumerate(W):
+                out[j] = sum(map(mul, row, a), b[j])
+            a = activation.function(out, out)
+
+        self._sample = sample
+        return a
+
+    def loss(self, target: Vector) -> float:
+        """
+        Calcula o erro da última amostra propagada por essa rede.
+
+        :param target: a saída esperada para a última amostra propagada.
+        :return: o erro, isto é, metade da soma dos quadrados das diferenças entre a saída e a saída esperada ou a
+                    entropia cruzada entre elas.
+        """
+        output = self._activations[-1]
+        if self.loss_function == 'squared_error':
+            return sum((a - t) ** 2 for a, t in zip(output, target)) / 2.0
+
+        log = math.log
+        if self.activations[-1] == 'softmax':
+            return -sum(t * log(max(a, _EPSILON)) for a, t in zip(output, target) if t)
+
+        return -sum(t * log(max(a, _EPSILON)) + (1.0 - t) * log(max(1.0 - a, _EPSILON)) for a, t in zip(output, target))
+
+    def backward(self, target: Vector):
+        """
+        Retropropaga o erro da última amostra propagada por essa rede.
+
+        Os termos de erro `δ` (a derivada parcial do erro em relação à entrada da função de ativação) de cada camada
+        são escritos em buffers dessa rede, reutilizados a cada chamada. O termo de erro de cada neurônio é calculado
+        uma única vez e reutilizado por todos os seus pesos, de forma que o custo de uma camada é proporcional ao seu
+        número de pesos.
+
+        :param target: a saída esperada para a última amostra propagada.
+        """
+        activations = self._activations
+        deltas = self._deltas
+        functions = self._functions
+
+        # δe/δa da camada de saída, retropropagado pela sua função de ativação. Para a entropia cruzada, a derivada da
+        # função de ativação cancela com a do erro, e o termo de erro é a própria diferença
+        δ: Vector = deltas[-1]
+        for j, (a, t) in enumerate(zip(activations[-1], target)):
+            δ[j] = a - t
+        if self.loss_function == 'squared_error':
+            functions[-1].derivative(activations[-1], δ, δ)
+
+        for layer in range(len(self.weights) - 1, 0, -1):
+            δ = deltas[layer]
+            δ_previous: Vector = deltas[layer - 1]
+            a_previous: Vector = activations[layer - 1]
+            n_previous = len(δ_previous)
+
+            # δe/δa de cada neurônio, isto é, o produto da matriz de pesos transposta pelo δ da camada posterior
+            for i in range(n_previous):
+                δ_previous[i] = 0.0
+            for row, δ_k in zip(self.weights[layer], δ):
+                for i in range(n_previous):
+                    δ_previous[i] += row[i] * δ_k
+
+            functions[layer - 1].derivative(a_previous, δ_previous, δ_previous)
+
+    def _inputs(self, layer: int) -> Vector:
+        """
+        :param layer: o índice de uma camada dessa rede, exceto a de entrada.
+        :return: as entradas da camada durante a última propagação.
+        """
+        return self._sample if layer == 0 else self._activations[layer - 1]
+
+    def update(self, learning_rate: float):
+        """
+        Atualiza os pesos e bias dessa rede por descida de gradiente a partir da última amostra retropropagada.
+
+        As linhas das matrizes de pesos são atualizadas no lugar, de forma que referências a elas continuam válidas.
+
+        :param learning_rate: a taxa de aprendizado.
+        """
+        for layer, (W, b, δ) in enumerate(zip(self.weights, self.biases, self._deltas)):
+            a = self._inputs(layer)
+            n_inputs = len(a)
+            for j, row in enumerate(W):
+                step = learning_rate * δ[j]
+                for i in range(n_inputs):
+                    row[i] -= step * a[i]
+                b[j] -= step
+
+    def accumulate(self):
+        """
+        Soma os gradientes da última amostra retropropagada aos acumuladores de gradiente dessa rede.
+        """
+        for layer, (G, g, δ) in enumerate(zip(self.grad_weights, self.grad_biases, self._deltas)):
+            a = self._inputs(layer)
+            n_inputs = len(a)
+            for j, row in enumerate(G):
+                δ_j = δ[j]
+                for i in range(n_inputs):
+                    row[i] += δ_j * a[i]
+                g[j] += δ_j
+
+    def reset_gradients(self):
+        """
+        Zera os acumuladores de gradiente dessa rede.
+        """
+        for gradients in self.gradients:
+            for i in range(len(gradients)):
+                gradients[i] = 0.0
@@ -0,0 +1,258 @@
+import abc
+import math
+from typing import Callable, List, Optional
+
+from models.utils.linear_alg import Vector
+
+Schedule = Callable[[int], float]
+"""
+Uma função que recebe o número da atualização atual (a partir de 1) e retorna o fator pelo qual a taxa de aprendizado
+deve ser multiplicada nessa atualização.
+"""
+
+
+def constant() -> Schedule:
+    """
+    Cria um cronograma de taxa de aprendizado constante.
+
+    :return: o cronograma.
+    """
+    return lambda step: 1.0
+
+
+def inverse_scaling(power: float = 0.5) -> Schedule:
+    """
+    Cria um cronograma em que a taxa de aprendizado decai de forma inversamente proporcional a uma potência do número
+    de atualizações, isto é, ``ε_t = ε / t^power``.
+
+    :param power: o expoente do decaimento, padrão 0.5.
+    :return: o cronograma.
+    """
+    if power < 0:
+        raise ValueError(f"power ({power}) must not be negative")
+
+    return lambda step: step ** -power
+
+
+def exponential_decay(rate: float, n_steps: int = 1) -> Schedule:
+    """
+    Cria um cronograma em que a taxa de aprendizado decai exponencialmente, isto é, ``ε_t = ε * rate^(t / n_steps)``.
+
+    :param rate: o fator de decaimento a cada ``n_steps`` atualizações, entre 0 e 1.
+    :param n_steps: o número de atualizações para que a taxa de aprendizado seja multiplicada por ``rate``, padrão 1.
+    :return: o cronograma.
+    """
+    if not 0 < rate <= 1:
+        raise ValueError(f"rate ({rate}) must be between 0 (exclusive) and 1 (inclusive)")
+
+    if n_steps < 1:
+        raise ValueError(f"n_steps ({n_steps}) must be greater than zero")
+
+    return lambda step: rate ** ((step - 1) / n_steps)
+
+
+class Optimizer(abc.ABC):
+    """
+    Representa um otimizador, que atualiza os parâmetros de uma rede neural a partir dos seus gradientes.
+
+    Os parâmetros e gradientes são fornecidos como listas de vetores (por exemplo, as linhas das matrizes de pesos e os
+    vetores de bias de uma rede), atualizados no lugar. O estado de cada otimizador possui um valor por parâmetro e é
+    criado na primeira atualização, de forma que as chamadas seguintes devem fornecer vetores com os mesmos formatos.
+    """
+
+    n_state: int = 0
+    """
+    O número de valores de estado que esse otimizador mantém para cada parâmetro.
+    """
+
+    def __init__(self, learning_rate: float = 0.3, *, schedule: Optional[Schedule] = None):
+        """
+        Cria um otimizador.
+
+        :param learning_rate: a taxa de aprendizado inicial, padrão 0.3.
+        :param schedule: o cronograma da taxa de aprendizado. Se `None`, a taxa de aprendizado é constante.
+        """
+        if learning_rate <= 0:
+            raise ValueError(f"learning_rate ({learning_rate}) must be greater than zero")
+
+        self.learning_rate: float = learning_rate
+        """
+        A taxa de aprendizado inicial desse otimizador.
+        """
+
+        self.schedule: Schedule = constant() if schedule is None else schedule
+        """
+        O cronograma da taxa de aprendizado desse otimizador.
+        """
+
+        self.n_steps: int = 0
+        """
+        O número de atualizações já realizadas por esse otimizador.
+        """
+
+        self.state: List[List[Vector]] = []
+        """
+        O estado desse otimizador: ``n_state`` listas, cada uma com um vetor por vetor de parâmetros.
+        """
+
+    def tick(self) -> float:
+        """
+        Avança uma atualização.
+
+        :return: a taxa de aprendizado dessa atualização.
+        """
+        self.n_steps += 1
+        return self.learning_rate * self.schedule(self.n_steps)
+
+    def step(self, parameters: List[Vector], gradients: List[Vector], scale: float = 1.0):
+        """
+        Atualiza parâmetros a partir dos seus gradientes.
+
+        :param parameters: os vetores de parâmetros, atualizados no lugar.
+        :param gradients: os gradientes de cada parâmetro.
+        :param scale: o fator pelo qual os gradientes devem ser multiplicados (por exemplo, o inverso do número de
+                        amostras cujos gradientes foram somados), padrão 1.
+        """
+        if not self.state and self.n_state:
+            self.state = [[[0.0] * len(vector) for vector in parameters] for _ in range(self.n_state)]
+
+        self._update(parameters, gradients, self.tick(), scale)
+
+    @abc.abstractmethod
+    def _update(self, parameters: List[Vector], gradients: List[Vector], learning_rate: float, scale: float):
+        """
+        Implementa a regra de atualização desse otimizador.
+
+        :param parameters: os vetores de parâmetros, atualizados no lugar.
+        :param gradients: os gradientes de cada parâmetro.
+        :param learning_rate: a taxa de aprendizado dessa atualização.
+        :param scale: o fator pelo qual os gradientes devem ser multiplicados.
+        """
+
+
+class SGD(Optimizer):
+    """
+    Descida de gradiente estocástica: ``w = w - ε * g``.
+    """
+
+    def _update(self, parameters: List[Vector], gradients: List[Vector], learning_rate: float, scale: float):
+        rate = learning_rate * scale
+        for vector, gradient in zip(parameters, gradients):
+            for i in range(len(vector)):
+                vector[i] -= rate * gradient[i]
+
+
+class Momentum(Optimizer):
+    """
+    Descida de gradiente com momento: ``v = μ * v - ε * g`` e ``w = w + v``.
+    """
+
+    n_state = 1
+
+    def __init__(self, learning_rate: float = 0.3, *, momentum: float = 0.9, schedule: Optional[Schedule] = None):
+        """
+        Cria um otimizador com momento.
+
+        :param learning_rate: a taxa de aprendizado inicial, padrão 0.3.
+        :param momentum: o coeficiente de momento `μ`, entre 0 e 1, padrão 0.9.
+        :param schedule: o cronograma da taxa de aprendizado. Se `None`, a taxa de aprendizado é constante.
+        """
+        super().__init__(learning_rate, schedule=schedule)
+        if not 0 <= momentum < 1:
+            raise ValueError(f"momentum ({momentum}) must be between 0 (inclusive) and 1 (exclusive)")
+
+        self.momentum: float = momentum
+
+    def _update(self, parameters: List[Vector], gradients: List[Vector], learning_rate: float, scale: float):
+        μ = self.momentum
+        rate = learning_rate * scale
+        velocities, = self.state
+        for vector, gradient, velocity in zip(parameters, gradients, velocities):
+            for i in range(len(vector)):
+                v = μ * velocity[i] - rate * gradient[i]
+                velocity[i] = v
+                vector[i] += v
+
+
+class Nesterov(Momentum):
+    """
+    Descida de gradiente com momento de Nesterov: ``v = μ * v - ε * g`` e ``w = w + μ * v - ε * g``.
+
+    ####
+    Referências
+    ####
+
+    - http://proceedings.mlr.press/v28/sutskever13.html
+    """
+
+    def _update(self, parameters: List[Vector], gradients: List[Vector], learning_rate: float, scale: float):
+        μ = self.momentum
+        rate = learning_rate * scale
+        velocities, = self.state
+        for vector, gradient, velocity in zip(parameters, gradients, velocities):
+            for i in range(len(vector)):
+                step = rate * gradient[i]
+                v = μ * velocity[i] - step
+                velocity[i] = v
+                vector[i] += μ * v - step
+
+
+class Adam(Optimizer):
+    """
+    Otimizador Adam, que adapta a taxa de aprendizado de cada parâmetro a partir de estimativas do primeiro e do segundo
+    momentos dos seus gradientes.
+
+    ####
+    Referências
+    ####
+
+    - https://arxiv.org/abs/1412.6980
+    """
+
+    n_state = 2
+
+    def __init__(
+            self,
+            learning_rate: float = 0.001,
+            *,
+            beta_1: float = 0.9,
+            beta_2: float = 0.999,
+            epsilon: float = 1e-8,
+            schedule: Optional[Schedule] = None,
+    ):
+        """
+        Cria um otimizador Adam.
+
+        :param learning_rate: a taxa de aprendizado inicial, padrão 0.001.
+        :param beta_1: a taxa de decaimento da estimativa do primeiro momento, entre 0 e 1, padrão 0.9.
+        :param beta_2: a taxa de decaimento da estimativa do segundo momento, entre 0 e 1, padrão 0.999.
+        :param epsilon: valor adicionado ao denominador para estabilidade numérica, padrão 1e-8.
+        :param schedule: o cronograma da taxa de aprendizado. Se `None`, a taxa de aprendizado é constante.
+        """
+        super().__init__(learning_rate, schedule=schedule)
+        for name, beta in (('beta_1', beta_1), ('beta_2', beta_2)):
+            if not 0 <= beta < 1:
+                raise ValueError(f"{name} ({beta}) must be between 0 (inclusive) and 1 (exclusive)")
+
+        self.beta_1: float = beta_1
+        self.beta_2: float = beta_2
+        self.epsilon: float = epsilon
+
+    def _update(self, parameters: List[Vector], gradients: List[Vector], learning_rate: float, scale: float):
+        β_1 = self.beta_1
+        β_2 = self.beta_2
+        ε = self.epsilon
+        t = self.n_steps
+        sqrt = math.sqrt
+
+        # Correção de viés das estimativas incorporada à taxa de aprendizado
+        rate = learning_rate * sqrt(1.0 - β_2 ** t) / (1.0 - β_1 ** t)
+        first_moments, second_moments = self.state
+        for vector, gradient, m, v in zip(parameters, gradients, first_moments, second_moments):
+            for i in range(len(vector)):
+                g = gradient[i] * scale
+                m_i = β_1 * m[i] + (1.0 - β_1) * g
+                v_i = β_2 * v[i] + (1.0 - β_2) * g * g
+                m[i] = m_i
+                v[i] = v_i
+                vector[i] -= rate * m_i / (sqrt(v_i) + ε)
@@ -0,0 +1,199 @@
+import array
+import multiprocessing.pool
+import multiprocessing.util
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.classification.mlp.network import Network
+from models.utils.linear_alg import Matrix, Vector
+from models.utils.parallel import worker_pool, worker_state
+
+def _read(source: memoryview, vectors: List[Vector], offset: int = 0):
+    """
+    Copia valores contíguos de um buffer para uma lista de vetores, no lugar.
+
+    :param source: o buffer de origem.
+    :param vectors: os vetores de destino.
+    :param offset: a posição do buffer a partir da qual os valores são lidos.
+    """
+    for vector in vectors:
+        n = len(vector)
+        vector[:] = source[offset:offset + n].tolist()
+        offset += n
+
+
+def _write(vectors: List[Vector], target: memoryview, offset: int = 0):
+    """
+    Copia os valores de uma lista de vetores para posições contíguas de um buffer.
+
+    :param vectors: os vetores de origem.
+    :param target: o buffer de destino.
+    :param offset: a posição do buffer a partir da qual os valores são escritos.
+    """
+    for vector in vectors:
+        n = len(vector)
+        target[offset:offset + n] = array.array('d', vector)
+        offset += n
+
+
+def _attach(state: Dict[str, Any]):
+    """
+    Completa o estado de um processo de trabalho com a rede neural e a memória compartilhada.
+
+    O conjunto de dados é recebido uma única vez, na criação do processo. A cada lote, apenas os índices das amostras
+    são enviados ao processo, e os parâmetros e gradientes são trocados por meio de memória compartilhada.
+    """
+    network = Network.create(state['layer_sizes'], state['activations'], state['loss_function'])
+    parameters = SharedMemory(name=state['parameters_name'])
+    gradients = SharedMemory(name=state['gradients_name'])
+
+    state.update({
+        'network': network,
+        'n_parameters': sum(len(vector) for vector in network.parameters),
+        'shared_memory': (parameters, gradients),
+        'parameters': parameters.buf.cast('d'),
+        'gradients': gradients.buf.cast('d'),
+    })
+
+    # A memória compartilhada é liberada pelo processo ao final do trabalho, quando os processos são encerrados por
+    # ``DataParallelTrainer.close``
+    state['detach'] = multiprocessing.util.Finalize(None, _detach, args=(state,), exitpriority=0)
+
+
+def _detach(state: Dict[str, Any]):
+    """
+    Libera a memória compartilhada de um processo de trabalho, criada por ``_attach``.
+    """
+    state['parameters'].release()
+    state['gradients'].release()
+    for shared_memory in state['shared_memory']:
+        shared_memory.close()
+
+
+def _compute_gradients(task: Tuple[int, List[int]]) -> float:
+    """
+    Calcula a soma dos gradientes de um fragmento de um lote e a escreve na posição do fragmento na memória
+    compartilhada.
+
+    :param task: a posição do fragmento no lote e os índices das suas amostras.
+    :return: a soma dos erros das amostras do fragmento.
+    """
+    shard, indices = task
+    state = worker_state()
+    network: Network = state['network']
+    X: Matrix = state['X']
+    targets: Matrix = state['targets']
+
+    _read(state['parameters'], network.parameters)
+    network.reset_gradients()
+
+    loss = 0.0
+    for i in indices:
+        network.forward(X[i])
+        loss += network.loss(targets[i])
+        network.backward(targets[i])
+        network.accumulate()
+
+    _write(network.gradients, state['gradients'], shard * state['n_parameters'])
+    return loss
+
+
+class DataParallelTrainer:
+    """
+    Distribui o cálculo dos gradientes dos lotes de treinamento de uma rede neural entre processos de trabalho.
+
+    Cada lote é dividido em ``n_jobs`` fragmentos contíguos, um por processo. Os parâmetros da rede são publicados em
+    memória compartilhada antes de cada lote, cada processo escreve a soma dos gradientes do seu fragmento em uma
+    região própria da memória compartilhada, e essas somas são reduzidas sempre na mesma ordem. Dessa forma, o
+    resultado do treinamento depende apenas da semente aleatória e do número de processos.
+
+    Como os parâmetros e gradientes são copiados uma vez por lote e por processo, o ganho de desempenho é próximo de
+    linear apenas quando cada fragmento possui várias amostras, isto é, quando ``batch_size`` é bem maior que
+    ``n_jobs``.
+    """
+
+    def __init__(self, network: Network, X: Matrix, targets: Matrix, n_jobs: int):
+        """
+        Cria os processos de trabalho e a memória compartilhada.
+
+        :param network: a rede neural a ser treinada. Os seus acumuladores de gradiente recebem os gradientes de cada
+                        lote.
+        :param X: as características das amostras de treinamento.
+        :param targets: as saídas esperadas para cada amostra de treinamento.
+        :param n_jobs: o número de processos de trabalho.
+        """
+        if n_jobs < 1:
+            raise ValueError(f"n_jobs ({n_jobs}) must be greater than zero")
+
+        self.network: Network = network
+        self.n_jobs: int = n_jobs
+        self.n_parameters: int = sum(len(vector) for vector in network.parameters)
+
+        size = max(1, self.n_parameters) * array.array('d').itemsize
+        self._shared_parameters = SharedMemory(create=True, size=size)
+        self._shared_gradients = SharedMemory(create=True, size=size * n_jobs)
+        self._parameters: memoryview = self._shared_parameters.buf.cast('d')
+        self._gradients: memoryview = self._shared_gradients.buf.cast('d')
+
+        self._pool: Optional[multiprocessing.pool.Pool] = worker_pool(
+            n_jobs,
+            _attach,
+            layer_sizes=network.layer_sizes,
+            activations=network.activations,
+            loss_function=network.loss_function,
+            X=X,
+            targets=targets,
+            parameters_name=self._shared_parameters.name,
+            gradients_name=self._shared_gradients.name,
+        )
+
+    def accumulate(self, batch: List[int]) -> float:
+        """
+        Soma os gradientes de um lote aos acumuladores de gradiente da rede neural.
+
+        :param batch: os índices das amostras do lote.
+        :return: a soma dos erros das amostras do lote, calculados com os parâmetros atuais da rede.
+        """
+        if self._pool is None:
+            raise ValueError("trainer is closed")
+
+        _write(self.network.parameters, self._parameters)
+
+        shard_size = -(-len(batch) // self.n_jobs)
+        tasks = [(shard, batch[start:start + shard_size])
+                 for shard, start in enumerate(range(0, len(batch), shard_size))]
+        losses = self._pool.map(_compute_gradients, tasks)
+
+        # Redução em ordem fixa, para que o resultado não dependa do escalonamento dos processos
+        n_parameters = self.n_parameters
+        for shard in range(len(tasks)):
+            offset = shard * n_parameters
+            for gradient in self.network.gradients:
+                for i in range(len(gradient)):
+                    gradient[i] += self._gradients[offset]
+                    offset += 1
+
+        return sum(losses)
+
+    def close(self):
+        """
+        Encerra os processos de trabalho e libera a memória compartilhada.
+        """
+        if self._pool is None:
+            return
+
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+        self._parameters.release()
+        self._gradients.release()
+        for shared_memory in (self._shared_parameters, self._shared_gradients):
+            shared_memory.close()
+            shared_memory.unlink()
+
+    def __enter__(self) -> 'DataParallelTrainer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
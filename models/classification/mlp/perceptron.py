@@ -1,6 +1,6 @@
 import math
 import random
-from typing import Optional, List
+from typing import Callable, Optional, List
 
 from models.classification.mlp.gradient import Gradient
 from models.utils.linear_alg import Vector
@@ -12,12 +12,19 @@ class Perceptron:
     """
     Representa um perceptron (ou neurônio) de uma rede neural.
 
-    Esse perceptron possui como função de ativação a função sigmoide.
+    Por padrão, esse perceptron possui como função de ativação a função sigmoide.
     """
 
-    __slots__ = ('bias', 'weights', '_last_input', '_last_output')
+    __slots__ = ('bias', 'weights', 'activation', '_last_input', '_last_output')
 
-    def __init__(self, input_size: int, bias: float, *, weights: Optional[Vector] = None):
+    def __init__(
+            self,
+            input_size: int,
+            bias: float,
+            *,
+            weights: Optional[Vector] = None,
+            activation: Callable[[float], float] = sigmoid,
+    ):
         self.bias: float = bias
         """
         Representa um bias a ser adicionado aos pesos em cada predição desse perceptron.
@@ -36,6 +43,11 @@ class Perceptron:
 
             self.weights = weights
 
+        self.activation: Callable[[float], float] = activation
+        """
+        A função de ativação desse perceptron.
+        """
+
         self._last_input: Optional[Vector] = None
         self._last_output: Optional[float] = None
 
@@ -82,7 +94,7 @@ class Perceptron:
         :param value: o valor a ser transformado.
         :return: o valor de ativação respectivo.
         """
-        return sigmoid(value)
+        return self.activation(value)
 
     def update(self, weights: Vector):
         """
@@ -117,7 +129,8 @@ class UpdatingPerceptron(Perceptron):
     """
 
     def __init__(self, perceptron: Perceptron):
-        super().__init__(len(perceptron.weights), perceptron.bias, weights=perceptron.weights)
+        super().__init__(len(perceptron.weights), perceptron.bias, weights=perceptron.weights,
+                         activation=perceptron.activation)
         self._perceptron: Perceptron = perceptron
 
         self._last_input = perceptron.last_input
@@ -0,0 +1,415 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import types
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from models.classification.utils import cross_validation_indices
+from models.utils.linear_alg import Matrix, Vector, check_dimension_match
+from models.utils.lists import IndexView, ValidatedMatrix
+from models.utils.parallel import worker_pool, worker_state
+
+Params = Dict[str, Any]
+
+Scoring = Callable[[Any, Matrix, Optional[Vector]], float]
+
+Report = List[Tuple[Params, float]]
+
+_Task = Tuple[Params, List[int], List[int], int]
+
+def accuracy(clf, X: Matrix, y: Vector) -> float:
+    """
+    Calcula a acurácia de um classificador, isto é, a proporção de amostras cuja classe é prevista corretamente.
+
+    :param clf: o classificador ajustado.
+    :param X: as características das amostras de teste.
+    :param y: as classes das amostras de teste.
+    :return: a acurácia do classificador.
+    """
+    return sum(1 for pred, true in zip(clf.predict(X), y) if pred == true) / len(y)
+
+
+class _UnstableKey(Exception):
+    """
+    Indica que um valor não pode ser identificado de forma estável entre execuções.
+    """
+
+
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _code(function: types.FunctionType) -> List[Any]:
+    """
+    Identifica o código de uma função, de forma que a identificação muda sempre que o corpo da função muda.
+
+    :param function: a função.
+    :return: o código da função, os seus valores padrão e as constantes e nomes que ela utiliza.
+    """
+    return [function.__code__, function.__defaults__, function.__kwdefaults__]
+
+
+def _methods(cls: type) -> Dict[str, Any]:
+    """
+    Obtém as funções definidas por uma classe (e por suas superclasses), de forma que a identificação da classe muda
+    sempre que algum dos seus métodos muda.
+
+    :param cls: a classe.
+    :return: o código de cada método, por nome qualificado.
+    """
+    methods: Dict[str, Any] = {}
+    for base in cls.__mro__:
+        for name, attribute in vars(base).items():
+            if isinstance(attribute, (staticmethod, classmethod)):
+                attribute = attribute.__func__
+
+            if isinstance(attribute, property):
+                functions = [attribute.fget, attribute.fset, attribute.fdel]
+            else:
+                functions = [attribute]
+
+            codes = [_code(function) for function in functions if isinstance(function, types.FunctionType)]
+            if codes:
+                methods[f'{base.__module__}.{base.__qualname__}.{name}'] = codes
+
+    return methods
+
+
+def _identify(value: Any, fallback: Optional[Callable[[Any], str]]) -> Any:
+    """
+    Identifica um valor de forma estável entre execuções, para compor as chaves do cache.
+
+    Funções são identificadas pelo seu nome qualificado, pelo seu código, pelos seus valores padrão e pelos valores
+    capturados do escopo externo. Classes são identificadas pelo seu nome qualificado e pelo código dos seus métodos e
+    dos métodos das suas superclasses. Dessa forma, alterar o corpo de uma função ou de um método invalida as
+    avaliações salvas. Os demais valores são identificados pela sua representação.
+
+    :param value: o valor.
+    :param fallback: a função que identifica valores cuja representação contém um endereço de memória. Caso seja
+                        `None`, esses valores não podem ser identificados.
+    :raises _UnstableKey: se o valor não puder ser identificado.
+    :return: a identificação do valor, serializável em JSON.
+    """
+    if isinstance(value, types.CodeType):
+        return [value.co_code.hex(), list(value.co_consts), list(value.co_names)]
+
+    # Constantes como ``x in {'a', 'b'}`` são compiladas como conjuntos, cuja ordem varia entre execuções
+    if isinstance(value, frozenset):
+        return sorted(map(repr, value))
+
+    if isinstance(value, types.FunctionType):
+        closure = [cell.cell_contents for cell in value.__closure__ or ()]
+        return [f'{value.__module__}.{value.__qualname__}', _code(value), closure]
+
+    if isinstance(value, type):
+        return [f'{value.__module__}.{value.__qualname__}', _methods(value)]
+
+    if isinstance(value, types.BuiltinFunctionType):
+        return f'{value.__module__}.{value.__qualname__}'
+
+    text = repr(value)
+    if _ADDRESS.search(text):
+        if fallback is None:
+            raise _UnstableKey(text)
+        return fallback(value)
+
+    return text
+
+
+def _digest(*values: Any, fallback: Optional[Callable[[Any], str]] = None) -> str:
+    text = json.dumps(values, sort_keys=True, default=lambda value: _identify(value, fallback))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def fingerprint(X: Matrix, y: Optional[Vector] = None) -> str:
+    """
+    Calcula uma impressão digital de um conjunto de dados, que muda sempre que alguma amostra muda.
+
+    :param X: as características das amostras.
+    :param y: as classes das amostras, ou `None`.
+    :return: a impressão digital, em hexadecimal.
+    """
+    h = hashlib.sha256()
+    for row in X:
+        h.update(repr(list(row)).encode('utf-8'))
+        h.update(b'\n')
+
+    if y is not None:
+        h.update(repr(list(y)).encode('utf-8'))
+
+    return h.hexdigest()
+
+
+def _evaluate(estimator: Callable[..., Any], X: Matrix, y: Optional[Vector], scoring: Scoring, params: Params,
+              train: List[int], test: List[int], seed: int) -> float:
+    """
+    Cria um estimador com os parâmetros fornecidos, ajusta-o às amostras de treinamento de um fold e avalia-o nas
+    amostras de teste.
+
+    :param estimator: a classe (ou função) que cria o estimador.
+    :param X: as características de todas as amostras.
+    :param y: as classes de todas as amostras, ou `None`.
+    :param scoring: a função de avaliação.
+    :param params: os parâmetros do estimador.
+    :param train: os índices das amostras de treinamento.
+    :param test: os índices das amostras de teste.
+    :param seed: a semente do gerador de números aleatórios do módulo `random` durante o treinamento.
+    :return: a avaliação do estimador.
+    """
+    random.seed(seed)
+    clf = estimator(**params)
+    if y is None:
+        clf.fit(IndexView(X, train))
+        return scoring(clf, IndexView(X, test), None)
+
+    clf.fit(IndexView(X, train), IndexView(y, train))
+    return scoring(clf, IndexView(X, test), IndexView(y, test))
+
+
+def _evaluate_worker(task: _Task) -> float:
+    state = worker_state()
+    return _evaluate(state['estimator'], state['X'], state['y'], state['scoring'], *task)
+
+
+def _read_cache(cache: str, key: str) -> Optional[float]:
+    try:
+        with open(os.path.join(cache, f'{key}.json')) as f:
+            return json.load(f)['score']
+    except FileNotFoundError:
+        return None
+
+
+def _write_cache(cache: str, key: str, score: float):
+    path = os.path.join(cache, f'{key}.json')
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump({'score': score}, f)
+
+    os.replace(temporary, path)
+
+
+def _folds(X: Matrix, y: Optional[Vector], n_folds: int, scoring: Optional[Scoring], stratify: bool,
+           groups: Optional[Vector]) -> List[Tuple[List[int], List[int]]]:
+    """
+    Valida os parâmetros da busca e sorteia os folds da validação cruzada por ``cross_validation_indices``.
+
+    :return: as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+    """
+    if y is None:
+        n_samples = len(X)
+        if scoring is None:
+            raise ValueError("scoring is required when y is None")
+    else:
+        n_samples = check_dimension_match(X, y, allow_empty=False)
+
+    return list(cross_validation_indices(n_samples, n_folds, y, stratify=stratify, groups=groups))
+
+
+def _search(
+        estimator: Callable[..., Any],
+        X: Matrix,
+        y: Optional[Vector],
+        candidates: Sequence[Params],
+        folds: List[Tuple[List[int], List[int]]],
+        *,
+        scoring: Optional[Scoring],
+        n_jobs: Optional[int],
+        cache: Optional[str],
+        return_report: bool,
+) -> Union[Params, Tuple[Params, Report]]:
+    """
+    Avalia cada combinação de parâmetros por validação cruzada e retorna a de maior avaliação média.
+
+    Os parâmetros são os mesmos de ``grid_search``, exceto por ``candidates``, as combinações a serem avaliadas, e
+    ``folds``, os folds sorteados por ``_folds``.
+    """
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError(f"n_jobs ({n_jobs}) must be greater than zero")
+
+    scoring = accuracy if scoring is None else scoring
+    dataset = fingerprint(X, y)
+
+    # Valores que não podem ser identificados entre execuções (por exemplo, objetos cuja representação contém um
+    # endereço de memória) impedem o uso do cache
+    try:
+        _digest(estimator, scoring, candidates)
+    except _UnstableKey:
+        cache = None
+
+    # Cada tarefa é identificada pelos dados, pelo fold, pelo estimador e pelos seus parâmetros. A semente do
+    # treinamento é derivada dessa chave, de forma que a avaliação de uma tarefa não depende das demais tarefas. Sem
+    # o cache, a chave usa a representação dos valores instáveis, única durante a execução, e a semente usa apenas o
+    # seu tipo, de forma que continua a mesma entre execuções
+    tasks: List[_Task] = []
+    keys: List[str] = []
+    for params in candidates:
+        for train, test in folds:
+            values = (dataset, test, estimator, scoring, params)
+            if cache is None:
+                key = _digest(*values, fallback=repr)
+                seed = _digest(*values, fallback=lambda value: type(value).__qualname__)
+            else:
+                key = seed = _digest(*values)
+
+            tasks.append((params, train, test, int(seed[:8], 16)))
+            keys.append(key)
+
+    scores: Dict[str, float] = {}
+    if cache is not None:
+        os.makedirs(cache, exist_ok=True)
+        for key in keys:
+            score = _read_cache(cache, key)
+            if score is not None:
+                scores[key] = score
+
+    # Tarefas repetidas (combinações de parâmetros repetidas) são avaliadas uma única vez
+    pending: Dict[str, _Task] = {key: task for key, task in zip(keys, tasks) if key not in scores}
+    if n_jobs is not None and n_jobs > 1 and len(pending) > 1:
+        # O estimador e o conjunto de dados são enviados uma única vez para cada processo, e a cada tarefa apenas os
+        # parâmetros, os índices das amostras e a semente aleatória
+        with worker_pool(min(n_jobs, len(pending)), estimator=estimator, X=X, y=y, scoring=scoring) as pool:
+            results: Iterator[float] = pool.imap(_evaluate_worker, pending.values())
+            for key, score in zip(pending, results):
+                scores[key] = score
+                if cache is not None:
+                    _write_cache(cache, key, score)
+    else:
+        state = random.getstate()
+        try:
+            for key, task in pending.items():
+                scores[key] = _evaluate(estimator, X, y, scoring, *task)
+                if cache is not None:
+                    _write_cache(cache, key, scores[key])
+        finally:
+            random.setstate(state)
+
+    report: Report = []
+    for i, params in enumerate(candidates):
+        fold_keys = keys[i * len(folds):(i + 1) * len(folds)]
+        report.append((params, statistics.mean(scores[key] for key in fold_keys)))
+
+    best_params = max(report, key=lambda item: item[1])[0]
+    return (best_params, report) if return_report else best_params
+
+
+def grid_search(
+        estimator: Callable[..., Any],
+        X: Matrix,
+        y: Optional[Vector] = None,
+        *,
+        param_grid: Dict[str, Sequence[Any]],
+        n_folds: int = 5,
+        scoring: Optional[Scoring] = None,
+        stratify: bool = False,
+        groups: Optional[Vector] = None,
+        n_jobs: Optional[int] = None,
+        cache: Optional[str] = None,
+        return_report: bool = False,
+) -> Union[Params, Tuple[Params, Report]]:
+    """
+    Encontra a combinação de parâmetros de um estimador com a melhor avaliação média na validação cruzada k-fold,
+    dentre todas as combinações de uma grade.
+
+    Os folds são sorteados uma única vez e compartilhados por todas as combinações. Cada par (combinação, fold) é uma
+    tarefa independente, treinada com o gerador de números aleatórios do módulo `random` inicializado com uma semente
+    derivada da própria tarefa, de forma que o resultado não depende do número de processos nem das demais combinações.
+
+    Caso ``cache`` seja fornecido, a avaliação de cada tarefa é salva nesse diretório, identificada pela impressão
+    digital do conjunto de dados, pelo fold, pelo estimador, pela função de avaliação e pelos parâmetros. Ao repetir uma
+    busca com a mesma semente aleatória, por exemplo com uma grade ampliada, apenas as tarefas novas são avaliadas.
+    Funções e classes são identificadas também pelo seu código (no caso de classes, pelo código dos seus métodos), de
+    forma que alterar o estimador ou a função de avaliação invalida as avaliações salvas. Funções e classes auxiliares
+    chamadas por eles não fazem parte da identificação. Caso o estimador, a função de avaliação ou algum parâmetro não
+    possa ser identificado entre execuções (um objeto cuja representação contém um endereço de memória, como um
+    ``functools.partial``), o cache não é utilizado.
+
+    Equivalente à sklearn.model_selection.GridSearchCV_.
+
+    :param estimator: a classe (ou função) que cria o estimador a partir dos parâmetros, por exemplo ``MLPClassifier``.
+    :param X: as características das amostras.
+    :param y: as classes das amostras. Caso seja `None`, o estimador é ajustado apenas às características (por exemplo,
+                ``KMeans``), e ``scoring`` deve ser fornecido.
+    :param param_grid: os valores a serem testados de cada parâmetro, por nome.
+    :param n_folds: o número de folds, padrão 5.
+    :param scoring: a função que avalia um estimador ajustado nas amostras de teste de um fold, recebendo o estimador,
+                    as características e as classes (ou `None`). Avaliações maiores são melhores. Caso seja `None`
+                    (padrão), a acurácia é utilizada.
+    :param stratify: se os folds devem manter a proporção de cada classe do conjunto inteiro, padrão `False`.
+    :param groups: o grupo de cada amostra. Caso seja fornecido, as amostras de um mesmo grupo são mantidas em um mesmo
+                    fold.
+    :param n_jobs: o número de processos utilizados para avaliar as tarefas em paralelo. Caso seja `None` (padrão) ou 1,
+                    as tarefas são avaliadas no processo atual. Caso contrário, o estimador, a função de avaliação e as
+                    amostras devem ser serializáveis por `pickle`.
+    :param cache: o diretório em que as avaliações são salvas, ou `None` (padrão) para não salvá-las.
+    :param return_report: se a avaliação média de cada combinação deve ser retornada.
+    :return: a combinação de parâmetros com a melhor avaliação média. Caso ``return_report`` seja `True`, uma tupla é
+                retornada com o segundo valor sendo uma lista com cada combinação e a sua avaliação média, em ordem.
+    """
+    names = list(param_grid)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+    if not candidates:
+        raise ValueError("param_grid must have at least one value for each parameter")
+
+    X = ValidatedMatrix(X)
+    folds = _folds(X, y, n_folds, scoring, stratify, groups)
+    return _search(estimator, X, y, candidates, folds, scoring=scoring, n_jobs=n_jobs, cache=cache,
+                   return_report=return_report)
+
+
+def random_search(
+        estimator: Callable[..., Any],
+        X: Matrix,
+        y: Optional[Vector] = None,
+        *,
+        param_distributions: Dict[str, Union[Sequence[Any], Callable[[], Any]]],
+        n_iter: int = 10,
+        n_folds: int = 5,
+        scoring: Optional[Scoring] = None,
+        stratify: bool = False,
+        groups: Optional[Vector] = None,
+        n_jobs: Optional[int] = None,
+        cache: Optional[str] = None,
+        return_report: bool = False,
+) -> Union[Params, Tuple[Params, Report]]:
+    """
+    Encontra a combinação de parâmetros de um estimador com a melhor avaliação média na validação cruzada k-fold,
+    dentre combinações sorteadas.
+
+    Os folds são sorteados antes das combinações, de forma que, com a mesma semente aleatória, uma busca com mais
+    iterações reaproveita do cache as avaliações das combinações da busca anterior. Os demais detalhes são os mesmos de
+    ``grid_search``.
+
+    Equivalente à sklearn.model_selection.RandomizedSearchCV_.
+
+    :param estimator: a classe (ou função) que cria o estimador a partir dos parâmetros.
+    :param X: as características das amostras.
+    :param y: as classes das amostras, ou `None`.
+    :param param_distributions: a distribuição de cada parâmetro, por nome: uma sequência de valores, sorteados com
+                                probabilidades iguais, ou uma função sem argumentos que sorteia um valor (por exemplo,
+                                ``lambda: random.uniform(0.01, 1)``).
+    :param n_iter: o número de combinações sorteadas, padrão 10.
+    :param n_folds: o número de folds, padrão 5.
+    :param scoring: a função de avaliação, como em ``grid_search``.
+    :param stratify: se os folds devem manter a proporção de cada classe do conjunto inteiro, padrão `False`.
+    :param groups: o grupo de cada amostra, ou `None`.
+    :param n_jobs: o número de processos utilizados para avaliar as tarefas em paralelo.
+    :param cache: o diretório em que as avaliações são salvas, ou `None` (padrão) para não salvá-las.
+    :param return_report: se a avaliação média de cada combinação deve ser retornada.
+    :return: a combinação de parâmetros com a melhor avaliação média e, caso ``return_report`` seja `True`, a lista com
+                cada combinação e a sua avaliação média.
+    """
+    if n_iter < 1:
+        raise ValueError(f"n_iter ({n_iter}) must be greater than zero")
+
+    X = ValidatedMatrix(X)
+    folds = _folds(X, y, n_folds, scoring, stratify, groups)
+    candidates: List[Params] = []
+    for _ in range(n_iter):
+        candidates.append({name: distribution() if callable(distribution) else random.choice(distribution)
+                           for name, distribution in param_distributions.items()})
+
+    return _search(estimator, X, y, candidates, folds, scoring=scoring, n_jobs=n_jobs, cache=cache,
+                   return_report=return_report)
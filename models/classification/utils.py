@@ -1,8 +1,183 @@
+import heapq
 import random
-from typing import Tuple, Union
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from models.utils.linear_alg import Matrix, Vector, check_dimension_match, diagonal_sum
-from models.utils.lists import split_list
+from models.classification.metrics import ClassificationMetrics
+from models.utils.linear_alg import Matrix, Vector, check_dimension_match
+from models.utils.lists import IndexView, ValidatedMatrix, split_list
+from models.utils.parallel import worker_pool, worker_state
+
+
+def train_test_indices(n_samples: int, test_sampling=0.3) -> Tuple[List[int], List[int]]:
+    """
+    Divide as posições de um conjunto de amostras em conjuntos aleatórios de treinamento e teste.
+
+    :param n_samples: o número de amostras.
+    :param test_sampling: proporção das amostras a ser incluída no conjunto de teste, padrão 30%.
+    :return: as posições das amostras de treinamento e as posições das amostras de teste.
+    """
+    shuffled_indices = list(random.sample(range(n_samples), n_samples))
+
+    train_size = int(n_samples * (1 - test_sampling))
+    return shuffled_indices[:train_size], shuffled_indices[train_size:]
+
+
+def _check_n_folds(n_samples: int, n_folds: int):
+    if n_folds < 2:
+        raise ValueError(f"n_folds ({n_folds}) must be greater than one")
+
+    if n_folds > n_samples:
+        raise ValueError(f"n_folds ({n_folds}) must be less or equal than the number of samples ({n_samples})")
+
+
+def _rotate(folds: List[List[int]]) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Usa cada fold como conjunto de teste uma vez, enquanto os demais formam o conjunto de treinamento.
+
+    :param folds: as posições das amostras de cada fold.
+    :return: um iterador sobre as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+    """
+    for k, test in enumerate(folds):
+        yield [i for j, fold in enumerate(folds) if j != k for i in fold], test
+
+
+def _buckets(values: Sequence[Any]) -> List[List[int]]:
+    """
+    Agrupa as posições de uma sequência pelos seus valores, em uma única passagem.
+
+    :param values: a sequência.
+    :return: as posições de cada valor distinto, na ordem da primeira ocorrência de cada valor.
+    """
+    buckets: Dict[Any, List[int]] = {}
+    for i, value in enumerate(values):
+        buckets.setdefault(value, []).append(i)
+
+    return list(buckets.values())
+
+
+def fold_indices(n_samples: int, n_folds: int) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Divide as posições de um conjunto de amostras em folds para a validação cruzada k-fold.
+
+    As posições são embaralhadas uma única vez, na chamada dessa função, e divididas em ``n_folds`` folds contíguos.
+    Cada fold é então usado como conjunto de teste uma vez, enquanto os demais formam o conjunto de treinamento.
+
+    :param n_samples: o número de amostras.
+    :param n_folds: o número de folds.
+    :raises ValueError: se ``n_folds`` for menor que dois ou maior que o número de amostras.
+    :return: um iterador sobre as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+    """
+    _check_n_folds(n_samples, n_folds)
+    return _rotate(split_list(list(random.sample(range(n_samples), n_samples)), n_folds))
+
+
+def stratified_fold_indices(y: Vector, n_folds: int) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Divide as posições de um conjunto de amostras em folds estratificados para a validação cruzada k-fold.
+
+    As posições das amostras de cada classe são embaralhadas e distribuídas entre os folds alternadamente, uma classe
+    após a outra, de forma que a proporção de cada classe em cada fold é a mais próxima possível da proporção no
+    conjunto inteiro e que os tamanhos dos folds diferem em no máximo uma amostra. A divisão é feita uma única vez, na
+    chamada dessa função, em tempo linear.
+
+    Equivalente à sklearn.model_selection.StratifiedKFold_ com o parâmetro 'shuffle' igual a `True`.
+
+    :param y: as classes das amostras.
+    :param n_folds: o número de folds.
+    :raises ValueError: se ``n_folds`` for menor que dois ou maior que o número de amostras.
+    :return: um iterador sobre as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+
+    .. _sklearn.model_selection.StratifiedKFold: https://scikit-learn.org/stable/modules/generated/sklearn.model_selection.StratifiedKFold.html
+    """
+    _check_n_folds(len(y), n_folds)
+
+    folds: List[List[int]] = [[] for _ in range(n_folds)]
+    position = 0
+    for bucket in _buckets(y):
+        # A posição continua de uma classe para a outra, para que os folds tenham tamanhos equilibrados
+        for i in random.sample(bucket, len(bucket)):
+            folds[position % n_folds].append(i)
+            position += 1
+
+    return _rotate(folds)
+
+
+def group_fold_indices(groups: Vector, n_folds: int) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Divide as posições de um conjunto de amostras em folds para a validação cruzada k-fold, mantendo as amostras de
+    um mesmo grupo em um mesmo fold.
+
+    Os grupos são distribuídos do maior para o menor (com empates em ordem aleatória), cada um no fold com menos
+    amostras até o momento. A divisão é feita uma única vez, na chamada dessa função.
+
+    Equivalente à sklearn.model_selection.GroupKFold_.
+
+    :param groups: o grupo de cada amostra.
+    :param n_folds: o número de folds.
+    :raises ValueError: se ``n_folds`` for menor que dois ou maior que o número de grupos distintos.
+    :return: um iterador sobre as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+
+    .. _sklearn.model_selection.GroupKFold: https://scikit-learn.org/stable/modules/generated/sklearn.model_selection.GroupKFold.html
+    """
+    _check_n_folds(len(groups), n_folds)
+
+    buckets = _buckets(groups)
+    if n_folds > len(buckets):
+        raise ValueError(f"n_folds ({n_folds}) must be less or equal than the number of groups ({len(buckets)})")
+
+    buckets = random.sample(buckets, len(buckets))
+    buckets.sort(key=len, reverse=True)
+
+    # A fila de prioridade é ordenada pelo tamanho do fold e, em caso de empate, pela posição do fold
+    folds: List[List[int]] = [[] for _ in range(n_folds)]
+    queue: List[Tuple[int, int]] = [(0, k) for k in range(n_folds)]
+    for bucket in buckets:
+        size, k = heapq.heappop(queue)
+        folds[k].extend(bucket)
+        heapq.heappush(queue, (size + len(bucket), k))
+
+    return _rotate(folds)
+
+
+def cross_validation_indices(
+        n_samples: int,
+        n_folds: int,
+        y: Optional[Vector] = None,
+        *,
+        stratify: bool = False,
+        groups: Optional[Vector] = None,
+) -> Iterator[Tuple[List[int], List[int]]]:
+    """
+    Divide as posições de um conjunto de amostras em folds para a validação cruzada k-fold, por meio de
+    ``fold_indices``, ``stratified_fold_indices`` ou ``group_fold_indices``.
+
+    :param n_samples: o número de amostras.
+    :param n_folds: o número de folds.
+    :param y: as classes das amostras, ou `None`.
+    :param stratify: se os folds devem manter a proporção de cada classe do conjunto inteiro, padrão `False`.
+    :param groups: o grupo de cada amostra. Caso seja fornecido, as amostras de um mesmo grupo são mantidas em um mesmo
+                    fold. Não pode ser usado em conjunto com ``stratify``.
+    :raises ValueError: se ``stratify`` e ``groups`` forem usados em conjunto, se ``stratify`` for usado sem ``y``, se
+                        o número de grupos for diferente do número de amostras ou se ``n_folds`` for inválido.
+    :return: um iterador sobre as posições das amostras de treinamento e as posições das amostras de teste de cada fold.
+    """
+    if stratify and groups is not None:
+        raise ValueError("stratify and groups cannot be used together")
+
+    if groups is not None:
+        if len(groups) != n_samples:
+            raise ValueError(f"groups size ({len(groups)}) must be the same as X rows ({n_samples})")
+
+        return group_fold_indices(groups, n_folds)
+
+    if stratify:
+        if y is None:
+            raise ValueError("stratify requires y")
+
+        return stratified_fold_indices(y, n_folds)
+
+    return fold_indices(n_samples, n_folds)
 
 
 def split_into_train_test(
@@ -24,26 +199,9 @@ def split_into_train_test(
     .. _sklearn.model_selection.train_test_split: https://scikit-learn.org/stable/modules/generated/sklearn.model_selection.train_test_split.html
     """
     n_samples = check_dimension_match(X, y)
-    list_samples = [(f, c) for f, c in zip(X, y)]
-    shuffled_samples = random.sample(list_samples, n_samples)
+    train, test = train_test_indices(n_samples, test_sampling)
 
-    train_size = int(n_samples * (1 - test_sampling))
-    train_samples = shuffled_samples[:train_size]
-    test_samples = shuffled_samples[train_size:]
-
-    X_train = []
-    y_train = []
-    X_test = []
-    y_test = []
-    for X_, y_ in train_samples:
-        X_train.append(X_)
-        y_train.append(y_)
-
-    for X_, y_ in test_samples:
-        X_test.append(X_)
-        y_test.append(y_)
-
-    return X_train, y_train, X_test, y_test
+    return [X[i] for i in train], [y[i] for i in train], [X[i] for i in test], [y[i] for i in test]
 
 
 def confusion_matrix(
@@ -63,6 +221,7 @@ def confusion_matrix(
                         em 'y_true' e 'y_pred' são usados.
     :param return_classes: se as classes usadas pela matriz de confusão devem ser retornadas. Apenas as classes que
                             aparecem pelo menos uma vez em 'y_true' e 'y_pred' serão retornadas.
+    :raises ValueError: se 'n_classes' for menor que o número de classes que aparecem em 'y_true' e 'y_pred'.
 
     :return: a matriz de confusão. Se 'return_classes' for `True`, uma tupla será retornada com o segundo valor sendo
                 uma lista das classes usadas pela matriz de confusão, onde cada classe corresponde a uma coluna da
@@ -73,33 +232,63 @@ def confusion_matrix(
     classes = list(set(y_true) | set(y_pred))
     if n_classes is None:
         n_classes = len(classes)
+    elif n_classes < len(classes):
+        raise ValueError(f"n_classes ({n_classes}) must be greater or equal than the number of classes found in y_true "
+                         f"and y_pred ({len(classes)})")
 
-    matrix = []
-    for c in classes:
-        pairs = [pair for pair in zip(y_pred, y_true) if pair[1] == c]
-        pred_values = [t[0] for t in pairs]
+    # Conta cada par (classe correta, classe estimada) em uma única passagem e só então converte as classes em índices
+    index = {c: i for i, c in enumerate(classes)}
+    matrix = [[0] * n_classes for _ in range(n_classes)]
+    for (true_value, pred_value), count in Counter(zip(y_true, y_pred)).items():
+        matrix[index[true_value]][index[pred_value]] = count
 
-        row = [0 for _ in range(n_classes)]
-        for pred_value in pred_values:
-            index = classes.index(pred_value)
-            row[index] += 1
-        matrix.append(row)
+    return (matrix, classes) if return_classes else matrix
 
-    # Adiciona classes que estejam faltando, caso tenham
-    while len(matrix) < n_classes:
-        matrix.append([])
-        for row in matrix:
-            row.extend([0] * (n_classes - len(row)))
 
-    return (matrix, classes) if return_classes else matrix
+def _evaluate_fold(clf, X: Matrix, y: Vector, train: List[int], test: List[int], seed: int) -> float:
+    """
+    Treina um classificador com as amostras de treinamento de um fold e calcula a sua acurácia nas amostras de teste.
+
+    :param clf: o classificador.
+    :param X: as características de todas as amostras.
+    :param y: as classes de todas as amostras.
+    :param train: os índices das amostras de treinamento.
+    :param test: os índices das amostras de teste.
+    :param seed: a semente do gerador de números aleatórios do módulo `random` durante o treinamento.
+    :return: a acurácia do classificador nas amostras de teste.
+    """
+    random.seed(seed)
+    clf.fit(IndexView(X, train), IndexView(y, train))
+    y_pred = clf.predict(IndexView(X, test))
+
+    return ClassificationMetrics().update(IndexView(y, test), y_pred).accuracy
 
 
-def k_fold(clf, X: Matrix, y: Vector, *, n_folds: int = 5) -> Vector:
+def _evaluate_fold_worker(task: Tuple[List[int], List[int], int]) -> float:
+    state = worker_state()
+    return _evaluate_fold(state['clf'], state['X'], state['y'], *task)
+
+
+def k_fold(
+        clf,
+        X: Matrix,
+        y: Vector,
+        *,
+        n_folds: int = 5,
+        n_jobs: Optional[int] = None,
+        stratify: bool = False,
+        groups: Optional[Vector] = None,
+) -> Vector:
     """
     Utiliza o método de validação cruzada k-fold em amostras.
 
     Cada fold é usada como um conjunto de validação uma vez, enquanto os k-1 folds restantes formam o conjunto de
-    treinamento.
+    treinamento. Os folds são gerados por ``cross_validation_indices``, e o classificador é treinado e avaliado sobre
+    visões (``IndexView``) das amostras originais, sem cópias.
+
+    Cada fold é treinado com o gerador de números aleatórios do módulo `random` inicializado com uma semente própria,
+    sorteada antes do treinamento. Dessa forma, o resultado depende apenas do estado inicial do gerador, e não do
+    número de processos. O estado do gerador é restaurado após o treinamento de cada fold.
 
     Equivalente à sklearn.model_selection.cross_val_score_ com o paramêtro 'cv' igual a 'n_folds'.
 
@@ -107,48 +296,39 @@ def k_fold(clf, X: Matrix, y: Vector, *, n_folds: int = 5) -> Vector:
     :param X: matriz que representa as características de cada amostra.
     :param y: vetor que representa as classes de cada amostra.
     :param n_folds: número de folds cuja população total será dividida.
+    :param n_jobs: o número de processos utilizados para treinar os folds em paralelo. Caso seja `None` (padrão) ou 1,
+                    os folds são treinados no processo atual. Caso contrário, o classificador e as amostras devem ser
+                    serializáveis por `pickle`, e são enviados uma única vez para cada processo.
+    :param stratify: se os folds devem manter a proporção de cada classe do conjunto inteiro, padrão `False`.
+    :param groups: o grupo de cada amostra. Caso seja fornecido, as amostras de um mesmo grupo são mantidas em um mesmo
+                    fold. Não pode ser usado em conjunto com ``stratify``.
 
     :return: vetor de precisão resultante da classificação de cada iteração.
 
     .. _sklearn.model_selection.cross_val_score: https://scikit-learn.org/stable/modules/generated/sklearn.model_selection.cross_val_score.html
     """
+    # As linhas são validadas uma única vez, e não a cada fold
+    X = ValidatedMatrix(X)
     n_samples = check_dimension_match(X, y, allow_empty=False)
-    samples = [(f, c) for f, c in zip(X, y)]
+    if n_jobs is not None and n_jobs < 1:
+        raise ValueError(f"n_jobs ({n_jobs}) must be greater than zero")
 
-    if n_folds < 2:
-        raise ValueError(f"n_folds ({n_folds}) must be greater than one")
+    folds = cross_validation_indices(n_samples, n_folds, y, stratify=stratify, groups=groups)
+    seeds = [random.getrandbits(32) for _ in range(n_folds)]
+    tasks = ((train, test, seed) for (train, test), seed in zip(folds, seeds))
 
-    if n_folds > n_samples:
-        raise ValueError(f"n_folds ({n_folds}) must be less or equal than the number of samples ({n_samples})")
+    if n_jobs is not None and n_jobs > 1:
+        # O classificador e o conjunto de dados são enviados uma única vez para cada processo, e a cada fold apenas os
+        # índices das amostras e a semente aleatória
+        with worker_pool(min(n_jobs, n_folds), clf=clf, X=X, y=y) as pool:
+            return list(pool.imap(_evaluate_fold_worker, tasks))
 
     accuracies = []
-    for _ in range(n_folds):
-        shuffled_samples = random.sample(samples, len(samples))
-        folds = split_list(shuffled_samples, n_folds)
-
-        folds_out, folds_in = folds[:1], folds[1:]
-
-        X_train = []
-        y_train = []
-        for fold in folds_in:
-            for X_, y_ in fold:
-                X_train.append(X_)
-                y_train.append(y_)
-
-        X_test = []
-        y_test = []
-        for fold in folds_out:
-            for X_, y_ in fold:
-                X_test.append(X_)
-                y_test.append(y_)
-
-        clf.fit(X_train, y_train)
-        y_pred = clf.predict(X_test)
-
-        cm = confusion_matrix(y_test, y_pred)
-        n_test = sum(sum(x) for x in cm)
-        accuracy = diagonal_sum(cm) / n_test
-
-        accuracies.append(accuracy)
+    state = random.getstate()
+    try:
+        for train, test, seed in tasks:
+            accuracies.append(_evaluate_fold(clf, X, y, train, test, seed))
+    finally:
+        random.setstate(state)
 
     return accuracies
@@ -1,6 +1,6 @@
 from typing import List, Iterable, Sized
 
-from models.utils.linear_alg import Vector, euclidean
+from models.utils.linear_alg import Vector, pairwise_distances
 
 
 class _Cluster(Iterable[Vector], Sized):
@@ -30,7 +30,7 @@ class _Cluster(Iterable[Vector], Sized):
         """
         :return: a soma das distâncias do centroide do cluster a todos os seus pontos.
         """
-        return sum(euclidean(self.center, sample) for sample in self._samples)
+        return sum(row[0] for block in pairwise_distances(self._samples, [self.center]) for row in block)
 
     def __iter__(self):
         return iter(self._samples)
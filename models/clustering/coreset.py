@@ -0,0 +1,55 @@
+import collections
+import math
+import random
+import statistics
+from typing import Tuple
+
+from models.utils.linear_alg import Matrix, Vector
+
+
+def build_coreset(X: Matrix, size: int) -> Tuple[Matrix, Vector]:
+    """
+    Resume um conjunto de dados em um pequeno conjunto de amostras ponderadas (coreset).
+
+    Implementa o coreset leve de Bachem et al. (2018): cada amostra `x` é sorteada com probabilidade
+    ``q(x) = 1 / (2n) + d(x, μ)² / (2 Σ d(x', μ)²)``, onde `μ` é a média do conjunto de dados, e recebe peso
+    ``1 / (m q(x))``, onde `m` é o número de sorteios. Amostras sorteadas mais de uma vez são unidas e têm seus pesos
+    somados. O custo de um agrupamento k-means sobre o coreset (utilizando ``sample_weight``) aproxima o custo sobre o
+    conjunto de dados original.
+
+    ####
+    Referências
+    ####
+
+    - https://arxiv.org/abs/1702.08248
+
+    :param X: as características das amostras.
+    :param size: o número de sorteios, isto é, o número máximo de amostras do coreset.
+    :raises ValueError: se o conjunto de dados estiver vazio ou se o número de sorteios não for positivo.
+    :return: as amostras do coreset e seus respectivos pesos.
+    """
+    n_samples = len(X)
+    if not n_samples:
+        raise ValueError("X must not be empty")
+
+    if size < 1:
+        raise ValueError(f"size ({size}) must be greater than zero")
+
+    mean = [statistics.fmean(dimension) for dimension in zip(*X)]
+    squared_distances = [math.dist(sample, mean) ** 2 for sample in X]
+    total = math.fsum(squared_distances)
+
+    if total > 0:
+        probabilities = [0.5 / n_samples + 0.5 * distance / total for distance in squared_distances]
+    else:
+        probabilities = [1.0 / n_samples] * n_samples
+
+    counts = collections.Counter(random.choices(range(n_samples), weights=probabilities, k=size))
+
+    samples: Matrix = []
+    weights: Vector = []
+    for index in sorted(counts):
+        samples.append(X[index])
+        weights.append(counts[index] / (size * probabilities[index]))
+
+    return samples, weights
@@ -0,0 +1,252 @@
+import heapq
+import math
+import statistics
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.clustering.cluster import _Cluster
+from models.clustering.kmeans.model import KMeans, check_sample_weight
+from models.utils.linear_alg import Matrix, Vector
+from models.utils.math import weighted_mean, weighted_median
+from models.utils.serialization import Array
+
+
+class _ClusterNode(_Cluster):
+    """
+    Representa um cluster que faz parte da árvore de divisões de um agrupamento hierárquico.
+    """
+
+    def __init__(self, center: Vector):
+        """
+        Cria um nó vazio.
+
+        :param center: a amostra que representa o centroide desse cluster.
+        """
+        super().__init__(center)
+
+        self.indices: List[int] = []
+        """
+        As posições das amostras desse cluster no conjunto de dados original.
+        """
+
+        self.children: Optional[Tuple['_ClusterNode', '_ClusterNode']] = None
+        """
+        Os dois clusters resultantes da divisão desse cluster.
+
+        Caso seja `None`, esse cluster é uma folha da árvore.
+        """
+
+        self.label: Optional[int] = None
+        """
+        O índice desse cluster no agrupamento final.
+
+        Caso seja `None`, esse cluster não é uma folha da árvore.
+        """
+
+    def add(self, sample: Vector, index: int = -1):
+        """
+        Adiciona uma amostra a este cluster.
+
+        :param sample: a amostra a ser adicionada.
+        :param index: a posição da amostra no conjunto de dados original.
+        """
+        super().add(sample)
+        self.indices.append(index)
+
+    def leaves(self) -> Iterator['_ClusterNode']:
+        """
+        Percorre as folhas da subárvore desse cluster, da esquerda para a direita.
+
+        :return: um iterador sobre as folhas.
+        """
+        stack: List[_ClusterNode] = [self]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                yield node
+            else:
+                left, right = node.children
+                stack.append(right)
+                stack.append(left)
+
+    def __repr__(self):
+        return f'_ClusterNode({self.center}, {self._samples})'
+
+
+class BisectingKMeans(KMeans):
+    """
+    Agrupamento k-means hierárquico (bisecting k-means).
+
+    Partindo de um único cluster com todas as amostras, o cluster de maior soma de distâncias ao seu centroide é
+    repetidamente dividido em dois por meio de um ``KMeans`` com dois clusters, até que ``n_clusters`` folhas sejam
+    obtidas. A árvore de divisões é mantida em ``root_`` e utilizada por ``predict``, que desce a árvore comparando a
+    amostra apenas com os dois filhos de cada nó. Dessa forma, uma predição custa O(log k) cálculos de distância (para
+    árvores balanceadas) em vez de O(k), ao custo de nem sempre retornar o centroide mais próximo.
+    """
+
+    def __init__(self, *, n_clusters: int = 3, n_iterations: int = 500, strategy: str = 'mean', n_trials: int = 3):
+        """
+        Cria um agrupamento hierárquico.
+
+        :param n_clusters: o número de clusters a serem encontrados, padrão 3. Caso as amostras não possam ser
+                            divididas em ``n_clusters`` clusters não vazios (por exemplo, por possuírem menos
+                            amostras distintas), ``fit`` lança um `ValueError`.
+        :param n_iterations: o número máximo de iterações de cada divisão, padrão 500.
+        :param strategy: a estratégia de atualização dos centróides, 'mean' (padrão) ou 'median'.
+        :param n_trials: o número de tentativas de divisão de um cluster antes de considerá-lo indivisível, padrão 3.
+        """
+        super().__init__(n_clusters=n_clusters, n_iterations=n_iterations, strategy=strategy)
+        if n_trials < 1:
+            raise ValueError(f"n_trials ({n_trials}) must be greater than zero")
+
+        self.n_trials = n_trials
+
+        self.root_: Optional[_ClusterNode] = None
+        """
+        A raiz da árvore de divisões desse agrupamento.
+
+        Caso seja `None`, o método ``fit`` ainda não foi chamado.
+        """
+
+    @staticmethod
+    def _cost(node: _ClusterNode, sample_weight: Optional[Vector]) -> float:
+        """
+        Calcula o custo de um cluster, isto é, a soma (ponderada) das distâncias do seu centroide às suas amostras.
+
+        :param node: o cluster.
+        :param sample_weight: os pesos das amostras originais, ou `None`.
+        :return: o custo do cluster.
+        """
+        if sample_weight is None:
+            return node.distance()
+
+        return sum(sample_weight[index] * math.dist(node.center, sample) for sample, index in zip(node, node.indices))
+
+    def _split(self, node: _ClusterNode, sample_weight: Optional[Vector]) -> bool:
+        """
+        Divide um cluster em dois.
+
+        :param node: o cluster a ser dividido.
+        :param sample_weight: os pesos das amostras originais, ou `None`.
+        :return: se a divisão produziu dois clusters não vazios.
+        """
+        samples: Matrix = list(node)
+        if len(samples) < 2:
+            return False
+
+        weights: Optional[Vector] = None
+        if sample_weight is not None:
+            weights = [sample_weight[index] for index in node.indices]
+
+        for _ in range(self.n_trials):
+            clf = KMeans(n_clusters=2, n_iterations=self.n_iterations, strategy=self.strategy)
+            clf.fit(samples, weights)
+
+            left, right = (_ClusterNode(center) for center in clf.cluster_centers_)
+            for sample, index, label in zip(samples, node.indices, clf.labels_):
+                (right if label else left).add(sample, index)
+
+            if len(left) and len(right):
+                node.children = (left, right)
+                return True
+
+        return False
+
+    def fit(self, X: Matrix, sample_weight: Optional[Vector] = None) -> 'BisectingKMeans':
+        check_sample_weight(X, sample_weight)
+        self._X = X
+        self._index = None
+        if sample_weight is None:
+            strategy = statistics.mean if self.strategy == 'mean' else statistics.median
+            root = _ClusterNode([strategy(dimension) for dimension in zip(*X)])
+        else:
+            strategy = weighted_mean if self.strategy == 'mean' else weighted_median
+            root = _ClusterNode([strategy(dimension, sample_weight) for dimension in zip(*X)])
+
+        for index, sample in enumerate(X):
+            root.add(sample, index)
+
+        # A fila de prioridade é ordenada pela soma das distâncias (negativa) e, em caso de empate, pela ordem de
+        # criação
+        n_nodes = 0
+        queue: List[Tuple[float, int, _ClusterNode]] = [(-self._cost(root, sample_weight), n_nodes, root)]
+        n_leaves = 1
+        while n_leaves < self.n_clusters and queue:
+            _, _, node = heapq.heappop(queue)
+            if not self._split(node, sample_weight):
+                continue
+
+            for child in node.children:
+                n_nodes += 1
+                heapq.heappush(queue, (-self._cost(child, sample_weight), n_nodes, child))
+
+            # Apenas as folhas precisam manter suas amostras
+            node._samples = []
+            node.indices = []
+            n_leaves += 1
+
+        if n_leaves < self.n_clusters:
+            raise ValueError(f"X could only be split into {n_leaves} non-empty clusters, "
+                             f"expected {self.n_clusters}")
+
+        self.cluster_centers_ = []
+        self.labels_ = [0] * len(X)
+        for leaf in root.leaves():
+            leaf.label = len(self.cluster_centers_)
+            self.cluster_centers_.append(leaf.center)
+            for index in leaf.indices:
+                self.labels_[index] = leaf.label
+
+        self.root_ = root
+        return self
+
+    def _state(self) -> Tuple[Dict[str, Any], Dict[str, Array], Dict[str, str]]:
+        meta, arrays, dtypes = super()._state()
+        meta['params'] = {
+            'n_clusters': self.n_clusters,
+            'n_iterations': self.n_iterations,
+            'strategy': self.strategy,
+            'n_trials': self.n_trials,
+        }
+
+        # A árvore é salva em pré-ordem: cada nó possui o seu centroide, os índices dos seus filhos (-1 nas folhas) e o
+        # seu rótulo (-1 nos nós internos)
+        nodes: List[_ClusterNode] = []
+        stack: List[_ClusterNode] = [self.root_]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node.children is not None:
+                stack.extend(reversed(node.children))
+
+        positions = {id(node): i for i, node in enumerate(nodes)}
+        arrays['node_centers'] = [node.center for node in nodes]
+        arrays['node_children'] = [[-1, -1] if node.children is None else [positions[id(child)] for child in
+                                                                           node.children] for node in nodes]
+        arrays['node_labels'] = [-1 if node.label is None else node.label for node in nodes]
+        dtypes.update({'node_children': 'i8', 'node_labels': 'i8'})
+        return meta, arrays, dtypes
+
+    def _restore(self, meta: Dict[str, Any], arrays: Dict[str, Array]):
+        super()._restore(meta, arrays)
+
+        nodes = [_ClusterNode(center) for center in arrays['node_centers']]
+        for node, (left, right), label in zip(nodes, arrays['node_children'], arrays['node_labels']):
+            if left >= 0:
+                node.children = (nodes[left], nodes[right])
+            if label >= 0:
+                node.label = label
+
+        self.root_ = nodes[0]
+
+    def _assign(self) -> Callable[[Matrix], Iterable[int]]:
+        root = self.root_
+
+        def nearest(sample: Vector) -> int:
+            node = root
+            while node.children is not None:
+                left, right = node.children
+                node = left if math.dist(sample, left.center) <= math.dist(sample, right.center) else right
+
+            return node.label
+
+        return lambda block: map(nearest, block)
@@ -1,12 +1,106 @@
+import array
+import bisect
+import itertools
+import math
 import random
 import statistics
-from typing import List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from models.clustering.cluster import _Cluster
-from models.utils.linear_alg import Matrix, euclidean, Vector
+from models.utils.linear_alg import Matrix, Vector, is_vector, pairwise_distances
+from models.utils.math import weighted_mean, weighted_median
+from models.utils.checkpoint import save_checkpoint, load_checkpoint
+from models.utils.serialization import Array, save_arrays, load_arrays
+
+
+def check_sample_weight(X: Matrix, sample_weight: Optional[Vector]):
+    """
+    Verifica se os pesos das amostras de um agrupamento são válidos.
+
+    :param X: as características das amostras.
+    :param sample_weight: os pesos das amostras, ou `None`.
+    :raises ValueError: se o número de pesos for diferente do número de amostras ou se algum peso for negativo.
+    """
+    if sample_weight is None:
+        return
+
+    if len(sample_weight) != len(X):
+        raise ValueError(f"sample_weight size ({len(sample_weight)}) must be the same as X rows ({len(X)})")
+
+    if any(weight < 0 for weight in sample_weight):
+        raise ValueError("sample_weight must not have negative values")
+
+
+class _CentroidIndex:
+    """
+    Índice sobre os centróides de um agrupamento que acelera a busca pelo centróide mais próximo de uma amostra.
+
+    Os centróides são ordenados pela sua norma. Como ``|‖x‖ - ‖c‖| <= ‖x - c‖`` (desigualdade triangular), a busca
+    parte dos centróides de norma mais próxima à da amostra e é interrompida assim que essa cota inferior ultrapassa a
+    menor distância já encontrada.
+    """
+
+    __slots__ = ('_centers', '_norms', '_labels')
+
+    def __init__(self, centers: Matrix):
+        """
+        Cria um índice.
+
+        :param centers: os centróides a serem indexados.
+        """
+        norms = [math.hypot(*center) for center in centers]
+        order = sorted(range(len(centers)), key=norms.__getitem__)
+
+        self._centers: Matrix = [centers[i] for i in order]
+        self._norms: Vector = [norms[i] for i in order]
+        self._labels: List[int] = order
+
+    def nearest(self, sample: Vector) -> int:
+        """
+        Encontra o centróide mais próximo de uma amostra.
+
+        :param sample: a amostra.
+        :return: o índice original do centróide mais próximo. Em caso de empate, o menor índice é retornado.
+        """
+        centers = self._centers
+        norms = self._norms
+        labels = self._labels
+        n_centers = len(norms)
+
+        norm = math.hypot(*sample)
+        hi = bisect.bisect_left(norms, norm)
+        lo = hi - 1
+
+        best_distance = math.inf
+        best_label = -1
+        while lo >= 0 or hi < n_centers:
+            lo_bound = norm - norms[lo] if lo >= 0 else math.inf
+            hi_bound = norms[hi] - norm if hi < n_centers else math.inf
+            if lo_bound <= hi_bound:
+                if lo_bound > best_distance:
+                    break
+                i = lo
+                lo -= 1
+            else:
+                if hi_bound > best_distance:
+                    break
+                i = hi
+                hi += 1
+
+            distance = math.dist(sample, centers[i])
+            if distance < best_distance or (distance == best_distance and labels[i] < best_label):
+                best_distance = distance
+                best_label = labels[i]
+
+        return best_label
 
 
 class KMeans:
+    _INDEX_MIN_CLUSTERS: int = 32
+    """
+    Número mínimo de centróides a partir do qual ``predict_batch`` utiliza um índice sobre os centróides.
+    """
+
     def __init__(self, *, n_clusters: int = 3, n_iterations: int = 500, strategy: str = 'mean',
                  n_fixed_points: int = 0):
         if n_clusters < n_fixed_points:
@@ -23,37 +117,101 @@ class KMeans:
         self.labels_: Optional[Vector] = None
         self.cluster_centers_: Optional[Matrix] = None
         self._X: Optional[Matrix] = None
+        self._index: Optional[_CentroidIndex] = None
+
+    def fit(
+            self,
+            X: Matrix,
+            sample_weight: Optional[Vector] = None,
+            *,
+            checkpoint: Optional[str] = None,
+            checkpoint_interval: int = 1,
+            resume_from: Optional[str] = None,
+    ) -> 'KMeans':
+        """
+        Ajusta o agrupamento ao conjunto de dados.
+
+        :param X: as características das amostras.
+        :param sample_weight: os pesos de cada amostra, não negativos. Se `None`, todas as amostras possuem o mesmo
+                                peso. Com pesos, os centróides são atualizados pela média (ou mediana) ponderada.
+        :param checkpoint: o caminho do arquivo em que o estado do agrupamento (centróides, estado do gerador de números
+                            aleatórios e número de iterações) é salvo periodicamente. Se `None` (padrão), nenhum ponto
+                            de controle é salvo.
+        :param checkpoint_interval: o número de iterações entre dois pontos de controle, padrão 1.
+        :param resume_from: o caminho de um ponto de controle a partir do qual o agrupamento é retomado. As amostras e
+                            os parâmetros desse agrupamento devem ser os mesmos do agrupamento interrompido. Se `None`
+                            (padrão), o agrupamento começa do zero.
+        :return: o agrupamento ajustado.
+        """
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval ({checkpoint_interval}) must be greater than zero")
 
-    def fit(self, X: Matrix) -> 'KMeans':
+        check_sample_weight(X, sample_weight)
         self._X = X
-        strategy = statistics.mean if self.strategy == 'mean' else statistics.median
+        self._index = None
+        if sample_weight is None:
+            strategy = statistics.mean if self.strategy == 'mean' else statistics.median
+        else:
+            strategy = weighted_mean if self.strategy == 'mean' else weighted_median
+
+        kind = f'{type(self).__name__}Checkpoint'
+        if resume_from is None:
+            fixed_samples: Matrix = list(X[:self.n_fixed_points])
+            n_remaining: int = self.n_clusters - self.n_fixed_points
 
-        fixed_samples: Matrix = X[:self.n_fixed_points]
-        n_remaining: int = self.n_clusters - self.n_fixed_points
+            centroids: Matrix = fixed_samples
+            if n_remaining > 0:
+                centroids.extend(random.sample(X[self.n_fixed_points:], n_remaining))
 
-        centroids: Matrix = fixed_samples
-        if n_remaining > 0:
-            centroids.extend(random.sample(X[self.n_fixed_points:], n_remaining))
+            start = 0
+        else:
+            start, _, arrays = load_checkpoint(resume_from, kind)
+            centroids = arrays['centroids']
+            if len(centroids) != self.n_clusters:
+                raise ValueError(f"checkpoint has {len(centroids)} clusters, expected {self.n_clusters}")
 
         clusters: List[_Cluster] = []
-        for _ in range(self.n_iterations):
+        labels: List[int] = []
+        for iteration in range(start, self.n_iterations):
             clusters = [_Cluster(center) for center in centroids]
-            for sample in X:
-                cluster = min(clusters, key=lambda c: euclidean(sample, c.center))
-                cluster.add(sample)
+            cluster_weights: Matrix = [[] for _ in clusters]
+            labels = []
+            all_distances = itertools.chain.from_iterable(pairwise_distances(X, [c.center for c in clusters]))
+            for j, (sample, distances) in enumerate(zip(X, all_distances)):
+                label = distances.index(min(distances))
+                clusters[label].add(sample)
+                labels.append(label)
+                if sample_weight is not None:
+                    cluster_weights[label].append(sample_weight[j])
 
+            converged = True
             for i, cluster in enumerate(clusters[self.n_fixed_points:], start=self.n_fixed_points):
-                if len(cluster) == 1:
+                # Clusters vazios ou com uma única amostra mantêm o seu centróide
+                if len(cluster) <= 1:
                     continue
 
-                centroid = [strategy(dimension) for dimension in zip(*cluster)]
+                if sample_weight is None:
+                    centroid = [strategy(dimension) for dimension in zip(*cluster)]
+                elif sum(cluster_weights[i]) > 0:
+                    centroid = [strategy(dimension, cluster_weights[i]) for dimension in zip(*cluster)]
+                else:
+                    continue
+
+                if centroid != centroids[i]:
+                    converged = False
                 centroids[i] = centroid
 
+            if converged:
+                break
+
+            # O ponto de controle não é salvo na última iteração, de forma que um agrupamento retomado sempre executa
+            # ao menos uma iteração
+            n_completed = iteration + 1
+            if checkpoint is not None and n_completed % checkpoint_interval == 0 and n_completed < self.n_iterations:
+                save_checkpoint(checkpoint, kind, n_completed, {}, {'centroids': centroids})
+
         self.cluster_centers_ = [cluster.center for cluster in clusters]
-        self.labels_ = []
-        for sample in X:
-            cluster_label = next(i for i, cluster in enumerate(clusters) if sample in cluster)
-            self.labels_.append(cluster_label)
+        self.labels_ = labels
 
         return self
 
@@ -64,18 +222,114 @@ class KMeans:
         :param X: as características das amostras a serem previstas.
         :return: o(s) índice(s) do(s) cluster(s) das amostras fornecidas.
         """
-        if self._X is None:
+        if self.cluster_centers_ is None:
             raise ValueError("you must call 'fit' before calling 'predict'")
 
-        is_vector = all(isinstance(v, (float, int)) for v in X)
-        X = [X] if is_vector else X
+        vector = is_vector(X)
+        X = [X] if vector else X
+
+        y = self.predict_batch(X)
+        return y[0] if vector else y.tolist()
+
+    def predict_batch(self, X: Iterable[Vector], *, block_size: int = 1024) -> array.array:
+        """
+        Prediz os clusters de um conjunto de amostras.
+
+        As amostras são consumidas em blocos de ``block_size`` elementos, de forma que ``X`` pode ser qualquer iterável
+        (por exemplo, um gerador) sem ser materializado por completo. A matriz de distâncias entre cada bloco e os
+        centróides é calculada de uma vez por ``pairwise_distances``. Caso o número de clusters seja grande, um índice
+        sobre os centróides é utilizado para evitar comparar cada amostra com todos eles.
+
+        :param X: as características das amostras a serem previstas.
+        :param block_size: o número de amostras processadas por bloco, padrão 1024.
+        :return: os índices dos clusters das amostras fornecidas.
+        """
+        if self.cluster_centers_ is None:
+            raise ValueError("you must call 'fit' before calling 'predict_batch'")
+
+        if block_size < 1:
+            raise ValueError(f"block_size ({block_size}) must be greater than zero")
+
+        assign = self._assign()
+        labels = array.array('l')
+        samples = iter(X)
+        while True:
+            block = list(itertools.islice(samples, block_size))
+            if not block:
+                break
+            labels.extend(assign(block))
+
+        return labels
+
+    def save(self, path: str):
+        """
+        Salva esse agrupamento em um arquivo binário compacto.
+
+        Apenas os parâmetros, os centróides e os rótulos das amostras de treinamento são salvos.
+
+        :param path: o caminho do arquivo.
+        """
+        if self.cluster_centers_ is None:
+            raise ValueError("you must call 'fit' before calling 'save'")
+
+        meta, arrays, dtypes = self._state()
+        save_arrays(path, type(self).__name__, meta, arrays, dtypes)
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = True) -> 'KMeans':
+        """
+        Carrega um agrupamento salvo por ``save``.
+
+        :param path: o caminho do arquivo.
+        :param mmap: se o arquivo deve ser mapeado em memória, padrão `True`. Nesse caso, os centróides são
+                        `memoryview` sobre o arquivo, sem cópia dos dados.
+        :return: o agrupamento carregado.
+        """
+        kind, meta, arrays = load_arrays(path, mmap=mmap)
+        if kind != cls.__name__:
+            raise ValueError(f"'{path}' does not contain a {cls.__name__} model")
+
+        clf = cls(**meta['params'])
+        clf._restore(meta, arrays)
+        return clf
+
+    def _state(self) -> Tuple[Dict[str, Any], Dict[str, Array], Dict[str, str]]:
+        """
+        :return: os metadados, os vetores e os tipos de dados dos vetores que representam esse agrupamento.
+        """
+        meta = {'params': {
+            'n_clusters': self.n_clusters,
+            'n_iterations': self.n_iterations,
+            'strategy': self.strategy,
+            'n_fixed_points': self.n_fixed_points,
+        }}
+        return meta, {'cluster_centers': self.cluster_centers_, 'labels': self.labels_}, {'labels': 'i8'}
+
+    def _restore(self, meta: Dict[str, Any], arrays: Dict[str, Array]):
+        """
+        Restaura o estado desse agrupamento a partir de um arquivo.
+
+        :param meta: os metadados salvos por ``_state``.
+        :param arrays: os vetores salvos por ``_state``.
+        """
+        self.cluster_centers_ = arrays['cluster_centers']
+        self.labels_ = list(arrays['labels'])
+
+    def _assign(self) -> Callable[[Matrix], Iterable[int]]:
+        """
+        Constrói a função utilizada por ``predict_batch`` para encontrar os clusters de um bloco de amostras.
+
+        :return: uma função que recebe um bloco de amostras e retorna os índices dos seus clusters.
+        """
+        centers = self.cluster_centers_
+        if len(centers) >= self._INDEX_MIN_CLUSTERS:
+            if self._index is None:
+                self._index = _CentroidIndex(centers)
+            nearest = self._index.nearest
+            return lambda block: map(nearest, block)
 
-        y = []
-        for sample in X:
-            distances = [(i, euclidean(sample, center)) for i, center in enumerate(self.cluster_centers_)]
-            cluster_label = min(distances, key=lambda x: x[1])[0]
-            if is_vector:
-                return cluster_label
-            y.append(cluster_label)
+        def assign(block: Matrix) -> Iterable[int]:
+            distances, = pairwise_distances(block, centers, chunk_size=len(block))
+            return [row.index(min(row)) for row in distances]
 
-        return y
+        return assign
@@ -3,8 +3,9 @@ import statistics
 from typing import List
 
 from models.classification.mlp.model import MLPClassifier
-from models.classification.utils import split_into_train_test, k_fold, confusion_matrix
-from models.utils.linear_alg import Matrix, Vector, diagonal_sum
+from models.classification.metrics import ClassificationMetrics
+from models.classification.utils import split_into_train_test, k_fold
+from models.utils.linear_alg import Matrix, Vector
 
 
 def main():
@@ -39,11 +40,10 @@ def main():
     print(f'Amostra {sample} é da classe {c_true}, foi classificada como {c_pred}')
 
     # Testa a acurácia do algoritmo para amostras desconhecidas
-    y_pred = clf.predict(X_test)
-    cm = confusion_matrix(y_test, y_pred)
-    accuracy = diagonal_sum(cm) / sum(sum(row) for row in cm)
-
-    print(f'Acurácia do classificador para amostras desconhecidas: {accuracy * 100:.2f}%')
+    metrics = ClassificationMetrics().update(y_test, clf.predict(X_test))
+    print(f'Acurácia do classificador para amostras desconhecidas: {metrics.accuracy * 100:.2f}%')
+    print(f'Precisão: {metrics.precision() * 100:.2f}%, revocação: {metrics.recall() * 100:.2f}%, '
+          f'F1: {metrics.f1() * 100:.2f}%')
 
     # Testa a acurácia do algoritmo para diferentes amostras desconhecidas
     accuracies: List[float] = k_fold(clf, X, y, n_folds=5)
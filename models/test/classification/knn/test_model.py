@@ -1,4 +1,6 @@
+import os
 import random
+import tempfile
 import unittest
 import unittest.mock
 from typing import Sequence
@@ -118,3 +120,34 @@ class ModelTestCase(unittest.TestCase):
                     return_report=True,
                 )
             )
+
+    def test_BestKSearch_Stratified(self):
+        k_fold = unittest.mock.Mock(return_value=[1.0])
+        with unittest.mock.patch('models.classification.utils.k_fold', k_fold):
+            KNearestClassifier.best([[1, 2], [3, 4]], [0, 1], n_folds=2, ks=(1, 2), stratify=True)
+            KNearestClassifier.best([[1, 2], [3, 4]], [0, 1], n_folds=2, ks=(1, 2), groups=['a', 'b'])
+
+        self.assertEqual(4, k_fold.call_count)
+        self.assertTrue(k_fold.call_args_list[0].kwargs['stratify'])
+        self.assertEqual(['a', 'b'], k_fold.call_args_list[-1].kwargs['groups'])
+
+    def test_SaveLoad(self):
+        clf: KNearestClassifier = KNearestClassifier(k=3, metric=chebyshev)
+        self.assertRaises(ValueError, lambda: clf.save('model.mdl'))
+        X = [[6, 0], [8, 0], [7, 0], [5, 11], [5, 7], [8, 10], [6, 11]]
+        y = ['a', 'a', 'a', 'b', 'b', 'b', 'b']
+        clf.fit(X, y)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'knn.mdl')
+            clf.save(path)
+
+            for mmap in (True, False):
+                loaded: KNearestClassifier = KNearestClassifier.load(path, mmap=mmap)
+                self.assertEqual(3, loaded.k)
+                self.assertIs(chebyshev, loaded.metric)
+                samples = [[5, 12], [6.5, 0.5], [8, 0]]
+                self.assertEqual(clf.predict(samples), loaded.predict(samples))
+                self.assertEqual(1, loaded.score(X, y))
+
+            self.assertRaises(ValueError, lambda: KNearestClassifier(metric=lambda a, b: 0).fit(X, y).save(path))
@@ -0,0 +1,124 @@
+import operator
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from models.classification.mlp.frozen import FrozenMLP
+from models.classification.mlp.model import MLPClassifier
+from models.utils.linear_alg import Matrix, Vector
+
+
+class FrozenMLPTestCase(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        self.y: Vector = ['no', 'yes', 'yes', 'no']
+        self.clf: MLPClassifier = MLPClassifier(n_layers=2, layer_size=4, n_generations=500, activation='tanh')
+
+    def test_Freeze(self):
+        self.assertRaises(ValueError, lambda: self.clf.freeze())
+        self.clf.fit(self.X, self.y)
+        frozen: FrozenMLP = self.clf.freeze()
+
+        self.assertEqual((2, 4, 4, 1), frozen.layer_sizes)
+        self.assertEqual(('tanh', 'tanh', 'sigmoid'), frozen.activations)
+        self.assertEqual(('no', 'yes'), frozen.class_map)
+        for sample in self.X:
+            self.assertEqual(self.clf.transform(sample), frozen.transform(sample))
+        self.assertEqual([self.clf.transform(sample) for sample in self.X], frozen.transform_batch(self.X))
+        self.assertEqual(self.clf.predict(self.X), frozen.predict(self.X))
+        self.assertEqual(self.clf.predict([1, 0]), frozen.predict([1, 0]))
+        self.assertRaises(ValueError, lambda: frozen.transform([1, 2, 3]))
+
+        # Treinamentos posteriores não afetam a cópia
+        expected = frozen.transform_batch(self.X)
+        self.clf.fit(self.X, ['no', 'no', 'no', 'yes'])
+        self.assertEqual(expected, frozen.transform_batch(self.X))
+
+    def test_Immutable(self):
+        frozen: FrozenMLP = self.clf.fit(self.X, self.y).freeze()
+
+        def assign():
+            frozen._class_map = ('a', 'b')
+
+        def write():
+            frozen._layers[0][0][0][0] = 1.0
+
+        self.assertRaises(AttributeError, assign)
+        self.assertRaises(TypeError, write)
+        self.assertRaises(AttributeError, lambda: setattr(frozen, 'extra', 1))
+
+    def test_Threads(self):
+        frozen: FrozenMLP = self.clf.fit(self.X, self.y).freeze()
+        samples: Matrix = [[random.random(), random.random()] for _ in range(200)]
+        expected = frozen.transform_batch(samples)
+
+        results = [None] * 8
+
+        def run(i):
+            results[i] = [frozen.transform(sample) for sample in samples]
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for result in results:
+            self.assertEqual(expected, result)
+
+    def test_Precision(self):
+        self.clf.fit(self.X, self.y)
+        self.assertRaises(ValueError, lambda: self.clf.freeze('float16'))
+
+        reference: FrozenMLP = self.clf.freeze()
+        for precision, tolerance in (('float32', 1e-5), ('int8', 0.05)):
+            frozen: FrozenMLP = self.clf.freeze(precision)
+            self.assertEqual(precision, frozen.precision)
+            self.assertLess(frozen.nbytes, reference.nbytes)
+            self.assertEqual(reference.predict(self.X), frozen.predict(self.X))
+            for expected, actual in zip(reference.transform_batch(self.X), frozen.transform_batch(self.X)):
+                self.assertAlmostEqual(expected[0], actual[0], delta=tolerance)
+
+        # 2 * 4 + 4 * 4 + 4 * 1 pesos e 4 + 4 + 1 bias
+        self.assertEqual(28 * 8 + 9 * 8, reference.nbytes)
+        self.assertEqual(28 * 4 + 9 * 4, self.clf.freeze('float32').nbytes)
+        self.assertEqual(28 * 1 + 9 * 4, self.clf.freeze('int8').nbytes)
+
+    def test_SaveLoad(self):
+        self.clf.fit(self.X, self.y)
+        samples: Matrix = [[random.random(), random.random()] for _ in range(20)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'frozen.mdl')
+            for precision in ('float64', 'float32', 'int8'):
+                frozen: FrozenMLP = self.clf.freeze(precision)
+                frozen.save(path)
+                for mmap in (True, False):
+                    loaded: FrozenMLP = FrozenMLP.load(path, mmap=mmap)
+                    self.assertEqual(precision, loaded.precision)
+                    self.assertEqual(frozen.layer_sizes, loaded.layer_sizes)
+                    self.assertEqual(frozen.class_map, loaded.class_map)
+                    self.assertEqual(frozen.transform_batch(samples), loaded.transform_batch(samples))
+                    self.assertRaises(TypeError, lambda: operator.setitem(loaded._layers[0][0][0], 0, 1.0))
+
+            self.assertRaises(ValueError, lambda: MLPClassifier.load(path))
+
+    def test_ComparePrecision(self):
+        self.clf.fit(self.X, self.y)
+        report = self.clf.compare_precision(self.X, self.y)
+
+        self.assertEqual(['float64', 'float32', 'int8'], list(report))
+        self.assertEqual({'agreement': 1.0, 'max_error': 0.0, 'mean_error': 0.0, 'nbytes': 296, 'accuracy': 1.0},
+                         report['float64'])
+        for precision in ('float32', 'int8'):
+            self.assertEqual(1.0, report[precision]['agreement'])
+            self.assertLessEqual(report[precision]['mean_error'], report[precision]['max_error'])
+        self.assertLess(report['float32']['max_error'], report['int8']['max_error'])
+        self.assertNotIn('accuracy', self.clf.compare_precision(self.X, precisions=['int8'])['int8'])
+
+
+if __name__ == '__main__':
+    unittest.main()
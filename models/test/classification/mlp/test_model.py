@@ -1,6 +1,13 @@
+import math
+import os
+import random
+import tempfile
 import unittest
+import unittest.mock
 
 from models.classification.mlp.model import MLPClassifier
+from models.classification.mlp.optimizer import Nesterov, exponential_decay
+from models.utils.checkpoint import load_checkpoint
 from models.utils.linear_alg import Matrix, Vector
 
 
@@ -12,6 +19,17 @@ class ModelTestCase(unittest.TestCase):
         self.assertEqual(10, clf.n_generations)
         self.assertEqual(0.1, clf.learning_rate)
         self.assertIsNone(clf.layers)
+        self.assertIsNone(clf.batch_size)
+        self.assertFalse(clf.shuffle)
+
+        clf = MLPClassifier(n_layers=1, layer_size=3, batch_size=8, shuffle=True)
+        self.assertEqual(8, clf.batch_size)
+        self.assertTrue(clf.shuffle)
+
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, batch_size=0))
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, optimizer='rmsprop'))
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, n_iter_no_change=0))
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, validation_fraction=1.0))
 
     def test_Fit(self):
         clf: MLPClassifier
@@ -21,8 +39,10 @@ class ModelTestCase(unittest.TestCase):
         clf = MLPClassifier(n_layers=3, layer_size=4)
 
         self.assertIsNone(clf.layers)
-        self.assertRaises(ValueError, lambda: clf.fit(X, [0, 1, 1, 2]))
+        clf.fit(X, [0, 1, 1, 2])
+        self.assertListEqual([2, 4, 4, 4, 3], [len(layer) for layer in clf.layers])
 
+        clf = MLPClassifier(n_layers=3, layer_size=4)
         self.assertIsNone(clf.layers)
         clf.fit(X, y)
         self.assertEqual(5, len(clf.layers))
@@ -51,6 +71,24 @@ class ModelTestCase(unittest.TestCase):
         self.assertEqual(4, len(clf.predict(X)))
         self.assertIsInstance(clf.predict([0, 0]), int)
 
+    def test_Layers(self):
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = [0, 1, 1, 1]
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=3, n_generations=10)
+        self.assertRaises(ValueError, lambda: clf.transform([0, 1]))
+
+        clf.fit(X, y)
+        self.assertRaises(ValueError, lambda: clf.transform([0, 1, 1]))
+
+        # Os perceptrons das camadas reproduzem a saída da rede
+        input_layer, hidden_layer, output_layer = clf.layers
+        for sample in X:
+            output = [perceptron.predict([feature]) for perceptron, feature in zip(input_layer, sample)]
+            output = [perceptron.predict(output) for perceptron in hidden_layer]
+            value, = [perceptron.predict(output) for perceptron in output_layer]
+            self.assertAlmostEqual(clf.transform(sample)[0], value)
+
     def test_XorPrediction(self):
         X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
         y: Vector = [0, 1, 1, 1]
@@ -66,6 +104,293 @@ class ModelTestCase(unittest.TestCase):
             error = ((o_true - value) ** 2.0) / 2.0
             self.assertLessEqual(error, 1e-1)
 
+    def test_MiniBatchPrediction(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]] * 4
+        y: Vector = [0, 1, 1, 1] * 4
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4, learning_rate=2.0, n_generations=500,
+                                           batch_size=4, shuffle=True)
+        clf.fit(X, y)
+        self.assertEqual(y, clf.predict(X))
+
+        # O embaralhamento é reprodutível
+        random.seed(1)
+        clf_1 = MLPClassifier(n_layers=1, layer_size=2, n_generations=3, batch_size=3, shuffle=True).fit(X, y)
+        random.seed(1)
+        clf_2 = MLPClassifier(n_layers=1, layer_size=2, n_generations=3, batch_size=3, shuffle=True).fit(X, y)
+        self.assertEqual([p.weights for layer in clf_1.layers for p in layer],
+                         [p.weights for layer in clf_2.layers for p in layer])
+
+    def test_Optimizers(self):
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = [0, 1, 1, 0]
+
+        # Com o Adam, o XOR é aprendido em 10x menos gerações que com a descida de gradiente simples
+        random.seed(0)
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4, learning_rate=0.1, n_generations=100,
+                                           optimizer='adam')
+        clf.fit(X, y)
+        self.assertEqual(y, clf.predict(X))
+
+        random.seed(0)
+        optimizer = Nesterov(0.3, schedule=exponential_decay(0.5, n_steps=1_000))
+        clf = MLPClassifier(n_layers=1, layer_size=4, n_generations=300, batch_size=2, optimizer=optimizer)
+        clf.fit(X, y)
+        self.assertEqual(y, clf.predict(X))
+
+        # O otimizador fornecido não é alterado pelo treinamento
+        self.assertEqual(0, optimizer.n_steps)
+        self.assertEqual([], optimizer.state)
+
+    def test_LossCurve(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = [0, 1, 1, 1]
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4, learning_rate=0.7, n_generations=200)
+        self.assertIsNone(clf.loss_curve_)
+
+        clf.fit(X, y)
+        self.assertEqual(200, len(clf.loss_curve_))
+        self.assertEqual(200, clf.n_generations_)
+        self.assertEqual([], clf.validation_loss_curve_)
+        self.assertLess(clf.loss_curve_[-1], clf.loss_curve_[0])
+        self.assertEqual(min(clf.loss_curve_), clf.best_loss_)
+
+    def test_EarlyStopping(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]] * 5
+        y: Vector = [0, 1, 1, 1] * 5
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4, learning_rate=0.7, n_generations=1_000,
+                                           tol=1e-3, n_iter_no_change=5)
+        clf.fit(X, y)
+        self.assertLess(clf.n_generations_, 1_000)
+        self.assertEqual(clf.n_generations_, len(clf.loss_curve_))
+        self.assertEqual(y, clf.predict(X))
+
+        # Com amostras de validação, os pesos de menor erro de validação são restaurados
+        with unittest.mock.patch('random.sample', lambda population, k: population[:k]):
+            clf = MLPClassifier(n_layers=1, layer_size=4, learning_rate=5.0, n_generations=100,
+                                n_iter_no_change=10, validation_fraction=0.25)
+            clf.fit(X, y)
+
+        self.assertEqual(clf.n_generations_, len(clf.validation_loss_curve_))
+        self.assertEqual(min(clf.validation_loss_curve_), clf.best_loss_)
+        loss = sum((clf.transform(sample)[0] - outcome) ** 2 / 2.0 for sample, outcome in zip(X[:5], y[:5])) / 5
+        self.assertAlmostEqual(clf.best_loss_, loss)
+
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=2, validation_fraction=0.5)
+                          .fit([[0]], [0]))
+
+    def test_SaveLoad(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = ['no', 'yes', 'yes', 'yes']
+
+        clf: MLPClassifier = MLPClassifier(n_layers=2, layer_size=3, n_generations=200, optimizer='adam')
+        self.assertRaises(ValueError, lambda: clf.save('model.mdl'))
+        clf.fit(X, y)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mlp.mdl')
+            clf.save(path)
+
+            self.assertRaises(ValueError, lambda: clf.save(path, precision='int8'))
+            clf.save(path + '.f4', precision='float32')
+            self.assertLess(os.path.getsize(path + '.f4'), os.path.getsize(path))
+            self.assertEqual(clf.predict(X), MLPClassifier.load(path + '.f4').predict(X))
+
+            for mmap in (True, False):
+                loaded: MLPClassifier = MLPClassifier.load(path, mmap=mmap)
+                self.assertEqual((2, 3, 'adam'), (loaded.n_layers, loaded.layer_size, loaded.optimizer))
+                self.assertEqual([len(layer) for layer in clf.layers], [len(layer) for layer in loaded.layers])
+                self.assertEqual(clf.predict(X), loaded.predict(X))
+                for sample in X:
+                    self.assertEqual(clf.transform(sample), loaded.transform(sample))
+
+    def test_DataParallel(self):
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, n_jobs=0))
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, n_jobs=2))
+
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]] * 4
+        y: Vector = [0, 1, 1, 0] * 4
+
+        def fit(n_jobs) -> MLPClassifier:
+            random.seed(0)
+            return MLPClassifier(n_layers=1, layer_size=4, n_generations=20, batch_size=8, shuffle=True,
+                                 optimizer='adam', n_jobs=n_jobs).fit(X, y)
+
+        serial = fit(None)
+        parallel = fit(2)
+
+        # O resultado depende apenas da semente e do número de processos
+        self.assertEqual(parallel.loss_curve_, fit(2).loss_curve_)
+        for expected, actual in zip(serial.loss_curve_, parallel.loss_curve_):
+            self.assertAlmostEqual(expected, actual, places=9)
+        for sample in X[:4]:
+            for expected, actual in zip(serial.transform(sample), parallel.transform(sample)):
+                self.assertAlmostEqual(expected, actual, places=9)
+
+    def test_Activation(self):
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=1, layer_size=3, activation='softmax'))
+        self.assertRaises(ValueError, lambda: MLPClassifier(n_layers=2, layer_size=3, activation=['tanh']))
+
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = [0, 1, 1, 0]
+        clf: MLPClassifier = MLPClassifier(n_layers=2, layer_size=4, n_generations=500, activation=['tanh', 'relu'])
+        clf.fit(X, y)
+        self.assertEqual(y, clf.predict(X))
+
+        # Os perceptrons das camadas utilizam a função de ativação da respectiva camada
+        layer = clf.layers[1]
+        sample = [0.3, 0.9]
+        self.assertAlmostEqual(math.tanh(sum(w * x for w, x in zip(layer[0].weights, sample)) + layer[0].bias),
+                               layer[0].predict(sample))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mlp.mdl')
+            clf.save(path)
+            loaded: MLPClassifier = MLPClassifier.load(path)
+            self.assertEqual(['tanh', 'relu'], loaded.activation)
+            self.assertEqual(clf.predict(X), loaded.predict(X))
+
+    def test_MultiClass(self):
+        random.seed(0)
+        centers = {'a': (0, 0), 'b': (4, 0), 'c': (0, 4), 'd': (4, 4)}
+        X: Matrix = []
+        y: Vector = []
+        for label, (x_0, x_1) in centers.items():
+            for _ in range(10):
+                X.append([random.gauss(x_0, 0.5), random.gauss(x_1, 0.5)])
+                y.append(label)
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=8, n_generations=100, learning_rate=0.1,
+                                           shuffle=True)
+        clf.fit(X, y)
+
+        # A camada de saída possui um neurônio por classe, cujas saídas formam uma distribuição de probabilidade
+        self.assertEqual([2, 8, 4], [len(layer) for layer in clf.layers])
+        values = clf.transform([4, 4])
+        self.assertAlmostEqual(1.0, sum(values))
+        self.assertEqual(3, values.index(max(values)))
+
+        self.assertEqual(['a', 'b', 'c', 'd'], clf.predict([[0, 0], [4, 0], [0, 4], [4, 4]]))
+        self.assertEqual('b', clf.predict([4.2, -0.3]))
+        self.assertLess(clf.loss_curve_[-1], clf.loss_curve_[0])
+        self.assertEqual(clf.predict(X), clf.freeze().predict(X))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mlp.mdl')
+            clf.save(path)
+            self.assertEqual(clf.predict(X), MLPClassifier.load(path).predict(X))
+
+    def test_PartialFit(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = ['no', 'yes', 'yes', 'yes']
+
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4, batch_size=2, optimizer='adam',
+                                           learning_rate=0.05)
+        self.assertRaises(ValueError, lambda: clf.partial_fit(X, y))
+
+        # As amostras da primeira chamada não precisam conter todas as classes
+        clf.partial_fit(X[1:], y[1:], classes=['no', 'yes'])
+        rows = [row for layer in clf.layers[1:] for row in (perceptron.weights for perceptron in layer)]
+        n_steps = clf._optimizer.n_steps
+        self.assertEqual(2, n_steps)
+
+        for _ in range(300):
+            clf.partial_fit(X, y)
+
+        # Os pesos e o estado do otimizador são mantidos entre as chamadas
+        weights = [perceptron.weights for layer in clf.layers[1:] for perceptron in layer]
+        self.assertEqual(rows, weights)
+        self.assertIs(rows[0], clf.layers[1][0].weights)
+        self.assertEqual(n_steps + 300 * 2, clf._optimizer.n_steps)
+        self.assertEqual(301, clf.n_generations_)
+        self.assertEqual(301, len(clf.loss_curve_))
+        self.assertLess(clf.loss_curve_[-1], clf.loss_curve_[1])
+        self.assertEqual(y, clf.predict(X))
+
+        self.assertRaises(ValueError, lambda: clf.partial_fit(X, ['no', 'yes', 'maybe', 'yes']))
+        self.assertRaises(ValueError, lambda: clf.partial_fit(X, y, classes=['no', 'yes', 'maybe']))
+        self.assertRaises(ValueError, lambda: clf.partial_fit([[0, 0, 0]], ['no']))
+        clf.partial_fit(X, y, classes=['yes', 'no'])
+
+        # Um treinamento completo recria a rede
+        clf.fit(X, y)
+        self.assertIsNot(rows[0], clf.layers[1][0].weights)
+
+    def test_PartialFit_Loaded(self):
+        random.seed(0)
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        y: Vector = [0, 1, 2, 1]
+        clf: MLPClassifier = MLPClassifier(n_layers=1, layer_size=4).fit(X, y)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mlp.mdl')
+            clf.save(path)
+
+            loaded: MLPClassifier = MLPClassifier.load(path)
+            for _ in range(5):
+                clf.partial_fit(X, y)
+                loaded.partial_fit(X, y)
+
+            for sample in X:
+                self.assertEqual(clf.transform(sample), loaded.transform(sample))
+            self.assertEqual(5, len(loaded.loss_curve_))
+
+    def test_Checkpoint(self):
+        X: Matrix = [[0, 0], [0, 1], [1, 0], [1, 1]] * 3
+        y: Vector = [0, 1, 1, 0] * 3
+
+        def create(n_generations) -> MLPClassifier:
+            return MLPClassifier(n_layers=1, layer_size=4, n_generations=n_generations, batch_size=3, shuffle=True,
+                                 optimizer='adam', n_iter_no_change=50, validation_fraction=0.25)
+
+        random.seed(0)
+        expected: MLPClassifier = create(20).fit(X, y)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'mlp.ckpt')
+            self.assertRaises(ValueError, lambda: create(20).fit(X, y, checkpoint=path, checkpoint_interval=0))
+
+            # Um treinamento interrompido e retomado produz o mesmo resultado que um treinamento ininterrupto
+            random.seed(0)
+            create(10).fit(X, y, checkpoint=path, checkpoint_interval=4)
+            self.assertEqual(['mlp.ckpt'], os.listdir(directory))
+
+            random.seed(1)
+            resumed: MLPClassifier = create(20).fit(X, y, resume_from=path)
+            self.assertEqual(expected.loss_curve_, resumed.loss_curve_)
+            self.assertEqual(expected.validation_loss_curve_, resumed.validation_loss_curve_)
+            self.assertEqual(expected.best_loss_, resumed.best_loss_)
+            self.assertEqual(20, resumed.n_generations_)
+            for sample in X[:4]:
+                self.assertEqual(expected.transform(sample), resumed.transform(sample))
+
+            # O ponto de controle não é salvo na última geração
+            random.seed(0)
+            create(8).fit(X, y, checkpoint=path, checkpoint_interval=4)
+            self.assertEqual(4, load_checkpoint(path, 'MLPClassifierCheckpoint')[0])
+
+            clf = MLPClassifier(n_layers=1, layer_size=4, optimizer='sgd')
+            self.assertRaises(ValueError, lambda: clf.fit(X, y, resume_from=path))
+
+            # A arquitetura, as funções de ativação e as classes do ponto de controle devem coincidir com as da rede
+            for clf in (MLPClassifier(n_layers=2, layer_size=4, optimizer='adam'),
+                        MLPClassifier(n_layers=1, layer_size=5, optimizer='adam'),
+                        MLPClassifier(n_layers=1, layer_size=4, optimizer='adam', activation='tanh')):
+                self.assertRaises(ValueError, lambda: clf.fit(X, y, resume_from=path))
+            self.assertRaises(ValueError, lambda: create(20).fit(X, [0, 1, 2, 0] * 3, resume_from=path))
+            self.assertRaises(ValueError, lambda: create(20).fit([x + [0] for x in X], y, resume_from=path))
+
+            expected.save(path)
+            self.assertRaises(ValueError, lambda: create(20).fit(X, y, resume_from=path))
+
 
 if __name__ == '__main__':
     unittest.main()
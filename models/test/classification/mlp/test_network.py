@@ -0,0 +1,204 @@
+import math
+import random
+import tracemalloc
+import unittest
+
+from models.classification.mlp.network import Network
+from models.classification.mlp.optimizer import SGD
+from models.classification.mlp.perceptron import Perceptron
+from models.utils.math import sigmoid
+
+
+class NetworkTestCase(unittest.TestCase):
+    def test_Create(self):
+        network: Network = Network.create([3, 4, 2, 1])
+        self.assertEqual([3, 4, 2, 1], network.layer_sizes)
+        self.assertEqual([4, 2, 1], [len(W) for W in network.weights])
+        self.assertEqual([3, 4, 2], [len(W[0]) for W in network.weights])
+        self.assertEqual([[0.0] * 4, [0.0] * 2, [0.0]], network.biases)
+
+        self.assertRaises(ValueError, lambda: Network.create([3]))
+
+    def test_Init(self):
+        network: Network = Network.create([2, 3, 1])
+        self.assertEqual(3 + 1 + 2, len(network.parameters))
+        self.assertIs(network.weights[1][0], network.parameters[3])
+        self.assertIs(network.biases[0], network.parameters[4])
+        self.assertEqual([len(vector) for vector in network.parameters], [len(vector) for vector in network.gradients])
+        self.assertIs(network.grad_biases[1], network.gradients[5])
+
+        self.assertRaises(ValueError, lambda: Network([[[1.0, 2.0]]], []))
+        self.assertRaises(ValueError, lambda: Network([[[1.0, 2.0]]], [[0.0, 0.0]]))
+        self.assertRaises(ValueError, lambda: Network([[[1.0], [2.0]], [[1.0]]], [[0.0, 0.0], [0.0]]))
+
+    def test_Forward(self):
+        network: Network = Network([[[1.0, 2.0], [-1.0, 0.5]], [[0.3, -0.2]]], [[0.1, 0.0], [0.5]])
+        output = network.forward([0.5, -1.0])
+        self.assertEqual(1, len(output))
+
+        hidden = [Perceptron(input_size=2, bias=0.1, weights=[1.0, 2.0]),
+                  Perceptron(input_size=2, bias=0.0, weights=[-1.0, 0.5])]
+        a_1 = [perceptron.predict([0.5, -1.0]) for perceptron in hidden]
+        self.assertAlmostEqual(Perceptron(input_size=2, bias=0.5, weights=[0.3, -0.2]).predict(a_1), output[0])
+
+        # A saída é escrita em um buffer reutilizado
+        self.assertIs(output, network.forward([0.0, 0.0]))
+
+    def test_Backward(self):
+        network: Network = Network([[[0.5]], [[2.0]]], [[0.0], [0.0]])
+        a_2, = network.forward([1.0])
+        network.backward([1.0])
+        a_1 = sigmoid(0.5)
+
+        δ_2 = (a_2 - 1.0) * a_2 * (1.0 - a_2)
+        δ_1 = 2.0 * δ_2 * a_1 * (1.0 - a_1)
+        network.accumulate()
+        self.assertAlmostEqual(δ_1 * 1.0, network.grad_weights[0][0][0])
+        self.assertAlmostEqual(δ_1, network.grad_biases[0][0])
+        self.assertAlmostEqual(δ_2 * a_1, network.grad_weights[1][0][0])
+        self.assertAlmostEqual(δ_2, network.grad_biases[1][0])
+
+    def test_GradientCheck(self):
+        for activations in (None, ['tanh', 'relu', 'sigmoid'], ['relu', 'sigmoid', 'softmax']):
+            with self.subTest(activations=activations):
+                self._check_gradients(activations)
+
+    def test_GradientCheck_CrossEntropy(self):
+        for output in ('sigmoid', 'softmax'):
+            with self.subTest(output=output):
+                self._check_gradients(['tanh', 'relu', output], 'cross_entropy')
+
+    def _check_gradients(self, activations, loss_function='squared_error'):
+        random.seed(0)
+        network: Network = Network.create([3, 6, 5, 2], activations, loss_function)
+        sample = [0.3, -0.7, 1.1]
+        target = [1.0, 0.0]
+
+        def error() -> float:
+            network.forward(sample)
+            return network.loss(target)
+
+        network.forward(sample)
+        network.backward(target)
+        network.accumulate()
+
+        # Cada gradiente obtido a partir dos termos de erro deve coincidir com a derivada numérica
+        ε = 1e-6
+        parameters = [(W[j], i, G[j]) for W, G in zip(network.weights, network.grad_weights)
+                      for j in range(len(W)) for i in range(len(W[j]))]
+        parameters += [(b, j, g) for b, g in zip(network.biases, network.grad_biases) for j in range(len(b))]
+        for values, i, gradients in parameters:
+            value = values[i]
+            values[i] = value + ε
+            e_plus = error()
+            values[i] = value - ε
+            e_minus = error()
+            values[i] = value
+
+            self.assertAlmostEqual((e_plus - e_minus) / (2 * ε), gradients[i], places=6)
+
+    def test_Activations(self):
+        self.assertEqual(['sigmoid', 'sigmoid'], Network.create([2, 3, 1]).activations)
+        self.assertRaises(ValueError, lambda: Network.create([2, 3, 1], ['tanh']))
+        self.assertRaises(ValueError, lambda: Network.create([2, 3, 1], ['tanh', 'linear']))
+        self.assertRaises(ValueError, lambda: Network.create([2, 3, 1], ['tanh', 'tanh'], 'cross_entropy'))
+        self.assertRaises(ValueError, lambda: Network.create([2, 3, 1], None, 'hinge'))
+
+        network: Network = Network([[[1.0, -1.0]], [[2.0]]], [[0.0], [-1.0]], ['relu', 'tanh'])
+        self.assertEqual([math.tanh(-1.0)], network.forward([1.0, 3.0]))
+        self.assertEqual([math.tanh(3.0)], network.forward([3.0, 1.0]))
+
+    def test_CrossEntropy(self):
+        network: Network = Network([[[1.0, 0.0], [0.0, 1.0]]], [[0.0, 0.0]], ['softmax'], 'cross_entropy')
+        self.assertEqual([0.5, 0.5], network.forward([2.0, 2.0]))
+        self.assertAlmostEqual(math.log(2), network.loss([1.0, 0.0]))
+
+        # Saídas nulas não causam erro de domínio
+        network.forward([-1e6, 0.0])
+        self.assertGreater(network.loss([1.0, 0.0]), 30)
+
+        network = Network([[[1.0]]], [[0.0]], ['sigmoid'], 'cross_entropy')
+        network.forward([0.0])
+        self.assertAlmostEqual(math.log(2), network.loss([1.0]))
+        self.assertAlmostEqual(math.log(2), network.loss([0.0]))
+
+    def test_Extremes(self):
+        # Entradas extremas não causam `OverflowError`
+        network = Network([[[1.0]]], [[0.0]])
+        self.assertEqual([0.0], network.forward([-1e6]))
+
+    def test_Update(self):
+        network: Network = Network.create([2, 3, 1])
+        rows = [row for W in network.weights for row in W]
+
+        def error() -> float:
+            return (network.forward([1.0, 0.5])[0] - 1.0) ** 2
+
+        previous_error = error()
+        for _ in range(10):
+            network.forward([1.0, 0.5])
+            network.backward([1.0])
+            network.update(0.5)
+
+        self.assertLess(error(), previous_error)
+
+        # As linhas das matrizes são atualizadas no lugar
+        self.assertTrue(all(a is b for a, b in zip(rows, (row for W in network.weights for row in W))))
+
+    def test_AccumulateUpdate(self):
+        network: Network = Network.create([2, 3, 1])
+        other: Network = Network([[list(row) for row in W] for W in network.weights],
+                                 [list(b) for b in network.biases])
+        self.assertEqual([[[0.0] * 2] * 3, [[0.0] * 3]], other.grad_weights)
+        self.assertEqual([[0.0] * 3, [0.0]], other.grad_biases)
+
+        # Aplicar os gradientes acumulados de uma amostra equivale a atualizar a rede com essa amostra
+        network.forward([1.0, 0.5])
+        network.backward([1.0])
+        network.update(0.5)
+
+        other.forward([1.0, 0.5])
+        other.backward([1.0])
+        other.accumulate()
+        SGD(0.5).step(other.parameters, other.gradients)
+        other.reset_gradients()
+
+        for W_1, W_2 in zip(network.weights, other.weights):
+            for row_1, row_2 in zip(W_1, W_2):
+                for w_1, w_2 in zip(row_1, row_2):
+                    self.assertAlmostEqual(w_1, w_2)
+
+        for b_1, b_2 in zip(network.biases, other.biases):
+            for bias_1, bias_2 in zip(b_1, b_2):
+                self.assertAlmostEqual(bias_1, bias_2)
+
+        # Os acumuladores são zerados após a atualização
+        self.assertEqual([[[0.0] * 2] * 3, [[0.0] * 3]], other.grad_weights)
+        self.assertEqual([[0.0] * 3, [0.0]], other.grad_biases)
+
+    def test_Allocations(self):
+        random.seed(0)
+        network: Network = Network.create([20, 50, 50, 1])
+        sample = [random.random() for _ in range(20)]
+
+        def train():
+            network.forward(sample)
+            network.backward([1.0])
+            network.update(0.1)
+            network.accumulate()
+
+        train()
+        tracemalloc.start()
+        try:
+            for _ in range(50):
+                train()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # A rede possui mais de 3500 pesos, mas o treinamento não aloca memória proporcional a eles
+        self.assertLess(peak, 8 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
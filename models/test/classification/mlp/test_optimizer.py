@@ -0,0 +1,87 @@
+import math
+import unittest
+from typing import List
+
+from models.classification.mlp.optimizer import SGD, Momentum, Nesterov, Adam, Optimizer, constant, \
+    inverse_scaling, exponential_decay
+from models.utils.linear_alg import Vector
+
+
+class OptimizerTestCase(unittest.TestCase):
+    @staticmethod
+    def _minimize(optimizer: Optimizer, n_steps: int) -> List[Vector]:
+        # Minimiza f(x, y) = (x - 3)² + 10 * (y + 1)²
+        parameters: List[Vector] = [[0.0], [0.0]]
+        for _ in range(n_steps):
+            (x,), (y,) = parameters
+            optimizer.step(parameters, [[2 * (x - 3)], [20 * (y + 1)]])
+        return parameters
+
+    def test_Schedules(self):
+        self.assertEqual(1.0, constant()(10))
+        self.assertEqual(0.5, inverse_scaling()(4))
+        self.assertEqual(0.25, inverse_scaling(power=1)(4))
+        self.assertEqual(1.0, exponential_decay(0.5)(1))
+        self.assertEqual(0.25, exponential_decay(0.5)(3))
+        self.assertEqual(0.5, exponential_decay(0.5, n_steps=2)(3))
+        self.assertRaises(ValueError, lambda: inverse_scaling(-1))
+        self.assertRaises(ValueError, lambda: exponential_decay(0))
+        self.assertRaises(ValueError, lambda: exponential_decay(0.5, n_steps=0))
+
+    def test_Init(self):
+        self.assertRaises(ValueError, lambda: SGD(0))
+        self.assertRaises(ValueError, lambda: Momentum(momentum=1))
+        self.assertRaises(ValueError, lambda: Nesterov(momentum=-0.1))
+        self.assertRaises(ValueError, lambda: Adam(beta_1=1))
+        self.assertRaises(ValueError, lambda: Adam(beta_2=-1))
+
+        # Otimizadores que não implementam a regra de atualização não podem ser criados
+        self.assertRaises(TypeError, lambda: Optimizer())
+        self.assertRaises(TypeError, lambda: type('Incomplete', (Optimizer,), {})())
+
+    def test_SGD(self):
+        optimizer: SGD = SGD(0.5, schedule=inverse_scaling(power=1))
+        parameters: List[Vector] = [[1.0, 2.0], [3.0]]
+        optimizer.step(parameters, [[1.0, -1.0], [2.0]], scale=0.5)
+        self.assertEqual([[0.75, 2.25], [2.5]], parameters)
+        self.assertEqual(1, optimizer.n_steps)
+        self.assertEqual([], optimizer.state)
+
+        optimizer.step(parameters, [[1.0, -1.0], [2.0]])
+        self.assertEqual([[0.5, 2.5], [2.0]], parameters)
+
+    def test_Momentum(self):
+        optimizer: Momentum = Momentum(0.1, momentum=0.5)
+        parameters: List[Vector] = [[1.0]]
+        optimizer.step(parameters, [[1.0]])
+        self.assertAlmostEqual(0.9, parameters[0][0])
+        optimizer.step(parameters, [[1.0]])
+        # v = 0.5 * -0.1 - 0.1
+        self.assertAlmostEqual(0.75, parameters[0][0])
+        self.assertAlmostEqual(-0.15, optimizer.state[0][0][0])
+
+    def test_Nesterov(self):
+        optimizer: Nesterov = Nesterov(0.1, momentum=0.5)
+        parameters: List[Vector] = [[1.0]]
+        optimizer.step(parameters, [[1.0]])
+        # v = -0.1, w = 1 + 0.5 * -0.1 - 0.1
+        self.assertAlmostEqual(0.85, parameters[0][0])
+
+    def test_Adam(self):
+        optimizer: Adam = Adam(0.1)
+        parameters: List[Vector] = [[1.0, 1.0]]
+        optimizer.step(parameters, [[4.0, -0.01]])
+
+        # Na primeira atualização, cada parâmetro varia aproximadamente a taxa de aprendizado
+        self.assertAlmostEqual(0.9, parameters[0][0])
+        self.assertAlmostEqual(1.1, parameters[0][1], places=5)
+        self.assertEqual(2, len(optimizer.state))
+
+    def test_Convergence(self):
+        for optimizer in (SGD(0.04), Momentum(0.02), Nesterov(0.02), Adam(0.3, schedule=inverse_scaling(0.5))):
+            (x,), (y,) = self._minimize(optimizer, 300)
+            self.assertLess(math.hypot(x - 3, y + 1), 1e-2, type(optimizer).__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import array
+import random
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+from models.classification.mlp.network import Network
+from models.classification.mlp.parallel import DataParallelTrainer, _attach
+from models.utils.linear_alg import Matrix
+
+
+class DataParallelTrainerTestCase(unittest.TestCase):
+    def test_Accumulate(self):
+        random.seed(0)
+        X: Matrix = [[random.random() for _ in range(3)] for _ in range(7)]
+        targets: Matrix = [[float(i % 2)] for i in range(7)]
+
+        network = Network.create([3, 4, 1])
+        expected_loss = 0.0
+        for sample, target in zip(X, targets):
+            network.forward(sample)
+            expected_loss += network.loss(target)
+            network.backward(target)
+            network.accumulate()
+        expected = [list(gradient) for gradient in network.gradients]
+        network.reset_gradients()
+
+        self.assertRaises(ValueError, lambda: DataParallelTrainer(network, X, targets, 0))
+
+        with DataParallelTrainer(network, X, targets, 3) as trainer:
+            loss = trainer.accumulate(list(range(7)))
+
+        self.assertAlmostEqual(expected_loss, loss)
+        for expected_gradient, gradient in zip(expected, network.gradients):
+            for e, g in zip(expected_gradient, gradient):
+                self.assertAlmostEqual(e, g)
+
+        self.assertRaises(ValueError, lambda: trainer.accumulate([0]))
+
+    def test_Detach(self):
+        network = Network.create([2, 1])
+        size = 3 * array.array('d').itemsize
+        parameters = SharedMemory(create=True, size=size)
+        gradients = SharedMemory(create=True, size=size)
+        try:
+            state = {'layer_sizes': network.layer_sizes, 'activations': network.activations,
+                     'loss_function': network.loss_function, 'parameters_name': parameters.name,
+                     'gradients_name': gradients.name}
+            _attach(state)
+            self.assertEqual(3, len(state['parameters']))
+
+            state['detach']()
+            self.assertRaises(ValueError, lambda: state['parameters'][0])
+            for shared_memory in state['shared_memory']:
+                self.assertIsNone(shared_memory.buf)
+        finally:
+            for shared_memory in (parameters, gradients):
+                shared_memory.close()
+                shared_memory.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
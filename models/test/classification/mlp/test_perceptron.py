@@ -2,7 +2,7 @@ import unittest
 
 from models.classification.mlp.gradient import Gradient
 from models.classification.mlp.perceptron import Perceptron, InputPerceptron, UpdatingPerceptron
-from models.utils.math import sigmoid
+from models.utils.math import sigmoid, relu
 
 
 class PerceptronTestCase(unittest.TestCase):
@@ -30,6 +30,12 @@ class PerceptronTestCase(unittest.TestCase):
         self.assertEqual(0.5, perceptron.transform(0))
         self.assertEqual(1.0, perceptron.transform(float('+inf')))
 
+    def test_Activation(self):
+        perceptron: Perceptron = Perceptron(input_size=2, bias=-1.0, weights=[1.0, 1.0], activation=relu)
+        self.assertEqual(0.0, perceptron.predict([0.2, 0.3]))
+        self.assertEqual(1.5, perceptron.predict([1.0, 1.5]))
+        self.assertIs(relu, UpdatingPerceptron(perceptron).activation)
+
     def test_Update(self):
         perceptron: Perceptron = Perceptron(input_size=4, bias=1e+2, weights=[1.0, 2.0, 3.0, 4.0])
         self.assertListEqual([1.0, 2.0, 3.0, 4.0], perceptron.weights)
@@ -0,0 +1,63 @@
+import pickle
+import unittest
+
+from models.classification.metrics import ClassificationMetrics
+from models.classification.utils import confusion_matrix
+
+
+class MetricsTestCase(unittest.TestCase):
+    y_true = ['a', 'a', 'a', 'b', 'b', 'c', 'c', 'c', 'c', 'a']
+    y_pred = ['a', 'b', 'a', 'b', 'c', 'c', 'c', 'a', 'c', 'a']
+
+    def test_Update(self):
+        metrics = ClassificationMetrics().update(self.y_true, self.y_pred)
+        self.assertEqual(['a', 'b', 'c'], metrics.classes)
+        self.assertEqual(10, metrics.n_samples)
+        self.assertEqual([[3, 1, 0],
+                          [0, 1, 1],
+                          [1, 0, 3]], metrics.confusion_matrix)
+        self.assertRaises(ValueError, lambda: metrics.update(['a'], []))
+
+        matrix, classes = confusion_matrix(self.y_true, self.y_pred, return_classes=True)
+        for i, true_value in enumerate(classes):
+            for j, pred_value in enumerate(classes):
+                k, m = metrics.classes.index(true_value), metrics.classes.index(pred_value)
+                self.assertEqual(matrix[i][j], metrics.confusion_matrix[k][m])
+
+    def test_Classes(self):
+        metrics = ClassificationMetrics(classes=['c', 'b', 'a', 'd'])
+        self.assertRaises(ValueError, lambda: metrics.accuracy)
+        self.assertRaises(ValueError, lambda: ClassificationMetrics().precision())
+
+        metrics.update(self.y_true, self.y_pred)
+        self.assertEqual(['c', 'b', 'a', 'd'], metrics.classes)
+        self.assertEqual([0, 0, 0, 0], metrics.confusion_matrix[3])
+        self.assertEqual(0.0, metrics.recall('d'))
+
+    def test_Scores(self):
+        metrics = ClassificationMetrics().update(self.y_true, self.y_pred)
+        self.assertAlmostEqual(0.7, metrics.accuracy)
+        self.assertAlmostEqual(0.75, metrics.precision('a'))
+        self.assertAlmostEqual(0.5, metrics.precision('b'))
+        self.assertAlmostEqual(0.75, metrics.recall('a'))
+        self.assertAlmostEqual(0.5, metrics.recall('b'))
+        self.assertAlmostEqual(0.75, metrics.f1('c'))
+        self.assertAlmostEqual((0.75 + 0.5 + 0.75) / 3, metrics.precision())
+        self.assertAlmostEqual((0.75 + 0.5 + 0.75) / 3, metrics.f1())
+
+    def test_Merge(self):
+        whole = ClassificationMetrics().update(self.y_true, self.y_pred)
+
+        chunks = [ClassificationMetrics().update(self.y_true[i:i + 3], self.y_pred[i:i + 3]) for i in range(0, 10, 3)]
+        merged = ClassificationMetrics()
+        for chunk in chunks:
+            merged.merge(pickle.loads(pickle.dumps(chunk)))
+
+        self.assertEqual(whole.classes, merged.classes)
+        self.assertEqual(whole.confusion_matrix, merged.confusion_matrix)
+        self.assertEqual(whole.f1(), merged.f1())
+
+        streamed = ClassificationMetrics()
+        for i in range(0, 10, 4):
+            streamed.update(self.y_true[i:i + 4], self.y_pred[i:i + 4])
+        self.assertEqual(whole.confusion_matrix, streamed.confusion_matrix)
@@ -0,0 +1,178 @@
+import functools
+import math
+import os
+import random
+import tempfile
+import unittest
+from typing import List
+
+from models.classification.knn.model import KNearestClassifier
+from models.classification.search import grid_search, random_search, fingerprint, accuracy
+from models.clustering.kmeans.model import KMeans
+from models.utils.linear_alg import Matrix, Vector
+
+
+class _CountingClassifier(KNearestClassifier):
+    fitted: List[int] = []
+
+    def fit(self, X: Matrix, y: Vector) -> '_CountingClassifier':
+        _CountingClassifier.fitted.append(self.k)
+        return super().fit(X, y)
+
+
+def _inertia(clf: KMeans, X: Matrix, _) -> float:
+    return -sum(math.dist(x, clf.cluster_centers_[label]) for x, label in zip(X, clf.predict(X)))
+
+
+def _constant(clf, X: Matrix, y: Vector) -> float:
+    return 1.0
+
+
+class SearchTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.X = [[rng.random(), rng.random()] for _ in range(40)]
+        self.y = [int(x0 > x1) for x0, x1 in self.X]
+
+    def test_Fingerprint(self):
+        self.assertEqual(fingerprint(self.X, self.y), fingerprint([list(x) for x in self.X], list(self.y)))
+        self.assertNotEqual(fingerprint(self.X, self.y), fingerprint(self.X))
+        self.assertNotEqual(fingerprint(self.X), fingerprint(self.X[1:]))
+
+    def test_GridSearch(self):
+        self.assertRaises(ValueError, lambda: grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': []}))
+        self.assertRaises(ValueError, lambda: grid_search(KNearestClassifier, self.X, param_grid={'k': [1]}))
+
+        best, report = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1, 3, 39]}, n_folds=4,
+                                   return_report=True)
+        self.assertEqual([{'k': 1}, {'k': 3}, {'k': 39}], [params for params, _ in report])
+        self.assertEqual(max(report, key=lambda item: item[1])[0], best)
+        self.assertLess(report[2][1], report[0][1])
+
+    def test_GridSearch_Parallel(self):
+        random.seed(0)
+        serial = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1, 3, 5]}, return_report=True)
+        random.seed(0)
+        parallel = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1, 3, 5]}, n_jobs=2,
+                               return_report=True)
+        self.assertEqual(serial, parallel)
+
+    def test_GridSearch_Cache(self):
+        with tempfile.TemporaryDirectory() as cache:
+            _CountingClassifier.fitted = []
+            random.seed(0)
+            first = grid_search(_CountingClassifier, self.X, self.y, param_grid={'k': [1, 3]}, n_folds=3, cache=cache,
+                                return_report=True)
+            self.assertEqual([1, 1, 1, 3, 3, 3], _CountingClassifier.fitted)
+            self.assertEqual(6, len(os.listdir(cache)))
+
+            _CountingClassifier.fitted = []
+            random.seed(0)
+            widened = grid_search(_CountingClassifier, self.X, self.y, param_grid={'k': [1, 3, 5]}, n_folds=3,
+                                  cache=cache, return_report=True)
+            self.assertEqual([5, 5, 5], _CountingClassifier.fitted)
+            self.assertEqual(first[1], widened[1][:2])
+
+            # Outros dados não reaproveitam o cache
+            _CountingClassifier.fitted = []
+            random.seed(0)
+            grid_search(_CountingClassifier, self.X, [1 - c for c in self.y], param_grid={'k': [1]}, n_folds=3,
+                        cache=cache)
+            self.assertEqual([1, 1, 1], _CountingClassifier.fitted)
+
+    def test_GridSearch_CacheKeys(self):
+        with tempfile.TemporaryDirectory() as cache:
+            for expected in (1.0, 2.0):
+                random.seed(0)
+                _, report = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2,
+                                        scoring=lambda clf, X, y: expected, cache=cache, return_report=True)
+                self.assertEqual(expected, report[0][1])
+
+            # Funções aninhadas com o mesmo nome, mas com valores capturados diferentes, também são distinguidas
+            def constant(value):
+                def scoring(clf, X, y):
+                    return value
+                return scoring
+
+            for expected in (3.0, 4.0):
+                random.seed(0)
+                _, report = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2,
+                                        scoring=constant(expected), cache=cache, return_report=True)
+                self.assertEqual(expected, report[0][1])
+
+            self.assertEqual(8, len(os.listdir(cache)))
+
+            # Valores identificados por endereços de memória não utilizam o cache, mas mantêm o resultado
+            random.seed(0)
+            first = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1, 3]},
+                                scoring=functools.partial(accuracy), cache=cache, return_report=True)
+            self.assertEqual(8, len(os.listdir(cache)))
+
+            random.seed(0)
+            second = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1, 3]},
+                                 scoring=functools.partial(accuracy), return_report=True)
+            self.assertEqual(first[1], second[1])
+
+    def test_GridSearch_CacheCode(self):
+        with tempfile.TemporaryDirectory() as cache:
+            random.seed(0)
+            _, report = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2,
+                                    scoring=_constant, cache=cache, return_report=True)
+            self.assertEqual(1.0, report[0][1])
+
+            # Alterar o corpo de uma função definida no nível do módulo invalida o cache
+            code = _constant.__code__
+            _constant.__code__ = (lambda clf, X, y: 2.0).__code__
+            try:
+                random.seed(0)
+                _, report = grid_search(KNearestClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2,
+                                        scoring=_constant, cache=cache, return_report=True)
+                self.assertEqual(2.0, report[0][1])
+            finally:
+                _constant.__code__ = code
+
+            # Assim como alterar um método do estimador
+            _CountingClassifier.fitted = []
+            random.seed(0)
+            grid_search(_CountingClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2, cache=cache)
+            self.assertEqual([1, 1], _CountingClassifier.fitted)
+
+            predict = KNearestClassifier.predict
+            KNearestClassifier.predict = lambda clf, X: [0] * len(X)
+            try:
+                _CountingClassifier.fitted = []
+                random.seed(0)
+                grid_search(_CountingClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2, cache=cache)
+                self.assertEqual([1, 1], _CountingClassifier.fitted)
+            finally:
+                KNearestClassifier.predict = predict
+
+            _CountingClassifier.fitted = []
+            random.seed(0)
+            grid_search(_CountingClassifier, self.X, self.y, param_grid={'k': [1]}, n_folds=2, cache=cache)
+            self.assertEqual([], _CountingClassifier.fitted)
+
+    def test_RandomSearch(self):
+        self.assertRaises(ValueError, lambda: random_search(KMeans, self.X, param_distributions={}, n_iter=0,
+                                                            scoring=_inertia))
+
+        random.seed(0)
+        best, report = random_search(
+            KMeans,
+            self.X,
+            param_distributions={'n_clusters': [1, 4], 'n_iterations': lambda: random.randint(5, 10)},
+            n_iter=4,
+            n_folds=2,
+            scoring=_inertia,
+            return_report=True,
+        )
+        self.assertEqual(4, len(report))
+        for params, _ in report:
+            self.assertIn(params['n_clusters'], (1, 4))
+            self.assertTrue(5 <= params['n_iterations'] <= 10)
+
+        self.assertEqual(4, best['n_clusters'])
+
+
+if __name__ == '__main__':
+    unittest.main()
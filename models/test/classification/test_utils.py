@@ -1,8 +1,11 @@
+import random
 import unittest
 import unittest.mock
 from typing import List, Sequence
 
-from models.classification.utils import split_into_train_test, confusion_matrix, k_fold
+from models.classification.knn.model import KNearestClassifier
+from models.classification.utils import split_into_train_test, confusion_matrix, k_fold, fold_indices, \
+    train_test_indices, stratified_fold_indices, group_fold_indices, cross_validation_indices
 from models.utils.linear_alg import Vector, Matrix
 
 
@@ -61,6 +64,59 @@ class UtilsTestCase(unittest.TestCase):
             self.assertEqual([[7, 8, 9]], X_test)
             self.assertEqual([2], y_test)
 
+    def test_TrainTestIndices(self):
+        train, test = train_test_indices(10, test_sampling=0.3)
+        self.assertEqual(7, len(train))
+        self.assertEqual(3, len(test))
+        self.assertEqual(list(range(10)), sorted(train + test))
+
+    def test_FoldIndices(self):
+        self.assertRaises(ValueError, lambda: fold_indices(5, 1))
+        self.assertRaises(ValueError, lambda: fold_indices(2, 3))
+
+        folds = list(fold_indices(10, 3))
+        self.assertEqual(3, len(folds))
+        self.assertEqual([4, 3, 3], [len(test) for _, test in folds])
+        self.assertEqual(list(range(10)), sorted(i for _, test in folds for i in test))
+        for train, test in folds:
+            self.assertEqual(list(range(10)), sorted(train + test))
+
+    def test_StratifiedFoldIndices(self):
+        self.assertRaises(ValueError, lambda: stratified_fold_indices([0, 1], 3))
+
+        y = [0] * 12 + [1] * 6 + [2] * 3
+        folds = list(stratified_fold_indices(y, 3))
+        self.assertEqual([7, 7, 7], [len(test) for _, test in folds])
+        self.assertEqual(list(range(len(y))), sorted(i for _, test in folds for i in test))
+        for train, test in folds:
+            self.assertEqual([4, 2, 1], [sum(1 for i in test if y[i] == c) for c in (0, 1, 2)])
+            self.assertEqual(list(range(len(y))), sorted(train + test))
+
+    def test_GroupFoldIndices(self):
+        self.assertRaises(ValueError, lambda: group_fold_indices(['a', 'a', 'b'], 3))
+
+        groups = ['a', 'a', 'a', 'a', 'b', 'b', 'c', 'c', 'd', 'd', 'e']
+        folds = list(group_fold_indices(groups, 3))
+        self.assertEqual([4, 4, 3], sorted((len(test) for _, test in folds), reverse=True))
+        self.assertEqual(list(range(len(groups))), sorted(i for _, test in folds for i in test))
+        for train, test in folds:
+            self.assertFalse({groups[i] for i in train} & {groups[i] for i in test})
+
+    def test_CrossValidationIndices(self):
+        y = [0, 0, 0, 0, 1, 1]
+        self.assertRaises(ValueError, lambda: cross_validation_indices(6, 2, y, stratify=True, groups=y))
+        self.assertRaises(ValueError, lambda: cross_validation_indices(6, 2, stratify=True))
+        self.assertRaises(ValueError, lambda: cross_validation_indices(6, 2, groups=[0, 1]))
+
+        for train, test in cross_validation_indices(6, 2, y, stratify=True):
+            self.assertEqual([2, 1], [sum(1 for i in test if y[i] == c) for c in (0, 1)])
+
+        groups = [0, 0, 1, 1, 2, 2]
+        for train, test in cross_validation_indices(6, 3, y, groups=groups):
+            self.assertEqual(1, len({groups[i] for i in test}))
+
+        self.assertEqual(3, len(list(cross_validation_indices(6, 3))))
+
     def test_ConfusionMatrix(self):
         self.assertEqual(
             [[1, 1],
@@ -114,6 +170,20 @@ class UtilsTestCase(unittest.TestCase):
                 return_classes=True
             )
         )
+        self.assertRaises(ValueError, lambda: confusion_matrix([0, 1, 2], [0, 1, 1], n_classes=2))
+
+    def test_ConfusionMatrix_ManyClasses(self):
+        y_true = ['a', 'b', 'c', 'd', 'a', 'b', 'c', 'd', 'a']
+        y_pred = ['a', 'c', 'c', 'a', 'a', 'b', 'd', 'd', 'b']
+        matrix, classes = confusion_matrix(y_true, y_pred, return_classes=True)
+
+        self.assertEqual({'a', 'b', 'c', 'd'}, set(classes))
+        for i, true_value in enumerate(classes):
+            for j, pred_value in enumerate(classes):
+                expected = sum(1 for t, p in zip(y_true, y_pred) if t == true_value and p == pred_value)
+                self.assertEqual(expected, matrix[i][j])
+
+        self.assertEqual(len(y_true), sum(map(sum, matrix)))
 
     def test_KFold(self):
         clf = _MockClassifier.empty()
@@ -170,3 +240,35 @@ class UtilsTestCase(unittest.TestCase):
                     n_folds=3,
                 ),
             )
+
+    def test_KFold_Parallel(self):
+        rng = random.Random(0)
+        X = [[rng.random(), rng.random()] for _ in range(40)]
+        y = [int(x0 + x1 > 1) for x0, x1 in X]
+        self.assertRaises(ValueError, lambda: k_fold(KNearestClassifier(k=3), X, y, n_jobs=0))
+
+        random.seed(1)
+        serial = k_fold(KNearestClassifier(k=3), X, y, n_folds=4)
+        state = random.getstate()
+
+        random.seed(1)
+        parallel = k_fold(KNearestClassifier(k=3), X, y, n_folds=4, n_jobs=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(state, random.getstate())
+
+    def test_KFold_Stratified(self):
+        X = [[i] for i in range(12)]
+        y = [0] * 8 + [1] * 4
+        self.assertRaises(ValueError, lambda: k_fold(KNearestClassifier(k=1), X, y, stratify=True, groups=y))
+        self.assertRaises(ValueError, lambda: k_fold(KNearestClassifier(k=1), X, y, groups=[0, 1]))
+
+        clf = unittest.mock.Mock()
+        clf.predict.side_effect = lambda X_test: [0] * len(X_test)
+        self.assertEqual([2 / 3] * 4, k_fold(clf, X, y, n_folds=4, stratify=True))
+        for call in clf.fit.call_args_list:
+            self.assertEqual([0] * 6 + [1] * 3, sorted(call.args[1]))
+
+        groups = [i // 3 for i in range(12)]
+        k_fold(clf, X, y, n_folds=4, groups=groups)
+        for call in clf.predict.call_args_list[4:]:
+            self.assertEqual(1, len({groups[x] for x, in call.args[0]}))
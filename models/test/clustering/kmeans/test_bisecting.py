@@ -0,0 +1,83 @@
+import collections
+import os
+import random
+import tempfile
+import unittest
+
+from models.clustering.kmeans.bisecting import BisectingKMeans
+from models.clustering.kmeans.model import KMeans
+from models.utils.linear_alg import Matrix
+
+
+class BisectingKMeansTestCase(unittest.TestCase):
+    @staticmethod
+    def _blobs(centers: Matrix, n_samples: int, seed: int = 0) -> Matrix:
+        rng = random.Random(seed)
+        return [[rng.gauss(x, 0.5), rng.gauss(y, 0.5)] for x, y in centers for _ in range(n_samples)]
+
+    def test_Init(self):
+        self.assertRaises(ValueError, lambda: BisectingKMeans(strategy=''))
+        self.assertRaises(ValueError, lambda: BisectingKMeans(n_trials=0))
+        self.assertIsNone(BisectingKMeans().root_)
+
+    def test_Fit(self):
+        random.seed(0)
+        centers: Matrix = [[0, 0], [20, 0], [0, 20], [20, 20]]
+        X: Matrix = self._blobs(centers, 25)
+
+        clf: BisectingKMeans = BisectingKMeans(n_clusters=4).fit(X)
+        self.assertEqual(4, len(clf.cluster_centers_))
+        self.assertEqual(len(X), len(clf.labels_))
+        self.assertEqual(4, len(list(clf.root_.leaves())))
+
+        # Cada grupo de amostras deve formar exatamente um cluster
+        for i in range(len(centers)):
+            self.assertEqual(1, len(set(clf.labels_[i * 25:(i + 1) * 25])))
+        self.assertEqual({0, 1, 2, 3}, set(clf.labels_))
+
+        for label, leaf in enumerate(clf.root_.leaves()):
+            self.assertEqual(label, leaf.label)
+            self.assertEqual(clf.cluster_centers_[label], leaf.center)
+
+    def test_Prediction(self):
+        random.seed(0)
+        X: Matrix = self._blobs([[0, 0], [20, 0], [0, 20], [20, 20], [10, 10]], 20)
+
+        clf: BisectingKMeans = BisectingKMeans(n_clusters=5)
+        self.assertRaises(ValueError, lambda: clf.predict([[1, 2], [3, 4]]))
+
+        clf.fit(X)
+        self.assertEqual(clf.labels_, clf.predict(X))
+        self.assertEqual(clf.labels_[0], clf.predict([0, 0]))
+        self.assertEqual(clf.labels_[-1], clf.predict([10, 10]))
+
+    def test_Unsplittable(self):
+        # Amostras idênticas não podem ser divididas
+        random.seed(0)
+        self.assertRaises(ValueError, lambda: BisectingKMeans(n_clusters=2).fit([[1, 1]] * 5))
+        self.assertRaises(ValueError, lambda: BisectingKMeans(n_clusters=3).fit([[1, 1], [1, 1], [1, 1], [5, 5]]))
+
+        clf: BisectingKMeans = BisectingKMeans(n_clusters=2).fit([[1, 1], [1, 1], [1, 1], [5, 5]])
+        self.assertEqual(2, len(clf.cluster_centers_))
+        self.assertEqual([1, 3], sorted(collections.Counter(clf.labels_).values()))
+
+    def test_SaveLoad(self):
+        random.seed(0)
+        X: Matrix = self._blobs([[0, 0], [20, 0], [0, 20], [20, 20], [10, 10]], 10)
+        clf: BisectingKMeans = BisectingKMeans(n_clusters=5, n_trials=2).fit(X)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bisecting.mdl')
+            clf.save(path)
+            self.assertRaises(ValueError, lambda: KMeans.load(path))
+
+            loaded: BisectingKMeans = BisectingKMeans.load(path)
+            self.assertEqual(2, loaded.n_trials)
+            self.assertEqual(clf.labels_, loaded.labels_)
+            self.assertEqual([leaf.label for leaf in clf.root_.leaves()],
+                             [leaf.label for leaf in loaded.root_.leaves()])
+            self.assertEqual(clf.predict(X), loaded.predict(X))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,12 @@
 import collections
+import os
 import random
+import tempfile
 import unittest
 import unittest.mock
 
 from models.clustering.kmeans.model import KMeans
-from models.utils.linear_alg import Matrix, Vector
+from models.utils.linear_alg import Matrix, Vector, euclidean
 
 
 class ClusterTestCase(unittest.TestCase):
@@ -113,6 +115,23 @@ class ClusterTestCase(unittest.TestCase):
         clf = self._test_ClusteringOnSample("sample5.csv", strategy='mean', n_clusters=3, n_fixed_points=1)
         self.assertIn([5, 7], [centroid for centroid in clf.cluster_centers_])
 
+    def test_SampleWeight(self):
+        X: Matrix = [[0, 0], [1, 0], [10, 10], [10, 12]]
+        clf: KMeans = KMeans(n_clusters=2)
+        self.assertRaises(ValueError, lambda: clf.fit(X, [1, 1]))
+        self.assertRaises(ValueError, lambda: clf.fit(X, [1, 1, -1, 1]))
+
+        with unittest.mock.patch("random.sample", lambda population, n: [population[0], population[2]]):
+            clf.fit(X, [1, 3, 1, 1])
+            self.assertEqual([[0.75, 0.0], [10.0, 11.0]], clf.cluster_centers_)
+            self.assertEqual([0, 0, 1, 1], clf.labels_)
+
+            clf.fit(X, [1, 1, 1, 1])
+            self.assertEqual([[0.5, 0.0], [10.0, 11.0]], clf.cluster_centers_)
+
+            clf = KMeans(n_clusters=2, strategy='median').fit(X + [[0, 0]], [1, 1, 1, 1, 3])
+            self.assertEqual([[0, 0], [10.0, 11.0]], clf.cluster_centers_)
+
     def test_Prediction(self):
         clf: KMeans = KMeans()
         self.assertRaises(ValueError, lambda: clf.predict([[1, 2], [3, 4]]))
@@ -128,3 +147,74 @@ class ClusterTestCase(unittest.TestCase):
         self.assertEqual(c0, clf.predict([0, 0]))
         self.assertEqual(c1, clf.predict([4, 4]))
         self.assertEqual(c2, clf.predict([11, 11]))
+
+    def test_PredictionBatch(self):
+        clf: KMeans = KMeans(n_clusters=3)
+        self.assertRaises(ValueError, lambda: clf.predict_batch([[1, 2], [3, 4]]))
+
+        clf.fit([[1, 1], [5, 5], [10, 10]])
+        self.assertRaises(ValueError, lambda: clf.predict_batch([[1, 1]], block_size=0))
+
+        X: Matrix = [[0, 0], [4, 4], [11, 11], [1, 1], [5, 5]]
+        y = clf.predict_batch(X, block_size=2)
+        self.assertEqual('l', y.typecode)
+        self.assertEqual(clf.predict(X), y.tolist())
+        self.assertEqual(clf.predict(X), clf.predict_batch(iter(X)).tolist())
+
+    def test_PredictionBatch_Index(self):
+        rng = random.Random(0)
+        X: Matrix = [[rng.uniform(-50, 50), rng.uniform(-50, 50)] for _ in range(400)]
+
+        clf: KMeans = KMeans(n_clusters=KMeans._INDEX_MIN_CLUSTERS + 8, n_iterations=2).fit(X)
+        queries: Matrix = [[rng.uniform(-60, 60), rng.uniform(-60, 60)] for _ in range(200)]
+        expected = [
+            min(range(len(clf.cluster_centers_)), key=lambda i: euclidean(sample, clf.cluster_centers_[i]))
+            for sample in queries
+        ]
+        self.assertEqual(expected, clf.predict_batch(queries, block_size=7).tolist())
+
+    def test_SaveLoad(self):
+        clf: KMeans = KMeans(n_clusters=3, strategy='median')
+        self.assertRaises(ValueError, lambda: clf.save('model.mdl'))
+        clf.fit([[1, 1], [1, 2], [5, 5], [6, 5], [10, 10], [10, 11]])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kmeans.mdl')
+            clf.save(path)
+
+            for mmap in (True, False):
+                loaded: KMeans = KMeans.load(path, mmap=mmap)
+                self.assertEqual('median', loaded.strategy)
+                self.assertEqual(clf.cluster_centers_, [list(center) for center in loaded.cluster_centers_])
+                self.assertEqual(clf.labels_, loaded.labels_)
+                self.assertEqual(clf.predict([[0, 0], [5, 6], [12, 12]]), loaded.predict([[0, 0], [5, 6], [12, 12]]))
+
+    def test_Checkpoint(self):
+        random.seed(0)
+        X: Matrix = [[random.gauss(center, 1.0), random.gauss(center, 1.0)] for center in (0, 5, 10) for _ in range(30)]
+
+        random.seed(1)
+        expected: KMeans = KMeans(n_clusters=3, n_iterations=6).fit(X)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'kmeans.ckpt')
+            self.assertRaises(ValueError, lambda: KMeans().fit(X, checkpoint=path, checkpoint_interval=0))
+
+            # Nenhum ponto de controle é salvo na última iteração
+            KMeans(n_clusters=3, n_iterations=1).fit(X, checkpoint=path)
+            self.assertFalse(os.path.exists(path))
+
+            # Um agrupamento interrompido após 2 iterações e retomado produz o mesmo resultado
+            random.seed(1)
+            KMeans(n_clusters=3, n_iterations=3).fit(X, checkpoint=path, checkpoint_interval=2)
+            self.assertEqual(['kmeans.ckpt'], os.listdir(directory))
+
+            random.seed(2)
+            resumed: KMeans = KMeans(n_clusters=3, n_iterations=6).fit(X, resume_from=path)
+            self.assertEqual(expected.cluster_centers_, resumed.cluster_centers_)
+            self.assertEqual(expected.labels_, resumed.labels_)
+
+            self.assertRaises(ValueError, lambda: KMeans(n_clusters=4).fit(X, resume_from=path))
+
+            KMeans(n_clusters=3).fit(X).save(path)
+            self.assertRaises(ValueError, lambda: KMeans(n_clusters=3).fit(X, resume_from=path))
@@ -0,0 +1,50 @@
+import math
+import random
+import unittest
+
+from models.clustering.coreset import build_coreset
+from models.clustering.kmeans.model import KMeans
+from models.utils.linear_alg import Matrix
+
+
+class CoresetTestCase(unittest.TestCase):
+    def test_Invalid(self):
+        self.assertRaises(ValueError, lambda: build_coreset([], 10))
+        self.assertRaises(ValueError, lambda: build_coreset([[1, 2]], 0))
+
+    def test_Weights(self):
+        random.seed(0)
+        X: Matrix = [[random.gauss(0, 1), random.gauss(0, 1)] for _ in range(1_000)]
+
+        samples, weights = build_coreset(X, 200)
+        self.assertEqual(len(samples), len(weights))
+        self.assertLessEqual(len(samples), 200)
+        self.assertTrue(all(sample in X for sample in samples))
+        self.assertTrue(all(weight > 0 for weight in weights))
+
+        # A soma dos pesos é um estimador não enviesado do número de amostras
+        self.assertAlmostEqual(len(X), sum(weights), delta=0.25 * len(X))
+
+        # Amostras idênticas possuem a mesma probabilidade de serem sorteadas
+        samples, weights = build_coreset([[1, 1]] * 10, 5)
+        self.assertTrue(all(sample == [1, 1] for sample in samples))
+        self.assertAlmostEqual(10.0, sum(weights))
+
+    def test_Clustering(self):
+        random.seed(0)
+        centers: Matrix = [[0, 0], [30, 0], [0, 30]]
+        X: Matrix = [[random.gauss(x, 1), random.gauss(y, 1)] for x, y in centers for _ in range(500)]
+
+        samples, weights = build_coreset(X, 300)
+        clf: KMeans = KMeans(n_clusters=3)
+        for _ in range(10):
+            clf.fit(samples, weights)
+            if len(set(clf.predict(X))) == 3:
+                break
+
+        for center in centers:
+            self.assertLess(min(math.dist(center, centroid) for centroid in clf.cluster_centers_), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 from typing import Callable
 
 from models.utils.linear_alg import euclidean, diagonal_sum, manhattan, Vector, chebyshev, hamming, \
-    check_dimension_match
+    check_dimension_match, is_vector, pairwise_distances
+from models.utils.lists import IndexView, ValidatedMatrix
 
 
 class UtilsTestCase(unittest.TestCase):
@@ -14,6 +15,19 @@ class UtilsTestCase(unittest.TestCase):
         self.assertRaises(ValueError, lambda: check_dimension_match([], [], allow_empty=False))
         self.assertRaises(ValueError, lambda: check_dimension_match([[1, 2, 3], [4, 5]], [6, 7]))
 
+    def test_CheckDimensionMatrix_Validated(self):
+        X = ValidatedMatrix([[1, 2], [3, 4], [5, 6]])
+        self.assertEqual(3, check_dimension_match(X, [1, 2, 3]))
+        self.assertEqual(2, check_dimension_match(IndexView(X, [2, 0]), [1, 2]))
+        self.assertRaises(ValueError, lambda: check_dimension_match(X, [1, 2]))
+        self.assertRaises(ValueError, lambda: check_dimension_match(ValidatedMatrix([]), [], allow_empty=False))
+
+    def test_IsVector(self):
+        self.assertTrue(is_vector([1, 2.5]))
+        self.assertFalse(is_vector([[1, 2.5]]))
+        self.assertFalse(is_vector(ValidatedMatrix([[1, 2.5]])))
+        self.assertFalse(is_vector(IndexView(ValidatedMatrix([[1, 2.5]]), [0])))
+
     def test_DiagonalSum(self):
         self.assertEqual(0, diagonal_sum([[0]]))
         self.assertEqual(1, diagonal_sum([[1]]))
@@ -53,3 +67,18 @@ class UtilsTestCase(unittest.TestCase):
         self._test_Distance(hamming)
         self.assertEqual(2, hamming([1, 1], [2, 2]))
         self.assertNotEqual(hamming([5, 6], [5, 6]), hamming([10, 11], [10, 12]))
+
+    def test_PairwiseDistances(self):
+        self.assertRaises(ValueError, lambda: pairwise_distances([[1]], [[1]], chunk_size=0))
+        self.assertEqual([], list(pairwise_distances([], [[1, 2]])))
+
+        A = [[0, 0], [1, 1], [3, 4], [2, 7], [5, 1]]
+        B = [[0, 0], [3, 4], [1, 5]]
+        for metric in (euclidean, manhattan, chebyshev, hamming, lambda v1, v2: abs(v1[0] - v2[1])):
+            blocks = list(pairwise_distances(iter(A), B, metric, chunk_size=2))
+            self.assertEqual([2, 2, 1], [len(block) for block in blocks])
+
+            rows = [row for block in blocks for row in block]
+            for a, row in zip(A, rows):
+                for b, distance in zip(B, row):
+                    self.assertAlmostEqual(metric(a, b), distance)
@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from models.utils.lists import split_list, sort_by, rows, cols
+from models.utils.lists import split_list, sort_by, rows, cols, IndexView, ValidatedMatrix
 
 
 class ListsTestCase(unittest.TestCase):
@@ -31,3 +32,45 @@ class ListsTestCase(unittest.TestCase):
         self.assertEqual([3, 4], sort_by([2, 1], [4, 3]))
         self.assertEqual([6, 4, 5], sort_by([2, 3, 1], [4, 5, 6]))
         self.assertEqual([5, 4, 6], sort_by([2, 3, 1], [4, 5, 6], reverse=True))
+
+    def test_IndexView(self):
+        values = [[1, 2], [3, 4], [5, 6], [7, 8]]
+        view = IndexView(values, [3, 1])
+        self.assertEqual(2, len(view))
+        self.assertEqual([7, 8], view[0])
+        self.assertEqual([3, 4], view[-1])
+        self.assertEqual([[7, 8], [3, 4]], list(view))
+        self.assertIs(values[3], view[0])
+        self.assertRaises(IndexError, lambda: view[2])
+
+        nested = IndexView(view, [1])
+        self.assertEqual([[3, 4]], list(nested))
+        self.assertEqual([1], nested.indices)
+        self.assertEqual([[3, 4], [7, 8]], list(view[::-1]))
+        self.assertEqual(list(view), list(pickle.loads(pickle.dumps(view))))
+
+    def test_ValidatedMatrix(self):
+        self.assertRaises(ValueError, lambda: ValidatedMatrix([[1, 2], [3]]))
+        self.assertRaises(ValueError, lambda: ValidatedMatrix([1, 2]))
+        self.assertEqual((0, 0), ValidatedMatrix([]).shape)
+
+        rows_ = [[1, 2], [3, 4], [5, 6]]
+        matrix = ValidatedMatrix(rows_)
+        self.assertEqual((3, 2), matrix.shape)
+        self.assertEqual('int', matrix.dtype)
+        self.assertEqual('float', ValidatedMatrix([[1, 2.5]]).dtype)
+        self.assertEqual('object', ValidatedMatrix([['a', 1]]).dtype)
+        self.assertIs(rows_[1], matrix[1])
+        self.assertIs(matrix, ValidatedMatrix(matrix))
+
+        part = matrix[1:]
+        self.assertIsInstance(part, ValidatedMatrix)
+        self.assertEqual(((3, 4), (5, 6)), tuple(map(tuple, part)))
+        self.assertEqual((2, 2), part.shape)
+
+        restored = pickle.loads(pickle.dumps(matrix))
+        self.assertIsInstance(restored, ValidatedMatrix)
+        self.assertEqual((list(matrix), matrix.shape, 'int'), (list(restored), restored.shape, restored.dtype))
+
+        self.assertEqual(2, cols(matrix))
+        self.assertEqual(2, cols(IndexView(matrix, [2])))
@@ -1,6 +1,8 @@
+import math
 import unittest
 
-from models.utils.math import sigmoid
+from models.utils.math import sigmoid, weighted_mean, weighted_median, relu, sigmoid_vector, sigmoid_derivative, \
+    tanh_vector, tanh_derivative, relu_vector, relu_derivative, softmax, softmax_derivative
 
 
 class MathTestCase(unittest.TestCase):
@@ -8,6 +10,60 @@ class MathTestCase(unittest.TestCase):
         self.assertEqual(0.0, sigmoid(float('-inf')))
         self.assertEqual(0.5, sigmoid(0))
         self.assertEqual(1.0, sigmoid(float('+inf')))
+        self.assertEqual(0.0, sigmoid(-1e6))
+        self.assertAlmostEqual(1 / (1 + math.exp(3)), sigmoid(-3))
+
+    def test_Relu(self):
+        self.assertEqual(0.0, relu(-2))
+        self.assertEqual(0.0, relu(0))
+        self.assertEqual(1.5, relu(1.5))
+
+    def test_Kernels(self):
+        z = [-1e6, -3.0, 0.0, 2.0, 1e6]
+
+        self.assertEqual([sigmoid(x) for x in z], sigmoid_vector(z))
+        self.assertEqual([math.tanh(x) for x in z], tanh_vector(z))
+        self.assertEqual([0.0, 0.0, 0.0, 2.0, 1e6], relu_vector(z))
+
+        # Os resultados podem ser escritos no próprio vetor de entrada
+        out = list(z)
+        self.assertIs(out, sigmoid_vector(out, out))
+        self.assertEqual(sigmoid_vector(z), out)
+
+        a = softmax([1000.0, 1000.0, -1e6])
+        self.assertEqual([0.5, 0.5, 0.0], a)
+        self.assertAlmostEqual(1.0, sum(softmax([0.3, -1.2, 2.5])))
+        self.assertEqual([], softmax([]))
+
+    def test_Derivatives(self):
+        z = [-1.3, -0.2, 0.4, 2.1]
+        grad = [0.5, -1.0, 2.0, 0.3]
+        ε = 1e-6
+
+        for function, derivative in ((sigmoid_vector, sigmoid_derivative), (tanh_vector, tanh_derivative),
+                                     (relu_vector, relu_derivative), (softmax, softmax_derivative)):
+            with self.subTest(function=function.__name__):
+                actual = derivative(function(z), grad)
+                for i in range(len(z)):
+                    z_plus = list(z)
+                    z_plus[i] += ε
+                    z_minus = list(z)
+                    z_minus[i] -= ε
+                    expected = sum(g * (p - m) / (2 * ε) for g, p, m in zip(grad, function(z_plus), function(z_minus)))
+                    self.assertAlmostEqual(expected, actual[i], places=6)
+
+    def test_WeightedMean(self):
+        self.assertEqual(2.0, weighted_mean([1, 2, 3], [1, 1, 1]))
+        self.assertEqual(2.5, weighted_mean([1, 2, 3], [0, 1, 1]))
+        self.assertEqual(1.5, weighted_mean([1, 3], [3, 1]))
+        self.assertRaises(ValueError, lambda: weighted_mean([1, 2], [0, 0]))
+
+    def test_WeightedMedian(self):
+        self.assertEqual(2, weighted_median([3, 1, 2], [1, 1, 1]))
+        self.assertEqual(2.5, weighted_median([1, 2, 3, 4], [1, 1, 1, 1]))
+        self.assertEqual(1, weighted_median([1, 2, 3], [5, 1, 1]))
+        self.assertEqual(3, weighted_median([1, 2, 3], [0, 0, 2]))
+        self.assertRaises(ValueError, lambda: weighted_median([1, 2], [0, 0]))
 
 
 if __name__ == '__main__':
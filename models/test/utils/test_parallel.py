@@ -0,0 +1,26 @@
+import unittest
+from typing import Any, Dict
+
+from models.utils.parallel import worker_pool, worker_state
+
+
+def _setup(state: Dict[str, Any]):
+    state['offset'] = sum(state['values'])
+
+
+def _task(i: int) -> int:
+    state = worker_state()
+    return state['values'][i] + state['offset']
+
+
+class ParallelTestCase(unittest.TestCase):
+    def test_WorkerPool(self):
+        with worker_pool(2, _setup, values=[1, 2, 3]) as pool:
+            self.assertEqual([7, 8, 9], pool.map(_task, range(3)))
+
+        with worker_pool(2, values=[4, 5]) as pool:
+            self.assertEqual({'values': [4, 5]}, pool.apply(worker_state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from models.utils.serialization import save_arrays, load_arrays
+
+
+class SerializationTestCase(unittest.TestCase):
+    def setUp(self):
+        fd, self._path = tempfile.mkstemp(suffix='.mdl')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self._path)
+
+    def test_RoundTrip(self):
+        meta = {'params': {'k': 3, 'name': 'ção'}, 'classes': [0, 'a', 1.5]}
+        arrays = {'X': [[1.0, 2.0, 3.0], [4.0, 5.5, -6.0]], 'y': [3, -1], 'w': [0.25], 'empty': []}
+        save_arrays(self._path, 'Model', meta, arrays, {'y': 'i8'})
+
+        for mmap in (True, False):
+            kind, loaded_meta, loaded = load_arrays(self._path, mmap=mmap)
+            self.assertEqual('Model', kind)
+            self.assertEqual(meta, loaded_meta)
+            self.assertEqual(arrays['X'], [list(row) for row in loaded['X']])
+            self.assertEqual([3, -1], list(loaded['y']))
+            self.assertEqual([0.25], list(loaded['w']))
+            self.assertEqual([], list(loaded['empty']))
+
+        _, _, loaded = load_arrays(self._path, mmap=False)
+        self.assertIsInstance(loaded['X'][0], list)
+
+    def test_ReducedPrecision(self):
+        save_arrays(self._path, 'Model', {}, {'f': [[0.1, -2.5]], 'b': [-127, 0, 127]}, {'f': 'f4', 'b': 'i1'})
+        _, _, loaded = load_arrays(self._path)
+        self.assertAlmostEqual(0.1, loaded['f'][0][0], places=7)
+        self.assertEqual(-2.5, loaded['f'][0][1])
+        self.assertEqual([-127, 0, 127], list(loaded['b']))
+
+    def test_Mmap(self):
+        save_arrays(self._path, 'Model', {}, {'X': [[1.0, 2.0], [3.0, 4.0]]})
+
+        _, _, loaded = load_arrays(self._path)
+        row = loaded['X'][1]
+        self.assertIsInstance(row, memoryview)
+
+        # As alterações são privadas e não afetam o arquivo
+        row[0] = 10.0
+        self.assertEqual([10.0, 4.0], list(row))
+        _, _, loaded = load_arrays(self._path)
+        self.assertEqual([3.0, 4.0], list(loaded['X'][1]))
+
+    def test_Invalid(self):
+        self.assertRaises(ValueError, lambda: save_arrays(self._path, 'Model', {}, {'X': [1.0]}, {'X': 'f2'}))
+        self.assertRaises(ValueError, lambda: save_arrays(self._path, 'Model', {}, {'X': [[1.0], [2.0, 3.0]]}))
+
+        with open(self._path, 'wb') as f:
+            f.write(b'not a model file')
+        self.assertRaises(ValueError, lambda: load_arrays(self._path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from models.utils.linear_alg import Matrix, Vector
+from models.utils.serialization import Array, save_arrays, load_arrays
+
+
+def save_checkpoint(path: str, kind: str, iteration: int, meta: Dict[str, Any], arrays: Dict[str, Array],
+                    dtypes: Optional[Dict[str, str]] = None):
+    """
+    Salva o estado de um treinamento em andamento.
+
+    Além dos metadados e vetores fornecidos, são salvos o número da iteração e o estado do gerador de números
+    aleatórios do módulo `random`. O arquivo é escrito em um arquivo temporário e então movido para ``path``, de forma
+    que uma interrupção durante a escrita mantém o ponto de controle anterior intacto.
+
+    :param path: o caminho do arquivo.
+    :param kind: o tipo do treinamento salvo.
+    :param iteration: o número de iterações já concluídas.
+    :param meta: os metadados do treinamento. Devem ser serializáveis em JSON.
+    :param arrays: os vetores e as matrizes do treinamento, por nome.
+    :param dtypes: o tipo de dado de cada vetor, como em ``save_arrays``.
+    """
+    version, state, gauss_next = random.getstate()
+    meta = dict(meta, iteration=iteration, rng_state=[version, list(state), gauss_next])
+
+    temporary = f'{path}.tmp'
+    save_arrays(temporary, kind, meta, arrays, dtypes)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str, kind: str) -> Tuple[int, Dict[str, Any], Dict[str, Array]]:
+    """
+    Carrega o estado de um treinamento salvo por ``save_checkpoint``.
+
+    O estado do gerador de números aleatórios do módulo `random` é restaurado, de forma que o treinamento retomado
+    produz o mesmo resultado que o treinamento ininterrupto.
+
+    :param path: o caminho do arquivo.
+    :param kind: o tipo de treinamento esperado.
+    :raises ValueError: se o arquivo não contiver um treinamento do tipo esperado.
+    :return: o número de iterações já concluídas, os metadados e os vetores do treinamento. Os vetores são listas.
+    """
+    saved_kind, meta, arrays = load_arrays(path, mmap=False)
+    if saved_kind != kind:
+        raise ValueError(f"'{path}' does not contain a {kind} checkpoint")
+
+    version, state, gauss_next = meta['rng_state']
+    random.setstate((version, tuple(state), gauss_next))
+    return meta['iteration'], meta, arrays
+
+
+def flatten(vectors: Sequence[Sequence[float]]) -> Vector:
+    """
+    Concatena uma lista de vetores de tamanhos possivelmente diferentes.
+
+    :param vectors: os vetores.
+    :return: um único vetor com os valores de todos os vetores, em ordem.
+    """
+    return [value for vector in vectors for value in vector]
+
+
+def unflatten(values: Sequence[float], sizes: Sequence[int]) -> Matrix:
+    """
+    Divide um vetor criado por ``flatten`` nos seus vetores originais.
+
+    :param values: o vetor concatenado.
+    :param sizes: o tamanho de cada vetor original.
+    :return: os vetores originais.
+    """
+    vectors: List[Vector] = []
+    offset = 0
+    for size in sizes:
+        vectors.append(list(values[offset:offset + size]))
+        offset += size
+
+    return vectors
@@ -1,4 +1,9 @@
-from typing import List
+import itertools
+import math
+import operator
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
+
+from models.utils.lists import validated_base
 
 Matrix = List[List[float]]
 
@@ -12,6 +17,9 @@ def check_dimension_match(X: Matrix, y: Vector, allow_empty: bool = True) -> int
     Uma matriz M e um vetor V possuem dimensões compatíveis se o número de linhas
     de M é o mesmo número de elementos de V.
 
+    Caso a matriz seja uma ``ValidatedMatrix`` (ou uma ``IndexView`` sobre uma), o comprimento das suas linhas não é
+    verificado novamente.
+
     :param X: a matriz a ser verificada.
     :param y: o vetor a ser verificado.
     :param allow_empty: define se matrizes e vetores vazios são permitidos.
@@ -27,7 +35,7 @@ def check_dimension_match(X: Matrix, y: Vector, allow_empty: bool = True) -> int
     if not allow_empty and not dimension:
         raise ValueError("X and y must not be empty")
 
-    if dimension:
+    if dimension and validated_base(X) is None:
         len_row = len(X[0])
         if any(len(row) != len_row for row in X):
             raise ValueError("X rows must have the same length")
@@ -35,6 +43,20 @@ def check_dimension_match(X: Matrix, y: Vector, allow_empty: bool = True) -> int
     return dimension
 
 
+def is_vector(X: Sequence[Any]) -> bool:
+    """
+    Verifica se os dados fornecidos são uma única amostra (um vetor de números) em vez de um conjunto de amostras.
+
+    :param X: os dados.
+    :return: se os dados são um vetor. Uma ``ValidatedMatrix`` (ou uma ``IndexView`` sobre uma) nunca é um vetor, sem
+                que os seus valores precisem ser percorridos.
+    """
+    if validated_base(X) is not None:
+        return False
+
+    return all(isinstance(v, (float, int)) for v in X)
+
+
 def diagonal_sum(matrix: Matrix) -> float:
     """
     Calcula a soma da diagonal principal de uma matriz.
@@ -118,3 +140,68 @@ def hamming(v1: Vector, v2: Vector) -> float:
     :return: a distância Hamming entre os dois vetores.
     """
     return sum(e1 != e2 for e1, e2 in zip(v1, v2))
+
+
+def _manhattan(v1: Vector, v2: Vector) -> float:
+    return sum(map(abs, map(operator.sub, v1, v2)))
+
+
+def _chebyshev(v1: Vector, v2: Vector) -> float:
+    return max(map(abs, map(operator.sub, v1, v2)))
+
+
+def _hamming(v1: Vector, v2: Vector) -> float:
+    return sum(map(operator.ne, v1, v2))
+
+
+_KERNELS: Dict[Callable[[Vector, Vector], float], Callable[[Vector, Vector], float]] = {
+    euclidean: math.dist,
+    manhattan: _manhattan,
+    chebyshev: _chebyshev,
+    hamming: _hamming,
+}
+"""
+Implementações equivalentes das métricas deste módulo, com os laços executados em C.
+"""
+
+
+def pairwise_distances(
+        A: Iterable[Vector],
+        B: Sequence[Vector],
+        metric: Callable[[Vector, Vector], float] = euclidean,
+        chunk_size: int = 256,
+) -> Iterator[Matrix]:
+    """
+    Calcula as distâncias entre cada vetor de um conjunto e cada vetor de outro conjunto, em blocos.
+
+    Os vetores de ``A`` são consumidos em blocos de ``chunk_size`` vetores, e a matriz de distâncias de cada bloco é
+    produzida antes do próximo bloco ser lido. Dessa forma, a memória utilizada é proporcional a ``chunk_size * len(B)``
+    e ``A`` pode ser qualquer iterável (por exemplo, um gerador).
+
+    As métricas deste módulo são substituídas por implementações equivalentes cujos laços são executados em C. Na
+    métrica euclidiana, ``math.dist`` é utilizada.
+
+    :param A: os vetores das linhas das matrizes de distâncias.
+    :param B: os vetores das colunas das matrizes de distâncias.
+    :param metric: a métrica de distância, padrão euclidiana.
+    :param chunk_size: o número de vetores de ``A`` de cada bloco, padrão 256.
+    :raises ValueError: se ``chunk_size`` não for positivo.
+    :return: um iterador sobre as matrizes de distâncias de cada bloco, em que o valor da linha i e coluna j é a
+                distância entre o i-ésimo vetor do bloco e o j-ésimo vetor de ``B``.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size ({chunk_size}) must be greater than zero")
+
+    return _pairwise_distances(A, B, _KERNELS.get(metric, metric), chunk_size)
+
+
+def _pairwise_distances(A: Iterable[Vector], B: Sequence[Vector], kernel: Callable[[Vector, Vector], float],
+                        chunk_size: int) -> Iterator[Matrix]:
+    n_b = len(B)
+    rows_ = iter(A)
+    while True:
+        block = list(itertools.islice(rows_, chunk_size))
+        if not block:
+            break
+
+        yield [list(map(kernel, itertools.repeat(a, n_b), B)) for a in block]
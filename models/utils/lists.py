@@ -1,4 +1,4 @@
-from typing import List, TypeVar, Any
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, overload
 
 T = TypeVar('T')
 R = TypeVar('R')
@@ -27,6 +27,11 @@ def cols(matrix: List[List[Any]], *, check_if_equal=True):
     if rows(matrix) == 0:
         raise ValueError("this matrix does not have any rows")
 
+    # Matrizes validadas (e visões delas) já tiveram o comprimento das suas linhas verificado
+    validated = validated_base(matrix)
+    if validated is not None:
+        return validated.n_cols
+
     v0 = matrix[0]
     if check_if_equal and not all(len(v0) == len(v) for v in matrix):
         raise ValueError("columns in this matrix are not the same size")
@@ -73,3 +78,159 @@ def sort_by(a1: List[T], a2: List[T], reverse: bool = False) -> List[T]:
     """
     sorted_zip = sorted(zip(a1, a2), reverse=reverse, key=lambda t: t[0])
     return [t[1] for t in sorted_zip]
+
+
+class IndexView(Sequence[T]):
+    """
+    Representa as posições selecionadas de uma sequência, sem copiar os seus elementos.
+
+    Os elementos são lidos da sequência original a cada acesso, de forma que uma visão ocupa apenas a memória da sua
+    lista de índices. Visões de visões são achatadas e referenciam diretamente a sequência original.
+    """
+
+    __slots__ = ('_values', '_indices')
+
+    def __init__(self, values: Sequence[T], indices: Sequence[int]):
+        """
+        Cria uma visão de uma sequência.
+
+        :param values: a sequência original.
+        :param indices: as posições da sequência original que compõem a visão, em ordem.
+        """
+        if isinstance(values, IndexView):
+            indices = [values._indices[i] for i in indices]
+            values = values._values
+
+        self._values: Sequence[T] = values
+        self._indices: Sequence[int] = indices
+
+    @property
+    def indices(self) -> Sequence[int]:
+        """
+        As posições da sequência original que compõem essa visão.
+        """
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'IndexView[T]':
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, 'IndexView[T]']:
+        if isinstance(index, slice):
+            return IndexView(self._values, self._indices[index])
+
+        return self._values[self._indices[index]]
+
+    def __iter__(self) -> Iterator[T]:
+        return map(self._values.__getitem__, self._indices)
+
+    def __repr__(self):
+        return f'IndexView({list(self)})'
+
+
+class ValidatedMatrix(tuple):
+    """
+    Representa uma matriz cujas linhas já foram validadas, com o seu formato e o tipo dos seus valores registrados.
+
+    A validação percorre a matriz uma única vez, na criação. Funções como ``check_dimension_match``, ``cols`` e
+    ``is_vector`` reconhecem matrizes validadas (e ``IndexView`` sobre elas) e deixam de percorrer todas as linhas a
+    cada chamada, o que é vantajoso quando o mesmo conjunto de dados é utilizado várias vezes, como na validação
+    cruzada. A matriz em si é imutável, mas as suas linhas não são copiadas e não devem ser alteradas.
+    """
+
+    n_cols: int
+    """
+    O número de colunas dessa matriz.
+    """
+
+    def __new__(cls, matrix: Iterable[Sequence[Any]]) -> 'ValidatedMatrix':
+        """
+        Valida uma matriz.
+
+        :param matrix: as linhas da matriz. Caso já seja uma matriz validada, ela é retornada sem uma nova validação.
+        :raises ValueError: se alguma linha não for uma sequência ou se as linhas possuírem comprimentos diferentes.
+        :return: a matriz validada.
+        """
+        if isinstance(matrix, ValidatedMatrix):
+            return matrix
+
+        rows_ = tuple(matrix)
+        try:
+            lengths = set(map(len, rows_))
+        except TypeError:
+            raise ValueError("matrix rows must be sequences") from None
+
+        if len(lengths) > 1:
+            raise ValueError("matrix rows must have the same length")
+
+        return cls._trusted(rows_, lengths.pop() if lengths else 0, None)
+
+    @classmethod
+    def _trusted(cls, rows_: Tuple[Sequence[Any], ...], n_cols: int, dtype: Optional[str]) -> 'ValidatedMatrix':
+        """
+        Cria uma matriz validada sem validá-la, a partir de linhas já validadas.
+        """
+        matrix = super().__new__(cls, rows_)
+        matrix.n_cols = n_cols
+        matrix._dtype = dtype
+        return matrix
+
+    @property
+    def dtype(self) -> str:
+        """
+        O tipo dos valores dessa matriz: 'int', caso todos sejam inteiros, 'float', caso todos sejam números, ou
+        'object'. O tipo é determinado no primeiro acesso, percorrendo todos os valores, e então registrado.
+        """
+        if self._dtype is None:
+            if all(type(value) is int for row in self for value in row):
+                self._dtype = 'int'
+            elif all(isinstance(value, (float, int)) for row in self for value in row):
+                self._dtype = 'float'
+            else:
+                self._dtype = 'object'
+
+        return self._dtype
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        O número de linhas e o número de colunas dessa matriz.
+        """
+        return len(self), self.n_cols
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)._trusted(super().__getitem__(index), self.n_cols, self._dtype)
+
+        return super().__getitem__(index)
+
+    def __reduce__(self):
+        return type(self)._trusted, (tuple(self), self.n_cols, self._dtype)
+
+    def __repr__(self):
+        return f'ValidatedMatrix({list(self)})'
+
+
+def validated_base(matrix: Any) -> Optional[ValidatedMatrix]:
+    """
+    Retorna a matriz validada correspondente a uma matriz, caso exista.
+
+    :param matrix: a matriz.
+    :return: a própria matriz, caso seja uma ``ValidatedMatrix``, a matriz original de uma ``IndexView`` sobre uma
+                ``ValidatedMatrix``, ou `None` nos demais casos. As linhas da matriz possuem o mesmo comprimento e o
+                mesmo tipo de valores da matriz retornada.
+    """
+    if isinstance(matrix, ValidatedMatrix):
+        return matrix
+
+    if isinstance(matrix, IndexView) and isinstance(matrix._values, ValidatedMatrix):
+        return matrix._values
+
+    return None
@@ -1,11 +1,235 @@
 import math
+from typing import Optional, Sequence
+
+from models.utils.linear_alg import Vector
 
 
 def sigmoid(x: float) -> float:
     """
     Calcula a função sigmoide.
 
+    A função é calculada de forma que ``math.exp`` nunca recebe um valor positivo, evitando `OverflowError` para
+    entradas muito negativas.
+
+    :param x: o valor de entrada.
+    :return: o valor da função para o valor de entrada.
+    """
+    if x >= 0:
+        return 1.0 / (1.0 + math.exp(-x))
+
+    e = math.exp(x)
+    return e / (1.0 + e)
+
+
+def relu(x: float) -> float:
+    """
+    Calcula a função ReLU (`rectified linear unit`).
+
     :param x: o valor de entrada.
     :return: o valor da função para o valor de entrada.
     """
-    return 1.0 / (1.0 + math.exp(-x))
+    return x if x > 0 else 0.0
+
+
+def sigmoid_vector(z: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Calcula a função sigmoide de cada valor de um vetor.
+
+    :param z: os valores de entrada.
+    :param out: o vetor em que os resultados devem ser escritos, de mesmo tamanho que ``z``. Pode ser o próprio ``z``.
+                Se `None`, um novo vetor é criado.
+    :return: o vetor com os resultados.
+    """
+    out = [0.0] * len(z) if out is None else out
+    exp = math.exp
+    for i in range(len(z)):
+        x = z[i]
+        if x >= 0:
+            out[i] = 1.0 / (1.0 + exp(-x))
+        else:
+            e = exp(x)
+            out[i] = e / (1.0 + e)
+
+    return out
+
+
+def sigmoid_derivative(a: Sequence[float], grad: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Retropropaga um gradiente pela função sigmoide, isto é, calcula ``grad[i] * a[i] * (1 - a[i])``.
+
+    :param a: as saídas da função.
+    :param grad: o gradiente em relação às saídas da função.
+    :param out: o vetor em que os resultados devem ser escritos. Pode ser o próprio ``grad``. Se `None`, um novo vetor
+                é criado.
+    :return: o gradiente em relação às entradas da função.
+    """
+    out = [0.0] * len(a) if out is None else out
+    for i in range(len(a)):
+        a_i = a[i]
+        out[i] = grad[i] * a_i * (1.0 - a_i)
+
+    return out
+
+
+def tanh_vector(z: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Calcula a tangente hiperbólica de cada valor de um vetor.
+
+    :param z: os valores de entrada.
+    :param out: o vetor em que os resultados devem ser escritos, de mesmo tamanho que ``z``. Pode ser o próprio ``z``.
+                Se `None`, um novo vetor é criado.
+    :return: o vetor com os resultados.
+    """
+    out = [0.0] * len(z) if out is None else out
+    tanh = math.tanh
+    for i in range(len(z)):
+        out[i] = tanh(z[i])
+
+    return out
+
+
+def tanh_derivative(a: Sequence[float], grad: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Retropropaga um gradiente pela tangente hiperbólica, isto é, calcula ``grad[i] * (1 - a[i]²)``.
+
+    :param a: as saídas da função.
+    :param grad: o gradiente em relação às saídas da função.
+    :param out: o vetor em que os resultados devem ser escritos. Pode ser o próprio ``grad``. Se `None`, um novo vetor
+                é criado.
+    :return: o gradiente em relação às entradas da função.
+    """
+    out = [0.0] * len(a) if out is None else out
+    for i in range(len(a)):
+        a_i = a[i]
+        out[i] = grad[i] * (1.0 - a_i * a_i)
+
+    return out
+
+
+def relu_vector(z: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Calcula a função ReLU de cada valor de um vetor.
+
+    :param z: os valores de entrada.
+    :param out: o vetor em que os resultados devem ser escritos, de mesmo tamanho que ``z``. Pode ser o próprio ``z``.
+                Se `None`, um novo vetor é criado.
+    :return: o vetor com os resultados.
+    """
+    out = [0.0] * len(z) if out is None else out
+    for i in range(len(z)):
+        x = z[i]
+        out[i] = x if x > 0 else 0.0
+
+    return out
+
+
+def relu_derivative(a: Sequence[float], grad: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Retropropaga um gradiente pela função ReLU, isto é, calcula ``grad[i]`` se ``a[i] > 0`` e 0 caso contrário.
+
+    :param a: as saídas da função.
+    :param grad: o gradiente em relação às saídas da função.
+    :param out: o vetor em que os resultados devem ser escritos. Pode ser o próprio ``grad``. Se `None`, um novo vetor
+                é criado.
+    :return: o gradiente em relação às entradas da função.
+    """
+    out = [0.0] * len(a) if out is None else out
+    for i in range(len(a)):
+        out[i] = grad[i] if a[i] > 0 else 0.0
+
+    return out
+
+
+def softmax(z: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Calcula a função softmax de um vetor, isto é, ``exp(z[i]) / Σ exp(z[j])``.
+
+    O maior valor do vetor é subtraído de todos os valores antes da exponenciação, de forma que ``math.exp`` nunca
+    recebe um valor positivo.
+
+    :param z: os valores de entrada.
+    :param out: o vetor em que os resultados devem ser escritos, de mesmo tamanho que ``z``. Pode ser o próprio ``z``.
+                Se `None`, um novo vetor é criado.
+    :return: o vetor com os resultados, cuja soma é 1.
+    """
+    out = [0.0] * len(z) if out is None else out
+    if not z:
+        return out
+
+    exp = math.exp
+    m = max(z)
+    total = 0.0
+    for i in range(len(z)):
+        e = exp(z[i] - m)
+        out[i] = e
+        total += e
+
+    for i in range(len(out)):
+        out[i] /= total
+
+    return out
+
+
+def softmax_derivative(a: Sequence[float], grad: Sequence[float], out: Optional[Vector] = None) -> Vector:
+    """
+    Retropropaga um gradiente pela função softmax, isto é, multiplica o gradiente pela matriz jacobiana da função:
+    ``a[i] * (grad[i] - Σ a[j] * grad[j])``.
+
+    :param a: as saídas da função.
+    :param grad: o gradiente em relação às saídas da função.
+    :param out: o vetor em que os resultados devem ser escritos. Pode ser o próprio ``grad``. Se `None`, um novo vetor
+                é criado.
+    :return: o gradiente em relação às entradas da função.
+    """
+    out = [0.0] * len(a) if out is None else out
+    s = math.fsum(a_j * g_j for a_j, g_j in zip(a, grad))
+    for i in range(len(a)):
+        out[i] = a[i] * (grad[i] - s)
+
+    return out
+
+
+def weighted_mean(values: Sequence[float], weights: Sequence[float]) -> float:
+    """
+    Calcula a média ponderada de um conjunto de valores.
+
+    :param values: os valores.
+    :param weights: os pesos de cada valor.
+    :raises ValueError: se a soma dos pesos não for positiva.
+    :return: a média ponderada dos valores.
+    """
+    total = math.fsum(weights)
+    if total <= 0:
+        raise ValueError("the sum of the weights must be positive")
+
+    return math.fsum(value * weight for value, weight in zip(values, weights)) / total
+
+
+def weighted_median(values: Sequence[float], weights: Sequence[float]) -> float:
+    """
+    Calcula a mediana ponderada de um conjunto de valores.
+
+    A mediana ponderada é o menor valor cujo peso acumulado atinge metade do peso total. Caso o peso acumulado seja
+    exatamente a metade, a média entre esse valor e o próximo é retornada, de forma que pesos unitários produzem o mesmo
+    resultado que `statistics.median`.
+
+    :param values: os valores.
+    :param weights: os pesos de cada valor.
+    :raises ValueError: se a soma dos pesos não for positiva.
+    :return: a mediana ponderada dos valores.
+    """
+    total = math.fsum(weights)
+    if total <= 0:
+        raise ValueError("the sum of the weights must be positive")
+
+    pairs = sorted((value, weight) for value, weight in zip(values, weights) if weight > 0)
+    half = total / 2
+    cumulative = 0.0
+    for i, (value, weight) in enumerate(pairs):
+        cumulative += weight
+        if cumulative > half:
+            return value
+        if cumulative == half:
+            return (value + pairs[i + 1][0]) / 2 if i + 1 < len(pairs) else value
+
+    return pairs[-1][0]
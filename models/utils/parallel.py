@@ -0,0 +1,42 @@
+import multiprocessing
+import multiprocessing.pool
+from typing import Any, Callable, Dict, Optional
+
+_state: Dict[str, Any] = {}
+"""
+O estado do processo de trabalho atual, criado por ``worker_pool``.
+"""
+
+
+def _init_worker(state: Dict[str, Any], setup: Optional[Callable[[Dict[str, Any]], None]]):
+    _state.clear()
+    _state.update(state)
+    if setup is not None:
+        setup(_state)
+
+
+def worker_pool(n_jobs: int, setup: Optional[Callable[[Dict[str, Any]], None]] = None,
+                **state: Any) -> multiprocessing.pool.Pool:
+    """
+    Cria processos de trabalho que recebem um estado uma única vez, na sua criação.
+
+    Valores grandes e fixos durante o trabalho, como o conjunto de dados, devem ser passados em ``state``, de forma que
+    cada tarefa envie aos processos apenas os seus próprios argumentos. As funções executadas pelos processos obtêm o
+    estado por ``worker_state``.
+
+    :param n_jobs: o número de processos.
+    :param setup: uma função chamada em cada processo após o estado ser recebido, que pode completá-lo (por exemplo,
+                    com objetos que não são serializáveis). Deve ser definida no nível de um módulo.
+    :param state: o estado dos processos, por nome. Os valores devem ser serializáveis por `pickle`.
+    :return: os processos de trabalho.
+    """
+    return multiprocessing.Pool(n_jobs, initializer=_init_worker, initargs=(state, setup))
+
+
+def worker_state() -> Dict[str, Any]:
+    """
+    Obtém o estado do processo de trabalho atual.
+
+    :return: o estado fornecido a ``worker_pool``, completado pela função ``setup``.
+    """
+    return _state
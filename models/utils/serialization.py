@@ -0,0 +1,150 @@
+import array
+import json
+import mmap as _mmap
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from models.utils.linear_alg import Matrix, Vector
+
+MAGIC: bytes = b'MDLS'
+"""
+Os bytes iniciais de todo arquivo de modelo.
+"""
+
+VERSION: int = 1
+"""
+A versão do formato de arquivo de modelo.
+"""
+
+_PREAMBLE = struct.Struct('<4sHI')
+_ALIGNMENT: int = 64
+
+_TYPECODES: Dict[str, str] = {'f8': 'd', 'f4': 'f', 'i8': 'q', 'i1': 'b'}
+"""
+Os tipos de dados suportados, com os seus respectivos códigos do módulo `array`.
+"""
+
+Array = Union[Matrix, Vector]
+"""
+Um vetor ou uma matriz de números. Ao carregar um arquivo, os vetores e as linhas das matrizes podem ser `memoryview`.
+"""
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _is_matrix(values: Array) -> bool:
+    return len(values) > 0 and not isinstance(values[0], (int, float))
+
+
+def save_arrays(path: str, kind: str, meta: Dict[str, Any], arrays: Dict[str, Array],
+                dtypes: Optional[Dict[str, str]] = None):
+    """
+    Salva um modelo em um arquivo binário compacto.
+
+    O arquivo é composto por um preâmbulo (``MAGIC``, versão e tamanho do cabeçalho), um cabeçalho JSON com os
+    metadados do modelo e a posição de cada vetor, e uma seção de dados com cada vetor armazenado de forma contígua em
+    `little-endian`. Cada vetor começa em uma posição alinhada, de forma que o arquivo pode ser mapeado em memória.
+
+    :param path: o caminho do arquivo.
+    :param kind: o tipo do modelo salvo (por exemplo, o nome da sua classe).
+    :param meta: os metadados do modelo. Devem ser serializáveis em JSON.
+    :param arrays: os vetores e as matrizes do modelo, por nome. As linhas de cada matriz devem ter o mesmo tamanho.
+    :param dtypes: o tipo de dado de cada vetor: 'f8' ou 'f4' (ponto flutuante de 64 ou 32 bits), 'i8' ou 'i1' (inteiro
+                    de 64 ou 8 bits). Os vetores não presentes nesse dicionário são salvos como 'f8'.
+    """
+    dtypes = {} if dtypes is None else dtypes
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    blobs: List[bytes] = []
+    offset = 0
+    for name, values in arrays.items():
+        dtype = dtypes.get(name, 'f8')
+        if dtype not in _TYPECODES:
+            raise ValueError(f"invalid dtype for array '{name}': {dtype}")
+
+        if _is_matrix(values):
+            n_cols = len(values[0])
+            if any(len(row) != n_cols for row in values):
+                raise ValueError(f"rows of array '{name}' must have the same length")
+
+            shape = [len(values), n_cols]
+            data = array.array(_TYPECODES[dtype])
+            for row in values:
+                data.extend(row)
+        else:
+            shape = [len(values)]
+            data = array.array(_TYPECODES[dtype], values)
+
+        if sys.byteorder != 'little':
+            data.byteswap()
+
+        blob = data.tobytes()
+        offset = _align(offset)
+        entries[name] = {'dtype': dtype, 'shape': shape, 'offset': offset}
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({'kind': kind, 'meta': meta, 'arrays': entries}).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header))
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for entry, blob in zip(entries.values(), blobs):
+            f.write(b'\0' * (data_start + entry['offset'] - f.tell()))
+            f.write(blob)
+
+
+def load_arrays(path: str, *, mmap: bool = True) -> Tuple[str, Dict[str, Any], Dict[str, Array]]:
+    """
+    Carrega um modelo salvo por ``save_arrays``.
+
+    :param path: o caminho do arquivo.
+    :param mmap: se o arquivo deve ser mapeado em memória, padrão `True`. Nesse caso, os vetores e as linhas das
+                    matrizes retornados são `memoryview` sobre o mapeamento (alterações neles não afetam o arquivo) e
+                    nenhum dado é copiado. Caso contrário, eles são listas.
+    :raises ValueError: se o arquivo não for um arquivo de modelo ou se a sua versão não for suportada.
+    :return: o tipo, os metadados e os vetores do modelo.
+    """
+    with open(path, 'rb') as f:
+        magic, version, header_size = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a model file")
+
+        if version != VERSION:
+            raise ValueError(f"unsupported model file version: {version}")
+
+        header = json.loads(f.read(header_size).decode('utf-8'))
+        if mmap:
+            buffer = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY))
+        else:
+            f.seek(0)
+            buffer = memoryview(bytearray(f.read()))
+
+    data_start = _align(_PREAMBLE.size + header_size)
+    arrays: Dict[str, Array] = {}
+    for name, entry in header['arrays'].items():
+        typecode = _TYPECODES[entry['dtype']]
+        shape: Sequence[int] = entry['shape']
+        start = data_start + entry['offset']
+        size = array.array(typecode).itemsize
+        n_values = shape[0] * (shape[1] if len(shape) > 1 else 1)
+
+        values = buffer[start:start + n_values * size]
+        if sys.byteorder != 'little':
+            swapped = array.array(typecode, values.tobytes())
+            swapped.byteswap()
+            values = memoryview(swapped)
+        else:
+            values = values.cast(typecode)
+
+        if len(shape) > 1:
+            n_cols = shape[1]
+            rows = [values[i * n_cols:(i + 1) * n_cols] for i in range(shape[0])]
+            arrays[name] = rows if mmap else [row.tolist() for row in rows]
+        else:
+            arrays[name] = values if mmap else values.tolist()
+
+    return header['kind'], header['meta'], arrays